@@ -26,6 +26,9 @@ if "%1"=="test-basic" goto :test-basic
 if "%1"=="test-optimized" goto :test-optimized
 if "%1"=="test-extreme" goto :test-extreme
 if "%1"=="test-64kb" goto :test-64kb
+if "%1"=="test-scenario" goto :test-scenario
+if "%1"=="test-sweep" goto :test-sweep
+if "%1"=="test-mock" goto :test-mock
 if "%1"=="test-all" goto :test-all
 if "%1"=="topics" goto :topics
 if "%1"=="create-topic" goto :create-topic
@@ -74,31 +77,58 @@ goto :eof
 
 :test-basic
 echo ℹ️  Executando teste básico...
+if not exist results mkdir results
 docker-compose --profile testing run --rm test-basic
 echo ✅ Teste básico concluído!
 goto :eof
 
 :test-optimized
 echo ℹ️  Executando teste otimizado...
+if not exist results mkdir results
 docker-compose --profile testing run --rm test-optimized
 echo ✅ Teste otimizado concluído!
 goto :eof
 
 :test-extreme
 echo ℹ️  Executando teste extremo...
+if not exist results mkdir results
 docker-compose --profile testing run --rm test-extreme
 echo ✅ Teste extremo concluído!
 goto :eof
 
 :test-64kb
 echo ℹ️  Executando teste 64KB...
+if not exist results mkdir results
 docker-compose --profile testing run --rm test-64kb
 echo ✅ Teste 64KB concluído!
 goto :eof
 
+:test-scenario
+echo ℹ️  Executando cenário com fases e tráfego misto...
+if not exist results mkdir results
+docker-compose --profile testing run --rm test-scenario
+echo ✅ Cenário concluído! Resultado em results\
+goto :eof
+
+:test-sweep
+echo ℹ️  Executando varredura throughput x latência...
+if not exist results mkdir results
+docker-compose --profile testing run --rm test-sweep
+echo ✅ Varredura concluída! Resultados em results\sweep.csv e results\sweep.json
+goto :eof
+
+:test-mock
+echo ℹ️  Executando teste extremo contra o REST Proxy simulado...
+if not exist results mkdir results
+docker-compose --profile mock run --rm test-mock
+docker-compose --profile mock stop mock-rest-proxy
+echo ✅ Teste contra REST Proxy simulado concluído!
+goto :eof
+
 :test-all
 echo ℹ️  Executando sequência completa de testes...
 echo ℹ️  1/4 - Teste básico...
+if not exist results mkdir results
 docker-compose --profile testing run --rm test-basic
 echo ℹ️  2/4 - Teste otimizado...
 docker-compose --profile testing run --rm test-optimized
@@ -145,6 +175,7 @@ docker-compose up -d
 timeout /t 120 /nobreak >nul
 echo ✅ Ambiente iniciado!
 echo ℹ️  Executando teste básico...
+if not exist results mkdir results
 docker-compose --profile testing run --rm test-basic
 echo ✅ Quick start concluído!
 goto :eof
@@ -152,6 +183,7 @@ goto :eof
 :performance-test
 echo 🏎️ TESTE DE PERFORMANCE COMPLETO...
 echo ℹ️  Executando teste otimizado...
+if not exist results mkdir results
 docker-compose --profile testing run --rm test-optimized
 echo ℹ️  Executando teste extremo...
 docker-compose --profile testing run --rm test-extreme
@@ -174,6 +206,9 @@ echo   test-basic     Teste básico (1K msgs)
 echo   test-optimized Teste otimizado (50K msgs)
 echo   test-extreme   Teste extremo (100K msgs)
 echo   test-64kb      Teste mensagens 64KB
+echo   test-scenario  Cenário com fases e tráfego misto (SCENARIO=arquivo, padrão production-mix)
+echo   test-sweep     Varredura concorrência x batch size (results\sweep.csv)
+echo   test-mock      Teste extremo contra REST Proxy simulado (sem Kafka)
 echo   test-all       Executar todos os testes
 echo.
 echo UTILITÁRIOS:
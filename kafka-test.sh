@@ -76,6 +76,9 @@ show_help() {
     echo "  test-optimized Teste otimizado (50K msgs)"
     echo "  test-extreme   Teste extremo (100K msgs)"
     echo "  test-64kb      Teste mensagens 64KB"
+    echo "  test-scenario  Cenário com fases e tráfego misto (SCENARIO=arquivo, padrão production-mix)"
+    echo "  test-sweep     Varredura concorrência x batch size (results/sweep.csv)"
+    echo "  test-mock      Teste extremo contra REST Proxy simulado (sem Kafka)"
     echo "  test-all       Executar todos os testes"
     echo ""
     echo "UTILITÁRIOS:"
@@ -132,32 +135,59 @@ case "$1" in
         
     "test-basic")
         log_info "Executando teste básico..."
+        mkdir -p results
         docker-compose --profile testing run --rm test-basic
         log_success "Teste básico concluído!"
         ;;
         
     "test-optimized")
         log_info "Executando teste otimizado..."
+        mkdir -p results
         docker-compose --profile testing run --rm test-optimized
         log_success "Teste otimizado concluído!"
         ;;
         
     "test-extreme")
         log_info "Executando teste extremo..."
+        mkdir -p results
         docker-compose --profile testing run --rm test-extreme
         log_success "Teste extremo concluído!"
         ;;
         
     "test-64kb")
         log_info "Executando teste 64KB..."
+        mkdir -p results
         docker-compose --profile testing run --rm test-64kb
         log_success "Teste 64KB concluído!"
         ;;
         
+    "test-scenario")
+        log_info "Executando cenário ${SCENARIO:-scripts/scenarios/production-mix.yaml}..."
+        mkdir -p results
+        docker-compose --profile testing run --rm test-scenario
+        log_success "Cenário concluído! Resultado em results/"
+        ;;
+        
+    "test-sweep")
+        log_info "Executando varredura throughput x latência..."
+        mkdir -p results
+        docker-compose --profile testing run --rm test-sweep
+        log_success "Varredura concluída! Resultados em results/sweep.csv e results/sweep.json"
+        ;;
+        
+    "test-mock")
+        log_info "Executando teste extremo contra o REST Proxy simulado..."
+        mkdir -p results
+        docker-compose --profile mock run --rm test-mock
+        docker-compose --profile mock stop mock-rest-proxy
+        log_success "Teste contra REST Proxy simulado concluído!"
+        ;;
+        
     "test-all")
         log_info "Executando sequência completa de testes..."
         
         log_info "1/4 - Teste básico..."
+        mkdir -p results
         docker-compose --profile testing run --rm test-basic
         
         log_info "2/4 - Teste otimizado..."
@@ -215,6 +245,7 @@ case "$1" in
         log_success "Ambiente iniciado!"
         
         log_info "Executando teste básico..."
+        mkdir -p results
         docker-compose --profile testing run --rm test-basic
         log_success "✅ Quick start concluído!"
         ;;
@@ -231,6 +262,7 @@ case "$1" in
         fi
         
         log_info "Executando teste otimizado..."
+        mkdir -p results
         docker-compose --profile testing run --rm test-optimized
         
         log_info "Executando teste extremo..."
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Compara resultados gravados pelos testes de carga com uma linha de base
+Uso: python compare-results.py base.json novo.json [outro.json ...]
+     python compare-results.py --baseline a1.json a2.json a3.json --candidate b1.json b2.json b3.json
+"""
+
+import argparse
+import sys
+
+from loadtest.results import compare
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara resultados de testes de carga com uma linha de base')
+    parser.add_argument('files', nargs='*', help='Base seguida de um ou mais resultados comparados a ela')
+    parser.add_argument('-b', '--baseline', nargs='+', default=None,
+                        help='Repetições da base (médias comparadas pelo teste t de Welch)')
+    parser.add_argument('-c', '--candidate', nargs='+', default=None, help='Repetições do candidato')
+    parser.add_argument('--max-throughput-drop', type=float, default=5.0,
+                        help='Queda de vazão tolerada em %% (padrão: 5)')
+    parser.add_argument('--max-p99-rise', type=float, default=10.0,
+                        help='Alta do P99 tolerada em %% (padrão: 10)')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help='Nível de significância com repetições (padrão: 0.05)')
+    parser.add_argument('--force', action='store_true',
+                        help='Compara mesmo com perfil ou carga (concorrência, batch, taxa...) diferentes da base')
+    args = parser.parse_args()
+
+    if args.baseline or args.candidate:
+        if not (args.baseline and args.candidate) or args.files:
+            parser.error("use --baseline e --candidate juntos, sem arquivos posicionais")
+        baseline, groups = args.baseline, [args.candidate]
+    elif len(args.files) >= 2:
+        baseline, groups = args.files[:1], [[path] for path in args.files[1:]]
+    else:
+        parser.error("informe ao menos dois arquivos de resultado")
+
+    try:
+        return compare(baseline, groups, args.max_throughput_drop, args.max_p99_rise, args.alpha,
+                       args.force)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERRO: {e}")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
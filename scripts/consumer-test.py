@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark de consumo via REST Proxy: throughput sustentado e latência ponta a ponta
+Uso: python consumer-test.py --topic extreme-performance --consumers 8 --messages 100000
+Rode um dos scripts de produção em paralelo; eles gravam sent_at_us em cada mensagem.
+"""
+
+import argparse
+import asyncio
+
+from loadtest.consumer import ConsumerBenchmark, ConsumerConfig
+from loadtest.formats import CONTENT_TYPES
+from loadtest.reporters import ConsumerReporter
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de consumo do Kafka REST Proxy')
+    parser.add_argument('--topic', type=str, default='extreme-performance', help='Tópico consumido')
+    parser.add_argument('--group', type=str, default=None, help='Consumer group (padrão: loadtest-<aleatório>)')
+    parser.add_argument('--consumers', type=int, default=4, help='Instâncias de consumidor em paralelo (padrão: 4)')
+    parser.add_argument('--messages', type=int, default=None, help='Parar após consumir N registros')
+    parser.add_argument('--duration', type=float, default=None, help='Parar após N segundos')
+    parser.add_argument('--idle-timeout', type=float, default=30.0,
+                        help='Parar após N segundos sem registros (padrão: 30, 0 desativa)')
+    parser.add_argument('--poll-timeout', type=int, default=1000, help='timeout de cada GET /records em ms')
+    parser.add_argument('--max-bytes', type=int, default=10 * 1024 * 1024, help='max_bytes de cada GET /records')
+    parser.add_argument('--format', choices=sorted(CONTENT_TYPES), default='json', help='Formato embutido do consumidor')
+    parser.add_argument('--from-beginning', action='store_true',
+                        help='auto.offset.reset=earliest (padrão: latest, só mensagens novas)')
+    parser.add_argument('--url', type=str, default='http://localhost:8082', help='URL do REST Proxy')
+
+    args = parser.parse_args()
+
+    config = ConsumerConfig(
+        url=args.url,
+        topic=args.topic,
+        group=args.group,
+        consumers=args.consumers,
+        messages=args.messages,
+        duration=args.duration,
+        idle_timeout=args.idle_timeout,
+        poll_timeout_ms=args.poll_timeout,
+        max_bytes=args.max_bytes,
+        embedded_format=args.format,
+        offset_reset="earliest" if args.from_beginning else "latest"
+    )
+
+    try:
+        asyncio.run(ConsumerBenchmark(config, ConsumerReporter()).run())
+    except KeyboardInterrupt:
+        print("\n⏹️ Teste interrompido pelo usuário")
+
+if __name__ == "__main__":
+    main()
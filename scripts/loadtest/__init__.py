@@ -0,0 +1,14 @@
+"""
+Motor de teste de carga para o Kafka REST Proxy
+
+Pacote compartilhado pelos scripts em scripts/*.py: geradores de payload,
+estratégias de envio, contadores e relatórios.
+"""
+
+from .cli import build_parser, main, run_profile
+from .config import LoadConfig
+from .engine import LoadEngine
+from .multiprocess import run_processes
+from .profiles import (PROFILES, BasicProfile, ExtremeProfile, LargeMessageProfile,
+                       OptimizedProfile, Profile)
+from .stats import LoadStats
@@ -0,0 +1,176 @@
+"""
+Controle adaptativo de concorrência (AIMD guiado pela latência)
+
+Em vez de um --concurrency fixo, o número de requisições em voo é ajustado
+a cada janela de medição para manter o P99 abaixo de um alvo (--target-p99):
+
+- sobrecarga (429, 5xx, timeout/conexão recusada acima da taxa de base
+  mais 1% das requisições da janela, fora o ruído) ou P99 acima do alvo:
+  redução multiplicativa do limite, nunca abaixo do mínimo
+- a taxa de base é a das janelas com o menor limite já usado (carga
+  mínima): erros que o backend devolve em qualquer carga não são sobrecarga
+- janela saudável com todos os slots ocupados: aumento; dobra o limite até
+  a primeira redução (slow start) e depois soma √limite por janela
+- --concurrency passa a ser o teto do limite
+
+A vazão de cada janela saudável é registrada: o relatório mostra a maior
+vazão sustentável encontrada e o limite de concorrência que a produziu.
+"""
+
+import asyncio
+import math
+import time
+
+from .histogram import LatencyHistogram
+
+# Fator da redução multiplicativa
+BACKOFF = 0.75
+# Fração de requisições com sobrecarga tolerada por janela (ruído, não saturação)
+OVERLOAD_TOLERANCE = 0.01
+# Desvios padrão (binomial) acima da taxa esperada antes de chamar a janela de sobrecarregada
+NOISE_SIGMAS = 3
+# Amostras mínimas para avaliar o P99 de uma janela; abaixo disso a janela se estende
+MIN_SAMPLES = 10
+
+
+class AdaptiveLimit:
+    def __init__(self, target_p99, max_limit, window=1.0, initial=4, min_limit=1):
+        self.target_p99 = target_p99
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.window = window
+        self.limit = float(min(max_limit, max(min_limit, initial)))
+        self.slow_start = True
+        self.increases = 0
+        self.decreases = 0
+        # Janelas rejeitadas por motivo (sobrecarga tem precedência sobre o P99)
+        self.overloaded_windows = 0
+        self.slow_windows = 0
+        # Melhor janela saudável: (msg/s, limite, P99)
+        self.best = None
+        self.history = []
+        self.grown = asyncio.Event()
+        self.released = False
+        # Janelas sobrecarregadas já no limite mínimo: não há o que reduzir
+        self.floor_windows = 0
+        self.overloads = 0
+        self.requests = 0
+        # Sobrecargas e requisições das janelas com o menor limite já avaliado (taxa de base)
+        self.baseline_limit = None
+        self.baseline_overloads = 0
+        self.baseline_requests = 0
+        self.start_window(time.perf_counter(), 0)
+
+    def start_window(self, now, delivered):
+        self.window_latency = LatencyHistogram()
+        self.window_started = now
+        self.window_delivered = delivered
+
+    def admits(self, worker_id):
+        """Workers com ID abaixo do limite atual podem enviar"""
+        return worker_id < int(self.limit)
+
+    async def wait(self, worker_id):
+        """Estaciona o worker enquanto ele estiver acima do limite"""
+        while not (self.released or self.admits(worker_id)):
+            await self.grown.wait()
+
+    def release(self):
+        """Fim da fila: todos os workers seguem, sem alterar o limite registrado"""
+        self.released = True
+        self.grown.set()
+
+    def record(self, response_time):
+        """Tempo (ms) de uma unidade de trabalho concluída"""
+        self.window_latency.record(response_time)
+
+    def resize(self, limit):
+        limit = min(self.max_limit, max(self.min_limit, limit))
+        grew = int(limit) > int(self.limit)
+        self.limit = limit
+        if grew:
+            # Acorda os workers estacionados; os que continuam acima do limite voltam a esperar
+            self.grown.set()
+            self.grown = asyncio.Event()
+
+    @property
+    def baseline(self):
+        """Taxa de sobrecarga na carga mínima (fração das requisições)"""
+        return self.baseline_overloads / self.baseline_requests if self.baseline_requests else 0.0
+
+    def pool_baseline(self, limit, overloads, requests):
+        """(sobrecargas, requisições) da base se a janela atual, com `limit`, entrar nela"""
+        if self.baseline_limit is None or limit < self.baseline_limit:
+            return overloads, requests
+        if limit == self.baseline_limit:
+            return self.baseline_overloads + overloads, self.baseline_requests + requests
+        return self.baseline_overloads, self.baseline_requests
+
+    def is_overloaded(self, limit, window_overloads, window_requests):
+        """Sobrecargas acima da taxa de base + OVERLOAD_TOLERANCE, descontado o ruído binomial"""
+        base_overloads, base_requests = self.pool_baseline(limit, window_overloads, window_requests)
+        baseline = base_overloads / base_requests if base_requests else 0.0
+        expected = window_requests * (baseline + OVERLOAD_TOLERANCE)
+        noise = NOISE_SIGMAS * math.sqrt(window_requests * baseline * (1 - baseline))
+        return window_overloads > max(expected + noise, 0)
+
+    def evaluate(self, delivered, requests, overloads, in_flight, now=None):
+        """Fecha a janela atual a partir dos totais acumulados de entregas, requisições e sobrecargas"""
+        now = now or time.perf_counter()
+        latency = self.window_latency
+        limit = int(self.limit)
+        window_requests = requests - self.requests
+        window_overloads = overloads - self.overloads
+        overloaded = self.is_overloaded(limit, window_overloads, window_requests)
+        if latency.count < MIN_SAMPLES and not overloaded:
+            return
+
+        elapsed = now - self.window_started
+        throughput = (delivered - self.window_delivered) / elapsed if elapsed > 0 else 0
+        p99 = latency.percentile(99)
+        self.baseline_overloads, self.baseline_requests = self.pool_baseline(limit, window_overloads,
+                                                                             window_requests)
+        if self.baseline_limit is None or limit < self.baseline_limit:
+            self.baseline_limit = limit
+
+        if overloaded and self.limit <= self.min_limit:
+            # Sobrecarga mesmo na concorrência mínima: não depende da carga gerada, o limite fica
+            self.overloaded_windows += 1
+            self.floor_windows += 1
+            self.slow_start = False
+        elif overloaded or p99 > self.target_p99:
+            if overloaded:
+                self.overloaded_windows += 1
+            else:
+                self.slow_windows += 1
+            self.slow_start = False
+            self.decreases += 1
+            self.resize(self.limit * BACKOFF)
+        else:
+            if self.best is None or throughput > self.best[0]:
+                self.best = (throughput, limit, p99)
+            # Só cresce se o limite atual estava em uso (não no fim do teste)
+            if in_flight >= limit * 0.9:
+                self.increases += 1
+                self.resize(self.limit * 2 if self.slow_start else self.limit + math.sqrt(self.limit))
+
+        self.history.append((limit, throughput, p99, overloaded))
+        self.overloads = overloads
+        self.requests = requests
+        self.start_window(now, delivered)
+
+    def summary(self):
+        """Resultado do controle (dict simples, mesclável entre processos)"""
+        return {
+            "target_p99": self.target_p99,
+            "max_limit": self.max_limit,
+            "final_limit": int(self.limit),
+            "best": self.best,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "overloaded_windows": self.overloaded_windows,
+            "slow_windows": self.slow_windows,
+            "floor_windows": self.floor_windows,
+            "baseline_overload_rate": self.baseline,
+            "windows": len(self.history)
+        }
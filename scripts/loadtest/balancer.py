@@ -0,0 +1,73 @@
+"""
+Balanceamento no cliente entre várias instâncias do REST Proxy (--url A,B,C)
+
+Cada endpoint tem sua própria sessão aiohttp (pool de conexões separado) e
+seus próprios contadores (EndpointStats). A política decide o endpoint de
+cada requisição:
+
+round-robin         alterna os endpoints em ordem
+least-outstanding   o endpoint com menos requisições em voo (empate: rodízio)
+key-hash            hash da chave da primeira mensagem da unidade; a mesma
+                    chave vai sempre ao mesmo proxy. Sem chave (--keys null)
+                    cai no round-robin
+"""
+
+import itertools
+
+BALANCE_POLICIES = ("round-robin", "least-outstanding", "key-hash")
+
+# Multiplicador de Knuth: espalha chaves sequenciais entre os endpoints
+HASH_MULTIPLIER = 2654435761
+
+
+def parse_urls(text):
+    """Lista de URLs de "http://a:8082,http://b:8082" (sem barra final nem repetições)"""
+    return list(dict.fromkeys(url.strip().rstrip("/") for url in text.split(",") if url.strip()))
+
+
+class Endpoint:
+    __slots__ = ("url", "session", "stats", "in_flight")
+
+    def __init__(self, url, stats, session=None):
+        self.url = url
+        self.session = session
+        self.stats = stats
+        self.in_flight = 0
+
+
+class Balancer:
+    def __init__(self, endpoints, policy="round-robin", keys=None):
+        self.endpoints = endpoints
+        self.policy = policy
+        self.keys = keys
+        self.counter = itertools.count()
+        if len(endpoints) == 1:
+            self.choose = self.single
+        elif policy == "least-outstanding":
+            self.choose = self.least_outstanding
+        elif policy == "key-hash":
+            self.choose = self.key_hash
+        else:
+            self.choose = self.round_robin
+
+    def single(self, msg_id, thread_id):
+        return self.endpoints[0]
+
+    def round_robin(self, msg_id, thread_id):
+        return self.endpoints[next(self.counter) % len(self.endpoints)]
+
+    def least_outstanding(self, msg_id, thread_id):
+        endpoints = self.endpoints
+        start = next(self.counter) % len(endpoints)
+        best = endpoints[start]
+        for endpoint in itertools.chain(endpoints[start + 1:], endpoints[:start]):
+            if endpoint.in_flight < best.in_flight:
+                best = endpoint
+        return best
+
+    def key_hash(self, msg_id, thread_id):
+        key = self.keys.key_for(msg_id, thread_id) if self.keys else msg_id
+        if key is None:
+            return self.round_robin(msg_id, thread_id)
+        # Hash de Fibonacci: usa os bits altos, que misturam todos os bits da chave
+        return self.endpoints[(key * HASH_MULTIPLIER & 0xFFFFFFFF) * len(self.endpoints) >> 32]
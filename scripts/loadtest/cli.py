@@ -0,0 +1,131 @@
+"""
+Linha de comando comum aos scripts de teste
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from .balancer import BALANCE_POLICIES
+from .config import LoadConfig
+from .engine import LoadEngine
+from .keys import KEY_STRATEGIES
+from .multiprocess import run_processes
+from .profiling import write_folded
+from .results import build_result, default_result_path, write_result
+from .saturation import EXIT_SATURATED
+
+
+def build_parser(profile):
+    """Cria o parser com os padrões do perfil"""
+    defaults = profile.defaults
+    parser = argparse.ArgumentParser(description=profile.description)
+    parser.add_argument('--messages', type=int, default=defaults["messages"],
+                        help=f'Número total de mensagens (padrão: {defaults["messages"]})')
+    parser.add_argument('--concurrency', type=int, default=defaults["concurrency"],
+                        help=f'Número de requisições concorrentes (padrão: {defaults["concurrency"]})')
+    parser.add_argument('--topic', type=str, default=defaults["topic"],
+                        help=f'Nome do tópico (padrão: {defaults["topic"]})')
+    parser.add_argument('--batch-size', type=int, default=defaults["batch_size"],
+                        help=f'Tamanho do batch (padrão: {defaults["batch_size"]})')
+    parser.add_argument('--url', type=str, default='http://localhost:8082',
+                        help='URL do REST Proxy; várias instâncias separadas por vírgula (balanceadas no cliente)')
+    parser.add_argument('--balance', choices=BALANCE_POLICIES, default='round-robin',
+                        help='Política entre várias --url: ' + ', '.join(BALANCE_POLICIES) + ' (padrão: round-robin)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Processos geradores de carga, cada um com seu event loop (padrão: 1)')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='Taxa alvo em msg/s (open-loop); --concurrency passa a ser o teto de requisições em voo')
+    parser.add_argument('--format', choices=profile.formats, default='json',
+                        help='Formato embutido da API v2: ' + ', '.join(profile.formats) + ' (padrão: json)')
+    parser.add_argument('--schema-registry', type=str, default='http://localhost:8081',
+                        help='URL do Schema Registry usado pelo formato avro')
+    parser.add_argument('--keys', choices=KEY_STRATEGIES, default='sequential',
+                        help='Estratégia de chave: ' + ', '.join(KEY_STRATEGIES) + ' (padrão: sequential)')
+    parser.add_argument('--key-space', type=int, default=10000,
+                        help='Chaves distintas das estratégias uniform e zipf (padrão: 10000)')
+    parser.add_argument('--zipf-skew', type=float, default=1.1,
+                        help='Expoente da distribuição zipf; maior = mais concentrada (padrão: 1.1)')
+    parser.add_argument('--trace-connections', action='store_true',
+                        help='Mede fila do pool, DNS, conexão, envio e TTFB de cada requisição e o reuso de conexões')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve métricas Prometheus em http://0.0.0.0:PORTA/metrics durante o teste')
+    parser.add_argument('--metrics-file', type=str, default=None,
+                        help='Acrescenta uma linha JSON por janela (vazão, em voo, erros, percentis) a este arquivo')
+    parser.add_argument('--metrics-interval', type=float, default=1.0,
+                        help='Janela (s) das métricas exportadas (padrão: 1.0)')
+    parser.add_argument('--steady-window', type=float, default=1.0,
+                        help='Janela (s) da detecção do regime estável; só ele entra na vazão e nos percentis '
+                             '(0 desliga; padrão: 1.0)')
+    parser.add_argument('--steady-cv', type=float, default=10.0,
+                        help='Variação máxima da vazão entre janelas no regime estável, em %% (padrão: 10)')
+    parser.add_argument('--profile-client', dest='profiling', action='store_true',
+                        help='Amostra o próprio cliente: atraso do event loop, tempo por etapa (payload, serialização, '
+                             'envio, resposta) e um arquivo .folded para flamegraph junto do resultado')
+    parser.add_argument('--max-loop-lag', type=float, default=20.0,
+                        help='P99 do atraso do event loop (ms) acima do qual a janela conta como cliente saturado '
+                             '(0 desliga o monitor de saturação; padrão: 20)')
+    parser.add_argument('--fail-on-saturation', action='store_true',
+                        help=f'Termina com código {EXIT_SATURATED} se o próprio cliente saturar '
+                             '(CPU ou event loop), mesmo com o resultado gravado')
+    parser.add_argument('--target-p99', type=float, default=None,
+                        help='Controle adaptativo: ajusta as requisições em voo para manter o P99 (ms) '
+                             'abaixo do alvo; --concurrency passa a ser o teto')
+    parser.add_argument('--adaptive-window', type=float, default=1.0,
+                        help='Janela (s) entre ajustes do controle adaptativo (padrão: 1.0)')
+    parser.add_argument('--result-file', type=str, default=None,
+                        help='Arquivo JSON do resultado (padrão: results/<perfil>-<data>.json)')
+    parser.add_argument('--no-result-file', action='store_true',
+                        help='Não grava o arquivo de resultado da execução')
+    profile.add_arguments(parser)
+    return parser
+
+
+def run_profile(profile, args):
+    """Executa o perfil com os argumentos já interpretados"""
+    config = LoadConfig.from_args(args)
+    if config.target_p99 and config.rate:
+        print("ERRO: --target-p99 ajusta a concorrência do modo closed-loop; não use com --rate")
+        return None
+    if config.processes > config.concurrency:
+        print(f"ERRO: --processes {config.processes} exige --concurrency >= {config.processes} "
+              "(cada processo mantém ao menos uma requisição em voo)")
+        return None
+    try:
+        if config.processes > 1:
+            stats = run_processes(profile, config)
+        else:
+            stats = asyncio.run(LoadEngine(profile, config).run())
+    except KeyboardInterrupt:
+        print("\n\n⏹️ Teste interrompido pelo usuário")
+        return None
+    if stats is None:
+        return None
+    path = args.result_file or default_result_path(profile.name)
+    result = build_result(profile.name, config, stats, stats.duration)
+    if stats.profiling is not None:
+        # Flamegraph ao lado do resultado: mesmo nome, extensão .folded
+        folded = os.path.splitext(path)[0] + ".folded"
+        try:
+            write_folded(folded, stats.profiling)
+            result["client_profile"]["flamegraph"] = folded
+            print(f"🔥 Pilhas para flamegraph gravadas em {folded} (flamegraph.pl ou speedscope)")
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar o perfil em {folded}: {e}")
+    if not args.no_result_file:
+        try:
+            write_result(path, result)
+            print(f"💾 Resultado gravado em {path}")
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar o resultado em {path}: {e}")
+    if config.fail_on_saturation and stats.saturation is not None and stats.saturation.saturated:
+        print("❌ Cliente saturado: os números medem o gerador de carga, não o REST Proxy")
+        sys.exit(EXIT_SATURATED)
+    return stats
+
+
+def main(profile_cls, argv=None):
+    profile = profile_cls()
+    args = build_parser(profile).parse_args(argv)
+    return run_profile(profile, args)
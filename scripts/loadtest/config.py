@@ -0,0 +1,133 @@
+"""
+Configuração de uma execução de teste de carga
+"""
+
+import copy
+
+from .balancer import parse_urls
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 * 1024}
+
+
+def split_evenly(total, parts):
+    """Divide `total` em `parts` inteiros que diferem em no máximo 1"""
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def parse_size(text):
+    """Tamanho em bytes a partir de 65536, 64KB, 1MB ou 10MB"""
+    text = text.strip().upper()
+    for unit in ("KB", "MB", "B"):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(text)
+
+
+class LoadConfig:
+    def __init__(self, url="http://localhost:8082", topic="test", messages=1000,
+                 concurrency=10, batch_size=10, processes=1, first_id=1, rate=None,
+                 record_size=None, embedded_format="json", schema_registry="http://localhost:8081",
+                 key_strategy="sequential", key_space=10000, zipf_skew=1.1,
+                 target_p99=None, adaptive_window=1.0, retry_budget=10.0, balance="round-robin",
+                 trace_connections=False, metrics_port=None, metrics_file=None, metrics_interval=1.0,
+                 steady_window=1.0, steady_cv=10.0, profiling=False, max_loop_lag=20.0,
+                 fail_on_saturation=False):
+        # Uma ou mais instâncias do REST Proxy ("http://a:8082,http://b:8082"); url = a primeira
+        self.urls = parse_urls(url)
+        self.url = self.urls[0]
+        self.balance = balance
+        # Instrumenta as fases de cada requisição HTTP (tracing.py)
+        self.trace_connections = trace_connections
+        # Exportação de métricas por janela (metrics.py) e índice do processo (--processes)
+        self.metrics_port = metrics_port
+        self.metrics_file = metrics_file
+        self.metrics_interval = metrics_interval
+        self.process_index = 0
+        # Detecção do regime estável: janela (s; 0 desliga) e coeficiente de variação máximo (%)
+        self.steady_window = steady_window
+        self.steady_cv = steady_cv
+        # Amostragem do próprio cliente (profiling.py)
+        self.profiling = profiling
+        # Monitor de saturação do cliente: P99 máximo do atraso do loop (ms; 0 desliga) e falha se saturado
+        self.max_loop_lag = max_loop_lag
+        self.fail_on_saturation = fail_on_saturation
+        self.topic = topic
+        self.messages = messages
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.processes = processes
+        # Taxa alvo em msg/s (open-loop); None = closed-loop limitado pela concorrência
+        self.rate = rate
+        # Primeiro ID de mensagem (cada processo recebe uma faixa própria)
+        self.first_id = first_id
+        # Tamanho do payload de cada registro em bytes (perfis de mensagens grandes)
+        self.record_size = record_size
+        # Formato embutido da API v2 (json, binary, avro) e Schema Registry usado pelo avro
+        self.embedded_format = embedded_format
+        self.schema_registry = schema_registry
+        # Estratégia de chave (keys.py), número de chaves distintas e expoente do zipf
+        self.key_strategy = key_strategy
+        self.key_space = key_space
+        self.zipf_skew = zipf_skew
+        # Controle adaptativo: P99 alvo (ms; None = concorrência fixa) e janela de ajuste (s)
+        self.target_p99 = target_p99
+        self.adaptive_window = adaptive_window
+        # Retries permitidos em % das respostas bem-sucedidas (perfis com retry)
+        self.retry_budget = retry_budget
+
+    @classmethod
+    def from_args(cls, args):
+        """Cria a configuração a partir dos argumentos de linha de comando"""
+        return cls(
+            url=args.url,
+            topic=args.topic,
+            messages=args.messages,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            processes=args.processes,
+            rate=args.rate,
+            record_size=getattr(args, "record_size", None),
+            embedded_format=args.format,
+            schema_registry=args.schema_registry,
+            key_strategy=args.keys,
+            key_space=args.key_space,
+            zipf_skew=args.zipf_skew,
+            target_p99=args.target_p99,
+            adaptive_window=args.adaptive_window,
+            retry_budget=getattr(args, "retry_budget", 10.0),
+            balance=args.balance,
+            trace_connections=args.trace_connections,
+            metrics_port=args.metrics_port,
+            metrics_file=args.metrics_file,
+            metrics_interval=args.metrics_interval,
+            steady_window=args.steady_window,
+            steady_cv=args.steady_cv,
+            profiling=args.profiling,
+            max_loop_lag=args.max_loop_lag,
+            fail_on_saturation=args.fail_on_saturation
+        )
+
+    def split(self, parts):
+        """Divide mensagens e concorrência em `parts` configurações com faixas de IDs disjuntas
+
+        Cada parte precisa de ao menos uma requisição em voo, então `parts`
+        não pode passar de --concurrency (a soma mudaria a carga pedida).
+        """
+        if parts > self.concurrency:
+            raise ValueError(f"{parts} processos precisam de --concurrency >= {parts} (recebido {self.concurrency})")
+        messages = split_evenly(self.messages, parts)
+        concurrency = split_evenly(self.concurrency, parts)
+        configs = []
+        first_id = self.first_id
+        for index, (part_messages, part_concurrency) in enumerate(zip(messages, concurrency)):
+            part = copy.copy(self)
+            part.process_index = index
+            part.messages = part_messages
+            part.concurrency = part_concurrency
+            part.processes = 1
+            part.first_id = first_id
+            if self.rate:
+                part.rate = self.rate * part_messages / self.messages
+            configs.append(part)
+            first_id += part_messages
+        return configs
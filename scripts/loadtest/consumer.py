@@ -0,0 +1,204 @@
+"""
+Benchmark do lado consumidor: API de consumers v2 do REST Proxy
+
+Cria N instâncias em um consumer group, assina o tópico e faz polling de
+`/records` em paralelo. Os produtores gravam `sent_at_us` (epoch em µs) em
+cada valor, então a latência ponta a ponta produção → consumo sai da
+diferença entre o relógio local e esse campo (produtor e consumidor devem
+compartilhar o relógio, ex.: mesma máquina ou NTP). No formato binary o
+valor chega em base64 e é decodificado antes; valores que não são o JSON dos
+perfis (ex.: 64kb em binary) ficam sem latência ponta a ponta.
+"""
+
+import asyncio
+import base64
+import json
+import time
+import uuid
+
+import aiohttp
+
+from .formats import CONTENT_TYPES
+from .senders import elapsed_ms
+from .stats import ConsumerStats
+
+V2_CONTENT_TYPE = 'application/vnd.kafka.v2+json'
+
+
+def decode_binary(value):
+    """Valor binary.v2 (base64) de volta ao JSON gravado pelo produtor; None se não for JSON"""
+    try:
+        return json.loads(base64.b64decode(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class ConsumerConfig:
+    def __init__(self, url="http://localhost:8082", topic="test", group=None, consumers=4,
+                 messages=None, duration=None, idle_timeout=30.0, poll_timeout_ms=1000,
+                 max_bytes=10 * 1024 * 1024, embedded_format="json", offset_reset="latest"):
+        self.url = url
+        self.topic = topic
+        self.group = group or f"loadtest-{uuid.uuid4().hex[:8]}"
+        self.consumers = consumers
+        # Critérios de parada: total de registros, duração (s) ou tempo sem registros (s)
+        self.messages = messages
+        self.duration = duration
+        self.idle_timeout = idle_timeout
+        self.poll_timeout_ms = poll_timeout_ms
+        self.max_bytes = max_bytes
+        self.embedded_format = embedded_format
+        self.offset_reset = offset_reset
+
+
+class ConsumerInstance:
+    """Uma instância de consumidor do REST Proxy e seus contadores"""
+
+    def __init__(self, config, name):
+        self.config = config
+        self.name = name
+        self.base_uri = f"{config.url}/consumers/{config.group}/instances/{name}"
+        self.stats = ConsumerStats()
+        self.accept = {'Accept': CONTENT_TYPES[config.embedded_format]}
+
+    async def create(self, session):
+        body = {
+            "name": self.name,
+            "format": self.config.embedded_format,
+            "auto.offset.reset": self.config.offset_reset,
+            "auto.commit.enable": "true"
+        }
+        async with session.post(f"{self.config.url}/consumers/{self.config.group}", json=body,
+                                headers={'Content-Type': V2_CONTENT_TYPE}) as response:
+            if response.status != 200:
+                raise RuntimeError(f"criação do consumidor retornou {response.status}: {await response.text()}")
+            # base_uri da resposta usa o hostname interno do proxy; a URL local é montada acima
+            await response.read()
+
+    async def subscribe(self, session):
+        async with session.post(f"{self.base_uri}/subscription", json={"topics": [self.config.topic]},
+                                headers={'Content-Type': V2_CONTENT_TYPE}) as response:
+            if response.status not in (200, 204):
+                raise RuntimeError(f"assinatura retornou {response.status}: {await response.text()}")
+
+    async def delete(self, session):
+        try:
+            async with session.delete(self.base_uri, headers={'Content-Type': V2_CONTENT_TYPE}) as response:
+                await response.read()
+        except aiohttp.ClientError:
+            pass
+
+    async def poll(self, session):
+        """Um GET /records; retorna o número de registros recebidos (None em erro)"""
+        config = self.config
+        start_time = time.perf_counter()
+        try:
+            async with session.get(
+                f"{self.base_uri}/records",
+                params={"timeout": config.poll_timeout_ms, "max_bytes": config.max_bytes},
+                headers=self.accept
+            ) as response:
+                body = await response.read()
+                response_time = elapsed_ms(start_time)
+                if response.status != 200:
+                    self.stats.record_error(f"HTTP_{response.status}")
+                    return None
+            # Resposta truncada ou malformada conta como erro do poll
+            records = json.loads(body)
+        except Exception as e:
+            self.stats.record_error(f"Exception_{type(e).__name__}")
+            return None
+
+        received_at = time.time_ns() // 1000
+        end_to_end = self.stats.end_to_end
+        binary = config.embedded_format == "binary"
+        for record in records:
+            value = record.get("value")
+            if binary:
+                value = decode_binary(value)
+            if isinstance(value, dict):
+                sent_at = value.get("sent_at_us")
+                if sent_at:
+                    end_to_end.record(max(received_at - sent_at, 0) / 1000)
+        self.stats.record_poll(len(records), len(body), response_time)
+        return len(records)
+
+
+class ConsumerBenchmark:
+    def __init__(self, config, reporter):
+        self.config = config
+        self.reporter = reporter
+        self.instances = [ConsumerInstance(config, f"consumer-{index}") for index in range(config.consumers)]
+        self.consumed = 0
+        self.first_record_at = None
+        self.last_record_at = None
+        self.started_at = None
+        self.finished_at = None
+
+    def stats(self):
+        """Contadores de todas as instâncias consolidados"""
+        merged = ConsumerStats()
+        for instance in self.instances:
+            merged.merge(instance.stats)
+        return merged
+
+    def done(self):
+        config = self.config
+        now = time.time()
+        if config.messages and self.consumed >= config.messages:
+            return True
+        if config.duration and now - self.started_at >= config.duration:
+            return True
+        return bool(config.idle_timeout) and now - (self.last_record_at or self.started_at) >= config.idle_timeout
+
+    async def consume(self, session, instance):
+        while not self.done():
+            received = await instance.poll(session)
+            if received is None:
+                # Erro: pausa curta para não girar em falso contra o proxy
+                await asyncio.sleep(0.1)
+            elif received:
+                self.consumed += received
+                self.last_record_at = time.time()
+                if self.first_record_at is None:
+                    self.first_record_at = self.last_record_at
+
+    async def report_progress(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.reporter.tick(self.stats(), time.time() - self.started_at)
+
+    async def run(self):
+        """Executa o benchmark e retorna os contadores consolidados (ou None em falha de setup)"""
+        config = self.config
+        self.reporter.start(config)
+        connector = aiohttp.TCPConnector(limit=config.consumers * 2)
+        timeout = aiohttp.ClientTimeout(total=config.poll_timeout_ms / 1000 + 30)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            try:
+                for instance in self.instances:
+                    await instance.create(session)
+                    await instance.subscribe(session)
+            except Exception as e:
+                self.reporter.connectivity_failed(e)
+                await asyncio.gather(*(instance.delete(session) for instance in self.instances))
+                return None
+            self.reporter.connectivity_ok()
+
+            self.started_at = time.time()
+            progress_task = asyncio.create_task(self.report_progress(self.reporter.progress_interval))
+            try:
+                await asyncio.gather(*(self.consume(session, instance) for instance in self.instances))
+            finally:
+                progress_task.cancel()
+                self.finished_at = time.time()
+                await asyncio.gather(*(instance.delete(session) for instance in self.instances))
+
+        stats = self.stats()
+        # Vazão sustentada: do primeiro ao último registro, sem a espera ociosa antes e depois
+        if self.first_record_at is not None and self.last_record_at > self.first_record_at:
+            duration = self.last_record_at - self.first_record_at
+        else:
+            duration = self.finished_at - self.started_at
+        self.reporter.report(stats, duration)
+        return stats
@@ -0,0 +1,316 @@
+"""
+Motor de geração de carga compartilhado pelos perfis de teste
+"""
+
+import asyncio
+import contextlib
+import time
+
+import aiohttp
+
+from .adaptive import AdaptiveLimit
+from .balancer import Balancer, Endpoint
+from .formats import SchemaRegistry
+from .metrics import MetricsExporter
+from .profiling import LoopLag, StackSampler
+from .saturation import SaturationMonitor
+from .senders import elapsed_ms
+from .stats import ConnectionStats, LoadStats
+from .steady import SteadyStateDetector
+from .tracing import connection_trace
+
+
+def iter_units(total_messages, batch_size, first_id=1):
+    """Gera sob demanda as unidades (start_id, count) a partir de first_id"""
+    for start in range(0, total_messages, batch_size):
+        yield first_id + start, min(batch_size, total_messages - start)
+
+
+def count_units(total_messages, batch_size):
+    return -(-total_messages // batch_size)
+
+
+class LoadEngine:
+    def __init__(self, profile, config, reporter=None):
+        self.profile = profile
+        self.config = config
+        self.stats = LoadStats()
+        self.payload = profile.create_payload(config)
+        self.sender = profile.create_sender(config, self.payload, self.stats)
+        self.reporter = reporter or profile.create_reporter(config)
+        self.started_at = None
+        self.finished_at = None
+        self.completed_units = 0
+        self.in_flight = 0
+        self.balancer = Balancer(
+            [Endpoint(url, self.stats.endpoint(url)) for url in config.urls],
+            config.balance,
+            getattr(self.payload, "keys", None)
+        )
+
+    def requests_in_flight(self):
+        """Requisições HTTP em voo em todos os endpoints (uma unidade pode ter várias no SingleSender)"""
+        return sum(endpoint.in_flight for endpoint in self.balancer.endpoints)
+
+    async def check_connectivity(self):
+        """Verifica se todos os REST Proxies respondem antes de iniciar o envio"""
+        for endpoint in self.balancer.endpoints:
+            prefix = f"{endpoint.url}: " if len(self.balancer.endpoints) > 1 else ""
+            try:
+                async with endpoint.session.get(
+                    f"{endpoint.url}/topics",
+                    timeout=aiohttp.ClientTimeout(total=5)
+                ) as response:
+                    if response.status != 200:
+                        self.reporter.connectivity_failed(f"{prefix}REST Proxy retornou status {response.status}")
+                        return False
+            except Exception as e:
+                self.reporter.connectivity_failed(f"{prefix}{e}")
+                return False
+
+        self.reporter.connectivity_ok()
+        return True
+
+    async def open_sessions(self, stack):
+        """Uma sessão (pool de conexões próprio) por endpoint, fechadas junto com `stack`"""
+        options = self.profile.session_options(self.config)
+        if self.config.trace_connections:
+            self.stats.connections = ConnectionStats()
+            options["trace_configs"] = [connection_trace(self.stats.connections)]
+        for endpoint in self.balancer.endpoints:
+            connector = aiohttp.TCPConnector(**self.profile.connector_options(self.config))
+            endpoint.session = await stack.enter_async_context(
+                aiohttp.ClientSession(connector=connector, **options)
+            )
+
+    async def setup(self, stack):
+        """Abre as sessões, verifica os REST Proxies e prepara o payload; False se algo falhar"""
+        await self.open_sessions(stack)
+        if not await self.check_connectivity():
+            return False
+        # Os IDs dos schemas entram nos templates, então o registro vem antes do prepare
+        session = self.balancer.endpoints[0].session
+        if self.config.embedded_format == "avro" and not await self.register_schemas(session):
+            return False
+        self.payload.prepare()
+        return True
+
+    def use_stats(self, stats):
+        """Passa a registrar em `stats` (ex.: uma fase de cenário): novo sender e endpoints religados"""
+        self.stats = stats
+        self.sender = self.profile.create_sender(self.config, self.payload, stats)
+        for endpoint in self.balancer.endpoints:
+            endpoint.stats = stats.endpoint(endpoint.url)
+
+    async def warm_up(self, messages):
+        """Envia `messages` mensagens (IDs a partir de config.first_id) e descarta os contadores
+
+        Roda nas mesmas sessões da medição, então o pool de conexões e o
+        producer do REST Proxy já estão prontos quando a medição começa.
+        """
+        measured = self.stats
+        self.use_stats(LoadStats())
+        unit_size = self.profile.unit_size(self.config)
+        await self.run_streaming(iter_units(messages, unit_size, self.config.first_id),
+                                 count_units(messages, unit_size), time.time())
+        self.use_stats(measured)
+        self.completed_units = 0
+
+    async def register_schemas(self, session):
+        """Registra os schemas do formato avro no Schema Registry"""
+        try:
+            await self.payload.register_schemas(session, SchemaRegistry(self.config.schema_registry),
+                                                self.config.topic)
+        except Exception as e:
+            self.reporter.connectivity_failed(f"Schema Registry {self.config.schema_registry}: {e}")
+            return False
+        return True
+
+    async def run_streaming(self, units, total_units, start_time):
+        """Pool fixo de workers consumindo unidades de uma fila limitada
+
+        As unidades são geradas conforme há espaço na fila, então a memória
+        não cresce com --messages e o envio começa imediatamente. Cada worker
+        pega a próxima unidade assim que termina a anterior, mantendo sempre
+        --concurrency requisições em voo, sem barreiras entre lotes.
+
+        Com --target-p99 só os workers abaixo do limite do AdaptiveLimit
+        enviam; os demais ficam estacionados até o limite crescer.
+        """
+        workers = min(self.config.concurrency, total_units)
+        queue = asyncio.Queue(maxsize=workers * 2)
+        controller = None
+        if self.config.target_p99:
+            controller = AdaptiveLimit(self.config.target_p99, workers, self.config.adaptive_window)
+
+        async def produce():
+            for unit in units:
+                await queue.put(unit)
+            for _ in range(workers):
+                await queue.put(None)
+            if controller:
+                # Libera os workers estacionados para consumirem o fim da fila
+                controller.release()
+
+        async def work(worker_id):
+            while True:
+                if controller:
+                    await controller.wait(worker_id)
+                unit = await queue.get()
+                if unit is None:
+                    return
+                self.in_flight += 1
+                sent_at = time.perf_counter()
+                try:
+                    await self.sender.send(self.balancer, *unit, worker_id)
+                finally:
+                    self.in_flight -= 1
+                if controller:
+                    controller.record(elapsed_ms(sent_at))
+                self.completed_units += 1
+                self.reporter.progress(self.stats, self.completed_units, total_units, time.time() - start_time)
+
+        control_task = asyncio.create_task(self.adapt(controller)) if controller else None
+        try:
+            await asyncio.gather(produce(), *(work(worker_id) for worker_id in range(workers)))
+        finally:
+            if control_task:
+                control_task.cancel()
+                self.stats.adaptive.append(controller.summary())
+
+    async def adapt(self, controller):
+        """Reavalia o limite de concorrência a cada janela"""
+        while True:
+            await asyncio.sleep(controller.window)
+            stats = self.stats
+            controller.evaluate(stats.success_count, stats.requests_sent, stats.overloads, self.in_flight)
+
+    async def run_open_loop(self, units, total_units, start_time):
+        """Dispara as unidades em uma linha do tempo fixa (--rate), independente das respostas
+
+        A unidade k deve partir em origem + (mensagens anteriores / rate). Se o
+        teto de --concurrency requisições em voo for atingido o disparo atrasa,
+        mas a latência continua medida a partir do horário previsto.
+        """
+        rate = self.config.rate
+        self.stats.target_rate = rate
+        slots = asyncio.Semaphore(self.config.concurrency)
+        free_workers = list(range(self.config.concurrency))
+        pending = set()
+        scheduled_messages = 0
+        origin = time.perf_counter()
+
+        async def dispatch(unit, worker_id, intended_time):
+            self.in_flight += 1
+            try:
+                await self.sender.send(self.balancer, *unit, worker_id, intended_time=intended_time)
+            finally:
+                self.in_flight -= 1
+                free_workers.append(worker_id)
+                slots.release()
+            self.completed_units += 1
+            self.reporter.progress(self.stats, self.completed_units, total_units, time.time() - start_time)
+
+        last_count = 0
+        for unit in units:
+            intended_time = origin + scheduled_messages / rate
+            scheduled_messages += unit[1]
+            delay = intended_time - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await slots.acquire()
+            worker_id = free_workers.pop()
+            self.stats.worker(worker_id).record_dispatch(unit[1], (time.perf_counter() - intended_time) * 1000)
+            task = asyncio.create_task(dispatch(unit, worker_id, intended_time))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            last_count = unit[1]
+
+        # A janela inclui o intervalo reservado à última unidade
+        self.stats.dispatch_seconds = time.perf_counter() - origin + last_count / rate
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def report_progress(self, total_units, start_time, interval):
+        """Progresso periódico independente da conclusão das requisições"""
+        while True:
+            await asyncio.sleep(interval)
+            self.reporter.tick(self.stats, self.completed_units, total_units,
+                               time.time() - start_time, self.in_flight)
+
+    async def run(self, warmup_messages=0):
+        """Executa o teste e retorna os contadores (ou None se não houver conectividade)
+
+        Com `warmup_messages` o teste é precedido de um aquecimento descartado
+        (warm_up) e a medição usa os IDs seguintes.
+        """
+        config = self.config
+        self.reporter.start(config)
+
+        async with contextlib.AsyncExitStack() as stack:
+            if not await self.setup(stack):
+                return None
+            if warmup_messages:
+                await self.warm_up(warmup_messages)
+            start_time = self.started_at = time.time()
+
+            unit_size = self.profile.unit_size(config)
+            units = iter_units(config.messages, unit_size, config.first_id + warmup_messages)
+            total_units = count_units(config.messages, unit_size)
+            self.reporter.executing(total_units)
+
+            progress_task = None
+            if self.reporter.progress_interval:
+                progress_task = asyncio.create_task(
+                    self.report_progress(total_units, start_time, self.reporter.progress_interval)
+                )
+            exporter = metrics_task = None
+            if config.metrics_port or config.metrics_file:
+                exporter = MetricsExporter(self.stats, self.profile.name, config.metrics_interval,
+                                           config.metrics_file, config.metrics_port, config.process_index)
+                await exporter.start()
+                metrics_task = asyncio.create_task(exporter.run(self.requests_in_flight))
+            detector = steady_task = None
+            if config.steady_window:
+                detector = SteadyStateDetector(self.stats, config.steady_window, config.steady_cv / 100)
+                detector.begin()
+                steady_task = asyncio.create_task(detector.run())
+            monitor = monitor_task = None
+            if config.max_loop_lag:
+                monitor = SaturationMonitor(config.concurrency, lambda: self.in_flight, config.max_loop_lag)
+                monitor.begin()
+                monitor_task = asyncio.create_task(monitor.run())
+            sampler = loop_lag = lag_task = None
+            if config.profiling:
+                # O perfil reaproveita o atraso do loop medido pelo monitor de saturação
+                loop_lag = monitor.loop_lag if monitor else LoopLag()
+                if not monitor:
+                    lag_task = asyncio.create_task(loop_lag.run())
+                sampler = StackSampler()
+                sampler.start()
+            try:
+                if config.rate:
+                    await self.run_open_loop(units, total_units, start_time)
+                else:
+                    await self.run_streaming(units, total_units, start_time)
+            finally:
+                if progress_task:
+                    progress_task.cancel()
+                if exporter:
+                    metrics_task.cancel()
+                    await exporter.stop(self.requests_in_flight())
+                if sampler:
+                    if lag_task:
+                        lag_task.cancel()
+                    self.stats.profiling = sampler.stop(loop_lag.histogram)
+                if monitor:
+                    monitor_task.cancel()
+                    self.stats.saturation = monitor.finish()
+                if detector:
+                    steady_task.cancel()
+                    self.stats.steady = detector.finish()
+
+        self.finished_at = time.time()
+        duration = self.stats.duration = self.finished_at - start_time
+        self.reporter.report(self.stats, duration, config.messages)
+        return self.stats
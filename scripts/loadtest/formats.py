@@ -0,0 +1,60 @@
+"""
+Formatos embutidos da API v2 do REST Proxy (json, binary, avro)
+
+json    valores JSON livres (padrão)
+binary  chave e valor em base64; o Kafka grava os bytes originais
+avro    valores validados por schema registrado no Schema Registry; o corpo
+        leva só os IDs dos schemas e o Kafka grava o Avro binário compacto
+"""
+
+import json
+
+import aiohttp
+
+CONTENT_TYPES = {
+    "json": "application/vnd.kafka.json.v2+json",
+    "binary": "application/vnd.kafka.binary.v2+json",
+    "avro": "application/vnd.kafka.avro.v2+json",
+}
+
+KEY_SCHEMA = "string"
+
+
+def request_headers(embedded_format):
+    return {
+        'Content-Type': CONTENT_TYPES[embedded_format],
+        'Accept': 'application/vnd.kafka.v2+json'
+    }
+
+
+class SchemaRegistry:
+    """Registro de schemas com cache de IDs por processo
+
+    O Schema Registry devolve o mesmo ID para um schema já registrado, então
+    cada (registry, subject, schema) é registrado uma única vez por processo.
+    """
+
+    cache = {}
+
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+
+    async def register(self, session, subject, schema):
+        """ID do schema no subject, registrando-o se necessário"""
+        # Schemas primitivos ("string") também são JSON: '"string"'
+        schema_text = json.dumps(schema, separators=(',', ':'))
+        cache_key = (self.url, subject, schema_text)
+        schema_id = self.cache.get(cache_key)
+        if schema_id is not None:
+            return schema_id
+
+        async with session.post(
+            f"{self.url}/subjects/{subject}/versions",
+            json={"schema": schema_text},
+            headers={'Content-Type': 'application/vnd.schemaregistry.v1+json'},
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Schema Registry retornou status {response.status}: {await response.text()}")
+            schema_id = self.cache[cache_key] = (await response.json(content_type=None))["id"]
+        return schema_id
@@ -0,0 +1,152 @@
+"""
+Histograma de latência com buckets logarítmicos (estilo HDR)
+
+Memória constante independente do número de amostras, erro relativo
+limitado por `precision` e estado mesclável entre workers e processos.
+"""
+
+import math
+from array import array
+
+
+class LatencyHistogram:
+    def __init__(self, lowest=0.01, highest=3_600_000.0, precision=0.01):
+        """Valores em ms entre `lowest` e `highest` com erro relativo de até `precision`"""
+        self.lowest = lowest
+        self.highest = highest
+        self.precision = precision
+        self._log_lowest = math.log(lowest)
+        self._inv_log_base = 1 / math.log1p(precision)
+        self.bucket_count = int((math.log(highest) - self._log_lowest) * self._inv_log_base) + 2
+        self.counts = array('Q', bytes(8 * self.bucket_count))
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def bucket_index(self, value):
+        if value <= self.lowest:
+            return 0
+        index = int((math.log(value) - self._log_lowest) * self._inv_log_base) + 1
+        return min(index, self.bucket_count - 1)
+
+    def bucket_value(self, index):
+        """Valor representativo (ponto médio geométrico) do bucket"""
+        if index == 0:
+            return self.lowest
+        return self.lowest * (1 + self.precision) ** (index - 0.5)
+
+    def record(self, value, count=1):
+        self.counts[self.bucket_index(value)] += count
+        self.count += count
+        self.total += value * count
+        self.total_squares += value * value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Soma outro histograma com os mesmos parâmetros a este"""
+        if (other.lowest, other.highest, other.precision) != (self.lowest, self.highest, self.precision):
+            raise ValueError("Histogramas com parâmetros diferentes não podem ser mesclados")
+        counts = self.counts
+        for index, value in enumerate(other.counts):
+            if value:
+                counts[index] += value
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def copy(self):
+        return LatencyHistogram(self.lowest, self.highest, self.precision).merge(self)
+
+    def since(self, previous):
+        """Histograma só das amostras registradas depois de `previous` (uma cópia anterior deste)
+
+        Mínimo e máximo da janela são estimados pelos buckets extremos com
+        amostras (erro de até `precision`), limitados ao máximo acumulado.
+        """
+        window = LatencyHistogram(self.lowest, self.highest, self.precision)
+        window.counts = array('Q', map(int.__sub__, self.counts, previous.counts))
+        window.count = self.count - previous.count
+        window.total = self.total - previous.total
+        window.total_squares = self.total_squares - previous.total_squares
+        used = [index for index, value in enumerate(window.counts) if value]
+        if used:
+            window.min = min(window.bucket_value(used[0]), self.max)
+            window.max = min(window.bucket_value(used[-1]), self.max)
+        return window
+
+    def to_dict(self):
+        """Forma serializável em JSON: parâmetros e só os buckets com amostras"""
+        return {
+            "lowest": self.lowest,
+            "highest": self.highest,
+            "precision": self.precision,
+            "count": self.count,
+            "total": self.total,
+            "total_squares": self.total_squares,
+            "min": self.min if self.count else None,
+            "max": self.max,
+            "buckets": [[index, value] for index, value in enumerate(self.counts) if value],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["lowest"], data["highest"], data["precision"])
+        for index, value in data["buckets"]:
+            histogram.counts[index] = value
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.total_squares = data["total_squares"]
+        if data["min"] is not None:
+            histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+    def percentile(self, percent):
+        """Valor abaixo do qual estão `percent`% das amostras"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for index, value in enumerate(self.counts):
+            seen += value
+            if seen >= target:
+                return min(max(self.bucket_value(index), self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def stdev(self):
+        """Desvio padrão amostral"""
+        if self.count < 2:
+            return 0.0
+        variance = (self.total_squares - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def summary(self):
+        """Resume o histograma em um dicionário (ms)"""
+        if not self.count:
+            return {}
+        summary = {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+        summary["median"] = summary["p50"]
+        if self.count > 1:
+            summary["stdev"] = self.stdev()
+        return summary
@@ -0,0 +1,134 @@
+"""
+Estratégias de chave das mensagens (experimentos de partição quente)
+
+A chave decide a partição: chaves repetidas concentram carga em poucas
+partições, chave nula deixa o particionador do proxy distribuir. As
+estratégias aleatórias sorteiam uma única vez uma tabela compacta de
+índices de chave (array 'I'); no envio a chave da mensagem N é só
+tabela[N % tamanho], obtida por fatia, sem sorteio no caminho quente.
+
+sequential  uma chave por mensagem (ID da mensagem), comportamento original
+uniform     índices uniformes em [0, key_space)
+zipf        índices com distribuição de Zipf (expoente `skew`): poucas chaves quentes
+null        sem chave: o proxy distribui as mensagens entre as partições
+sticky      uma chave por worker: cada worker escreve sempre na mesma partição
+"""
+
+import itertools
+import random
+from array import array
+
+# Mensagens por ciclo da tabela pré-sorteada
+KEY_TABLE_SIZE = 1 << 16
+
+
+class KeyStrategy:
+    name = None
+    # False = registros sem chave
+    has_key = True
+
+    def keys(self, start_id, count, thread_id):
+        """Índices de chave das mensagens start_id .. start_id + count - 1"""
+        raise NotImplementedError
+
+    def key_for(self, msg_id, thread_id):
+        """Índice de chave de uma mensagem (None = sem chave)"""
+        return self.keys(msg_id, 1, thread_id)[0]
+
+
+class SequentialKeys(KeyStrategy):
+    name = "sequential"
+
+    def keys(self, start_id, count, thread_id):
+        return range(start_id, start_id + count)
+
+    def key_for(self, msg_id, thread_id):
+        return msg_id
+
+
+class TableKeys(KeyStrategy):
+    """Base das estratégias sorteadas: tabela duplicada para fatias sem volta ao início"""
+
+    def __init__(self, key_space, seed=None):
+        self.key_space = key_space
+        table = array('I', self.draw(random.Random(seed), KEY_TABLE_SIZE))
+        self.table = table + table
+
+    def draw(self, rng, size):
+        raise NotImplementedError
+
+    def keys(self, start_id, count, thread_id):
+        offset = start_id % KEY_TABLE_SIZE
+        if count <= KEY_TABLE_SIZE:
+            return self.table[offset:offset + count]
+        return array('I', itertools.islice(itertools.cycle(self.table[:KEY_TABLE_SIZE]), offset, offset + count))
+
+    def key_for(self, msg_id, thread_id):
+        return self.table[msg_id % KEY_TABLE_SIZE]
+
+
+class UniformKeys(TableKeys):
+    name = "uniform"
+
+    def draw(self, rng, size):
+        return (rng.randrange(self.key_space) for _ in range(size))
+
+
+class ZipfKeys(TableKeys):
+    name = "zipf"
+
+    def __init__(self, key_space, skew=1.1, seed=None):
+        self.skew = skew
+        super().__init__(key_space, seed)
+
+    def draw(self, rng, size):
+        weights = itertools.accumulate(1 / (rank ** self.skew) for rank in range(1, self.key_space + 1))
+        return rng.choices(range(self.key_space), cum_weights=list(weights), k=size)
+
+
+class NullKeys(KeyStrategy):
+    name = "null"
+    has_key = False
+
+    def keys(self, start_id, count, thread_id):
+        return None
+
+    def key_for(self, msg_id, thread_id):
+        return None
+
+
+class StickyKeys(KeyStrategy):
+    name = "sticky"
+
+    def keys(self, start_id, count, thread_id):
+        return (thread_id,) * count
+
+    def key_for(self, msg_id, thread_id):
+        return thread_id
+
+
+KEY_STRATEGIES = ("sequential", "uniform", "zipf", "null", "sticky")
+
+
+def create_keys(config):
+    """Estratégia de chave da configuração (tabela reproduzível por faixa de IDs)"""
+    name = config.key_strategy
+    if name == "uniform":
+        return UniformKeys(config.key_space, seed=config.first_id)
+    if name == "zipf":
+        return ZipfKeys(config.key_space, config.zipf_skew, seed=config.first_id)
+    if name == "null":
+        return NullKeys()
+    if name == "sticky":
+        return StickyKeys()
+    return SequentialKeys()
+
+
+def describe_keys(config):
+    """Descrição da estratégia de chave para o cabeçalho dos relatórios"""
+    name = config.key_strategy
+    if name == "uniform":
+        return f"uniform ({config.key_space:,} chaves)"
+    if name == "zipf":
+        return f"zipf (s={config.zipf_skew}, {config.key_space:,} chaves)"
+    return name
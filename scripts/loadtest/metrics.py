@@ -0,0 +1,138 @@
+"""
+Exportação de métricas durante a execução (--metrics-port / --metrics-file)
+
+A cada --metrics-interval segundos uma amostra da janela (vazão, requisições
+em voo, taxa de erro e percentis de latência) é:
+
+- gravada como uma linha JSON em --metrics-file (série temporal para soak
+  tests, sem depender do stdout)
+- publicada em GET /metrics no formato texto do Prometheus, junto com os
+  contadores acumulados, para ser coletada ao lado do JMX do Kafka
+
+Os percentis da janela vêm dos histogramas por endpoint (latência de cada
+requisição HTTP a partir do envio real). Com --processes cada processo
+exporta o seu: porta --metrics-port + índice do processo e linhas com o
+campo "process" no mesmo arquivo (append de uma linha é atômico).
+"""
+
+import asyncio
+import json
+import time
+
+from aiohttp import web
+
+
+QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+
+COUNTERS = (
+    ("loadtest_messages_delivered_total", "Mensagens confirmadas pelo REST Proxy", "success_count"),
+    ("loadtest_messages_failed_total", "Mensagens perdidas (HTTP, exceção ou error_code do registro)", "error_count"),
+    ("loadtest_requests_total", "Requisições HTTP enviadas", "requests_sent"),
+    ("loadtest_bytes_sent_total", "Bytes de corpo enviados", "bytes_sent"),
+    ("loadtest_overloads_total", "Respostas 429/5xx e timeouts/falhas de conexão", "overloads"),
+)
+
+
+class MetricsExporter:
+    def __init__(self, stats, profile_name, interval=1.0, path=None, port=None, process_index=0):
+        self.stats = stats
+        self.interval = interval
+        self.path = path
+        self.port = port
+        self.process_index = process_index
+        self.labels = f'profile="{profile_name}",process="{process_index}"'
+        self.file = None
+        self.runner = None
+        self.started_at = None
+        self.previous = None
+        self.latest = None
+
+    def totals(self):
+        stats = self.stats
+        return ({field: getattr(stats, field) for _, _, field in COUNTERS}, stats.request_latency(),
+                time.perf_counter())
+
+    async def start(self):
+        if self.path:
+            self.file = open(self.path, "a", encoding="utf-8")
+        if self.port:
+            app = web.Application()
+            app.router.add_get("/metrics", self.handle_metrics)
+            self.runner = web.AppRunner(app, access_log=None)
+            await self.runner.setup()
+            await web.TCPSite(self.runner, port=self.port + self.process_index).start()
+        self.started_at = time.time()
+        self.previous = self.totals()
+
+    def sample(self, in_flight):
+        """Fecha a janela: amostra da vazão e latência desde a anterior"""
+        counters, latency, now = current = self.totals()
+        previous_counters, previous_latency, previous_time = self.previous
+        self.previous = current
+        elapsed = now - previous_time
+        if elapsed <= 0:
+            return
+        window = latency.since(previous_latency)
+        delivered = counters["success_count"] - previous_counters["success_count"]
+        failed = counters["error_count"] - previous_counters["error_count"]
+        requests = counters["requests_sent"] - previous_counters["requests_sent"]
+
+        self.latest = {
+            "ts": round(time.time(), 3),
+            "elapsed": round(time.time() - self.started_at, 3),
+            "process": self.process_index,
+            "throughput": round(delivered / elapsed, 1),
+            "requests_per_second": round(requests / elapsed, 1),
+            "in_flight": in_flight,
+            "error_rate": round(failed / (delivered + failed), 6) if delivered + failed else 0.0,
+            "delivered": counters["success_count"],
+            "failed": counters["error_count"],
+            "latency_ms": {name: round(window.percentile(quantile * 100), 3) if window.count else None
+                           for name, quantile in QUANTILES},
+        }
+        if self.file:
+            self.file.write(json.dumps(self.latest, separators=(',', ':')) + "\n")
+            self.file.flush()
+
+    async def run(self, in_flight_count):
+        """Amostra a cada intervalo; `in_flight_count()` devolve as requisições HTTP em voo"""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.sample(in_flight_count())
+
+    async def stop(self, in_flight):
+        """Última amostra (janela parcial) e encerramento do arquivo e do servidor"""
+        self.sample(in_flight)
+        if self.file:
+            self.file.close()
+        if self.runner:
+            await self.runner.cleanup()
+
+    def render(self):
+        """Texto de exposição do Prometheus"""
+        labels = self.labels
+        lines = []
+        for name, help_text, field in COUNTERS:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter",
+                      f"{name}{{{labels}}} {getattr(self.stats, field)}"]
+        latest = self.latest
+        if latest:
+            for name, help_text, key in (
+                ("loadtest_throughput_messages_per_second", "Vazão da última janela", "throughput"),
+                ("loadtest_requests_per_second", "Requisições por segundo na última janela", "requests_per_second"),
+                ("loadtest_in_flight_requests", "Requisições HTTP em voo", "in_flight"),
+                ("loadtest_error_rate", "Fração de mensagens com erro na última janela", "error_rate"),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name}{{{labels}}} {latest[key]}"]
+            name = "loadtest_request_latency_seconds"
+            lines += [f"# HELP {name} Percentis da latência das requisições HTTP na última janela",
+                      f"# TYPE {name} gauge"]
+            for key, quantile in QUANTILES:
+                value = latest["latency_ms"][key]
+                if value is not None:
+                    lines.append(f'{name}{{{labels},quantile="{quantile}"}} {value / 1000}')
+        return "\n".join(lines) + "\n"
+
+    async def handle_metrics(self, request):
+        return web.Response(body=self.render().encode("utf-8"),
+                            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
@@ -0,0 +1,383 @@
+"""
+REST Proxy simulado para medir o cliente sem Kafka
+
+Implementa `GET /topics` e `POST /topics/{topic}` da API v2 do Confluent
+REST Proxy: cada registro recebe partição (hash da chave ou round-robin) e
+offset crescente por partição. Latência, taxa de erros e respostas 429/5xx
+são configuráveis, de modo que o teto do próprio cliente possa ser medido
+(e a suíte rodar em CI) sem o docker-compose completo.
+
+Os formatos json, binary e avro são aceitos; para o avro o mesmo servidor
+responde às rotas básicas do Schema Registry (`/subjects/{subject}/versions`,
+`/schemas/ids/{id}`), então --schema-registry pode apontar para ele.
+
+A API de consumers v2 (criar instância, assinar, `GET /records`, remover)
+também é simulada: registros produzidos em tópicos com assinantes são
+distribuídos por partição entre as instâncias de cada consumer group.
+"""
+
+import asyncio
+import collections
+import json
+import multiprocessing
+import random
+import time
+import zlib
+
+from aiohttp import web
+
+from .formats import CONTENT_TYPES
+
+V2_CONTENT_TYPE = 'application/vnd.kafka.v2+json'
+REGISTRY_CONTENT_TYPE = 'application/vnd.schemaregistry.v1+json'
+
+# Registros retidos por instância de consumidor (os mais antigos são descartados)
+CONSUMER_BACKLOG = 100_000
+
+# Códigos de erro no formato do REST Proxy v2 ({"error_code", "message"})
+ERROR_CODES = {
+    404: 40403,
+    409: 40902,
+    415: 415,
+    422: 42202,
+    429: 42901,
+    500: 50001,
+    502: 50002,
+    503: 50003,
+    504: 50004,
+}
+
+
+def compact_dumps(value):
+    """JSON sem espaços, como o Jackson do REST Proxy"""
+    return json.dumps(value, separators=(',', ':'))
+
+
+class LatencyDistribution:
+    """Distribuição de latência (ms) a partir de uma especificação textual
+
+    "0" ou "fixed:5"         latência fixa
+    "uniform:1:10"           uniforme entre 1 e 10 ms
+    "normal:5:2"             normal com média 5 e desvio 2 (truncada em 0)
+    "exponential:5"          exponencial com média 5
+    "lognormal:5:0.5"        log-normal com mediana 5 e sigma 0.5 (cauda longa)
+    """
+
+    ARITY = {"fixed": 1, "uniform": 2, "normal": 2, "exponential": 1, "lognormal": 2}
+
+    def __init__(self, spec):
+        name, _, params = spec.partition(":")
+        try:
+            if params:
+                self.name = name
+                self.values = [float(value) for value in params.split(":")]
+            else:
+                self.name = "fixed"
+                self.values = [float(name)]
+        except ValueError:
+            raise ValueError(f"Distribuição de latência inválida: {spec}") from None
+        if self.ARITY.get(self.name) != len(self.values):
+            raise ValueError(f"Distribuição de latência inválida: {spec}")
+
+    def sample(self, rng):
+        values = self.values
+        if self.name == "uniform":
+            return rng.uniform(*values)
+        if self.name == "normal":
+            return max(0.0, rng.gauss(*values))
+        if self.name == "exponential":
+            return rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+        if self.name == "lognormal":
+            return values[0] * rng.lognormvariate(0, values[1])
+        return values[0]
+
+
+class MockConsumer:
+    """Instância de consumidor: fila de registros entregues e aviso de chegada"""
+
+    def __init__(self):
+        self.topics = ()
+        self.backlog = collections.deque(maxlen=CONSUMER_BACKLOG)
+        self.arrived = asyncio.Event()
+
+    def deliver(self, record, size):
+        self.backlog.append((record, size))
+        self.arrived.set()
+
+    def take(self, max_bytes):
+        """Registros até max_bytes (pelo menos um, se houver)"""
+        records = []
+        total = 0
+        backlog = self.backlog
+        while backlog and (not records or total + backlog[0][1] <= max_bytes):
+            record, size = backlog.popleft()
+            records.append(record)
+            total += size
+        if not backlog:
+            self.arrived.clear()
+        return records
+
+
+class MockRestProxy:
+    def __init__(self, partitions=48, latency="0", error_rate=0.0, error_status=500,
+                 throttle_rate=0.0, record_error_rate=0.0, seed=None):
+        self.partitions = partitions
+        self.latency = LatencyDistribution(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rate = throttle_rate
+        # Fração de registros com error_code na resposta 200 (falha parcial do lote)
+        self.record_error_rate = record_error_rate
+        self.seed = seed
+        self.random = random.Random(seed)
+        # Próximo offset de cada partição, por tópico
+        self.offsets = {}
+        self.next_partition = 0
+        # Schema Registry: ID por schema e IDs registrados por subject
+        self.schema_ids = {}
+        self.subjects = {}
+        # Consumers: instâncias por group
+        self.groups = {}
+        self.requests = 0
+        self.records = 0
+        self.errors = 0
+
+    def create_app(self):
+        app = web.Application(client_max_size=128 * 1024 * 1024)
+        app.router.add_get('/topics', self.list_topics)
+        app.router.add_post('/topics/{topic}', self.produce)
+        app.router.add_get('/subjects', self.list_subjects)
+        app.router.add_post('/subjects/{subject}/versions', self.register_schema)
+        app.router.add_get('/schemas/ids/{schema_id}', self.get_schema)
+        app.router.add_post('/consumers/{group}', self.create_consumer)
+        app.router.add_post('/consumers/{group}/instances/{name}/subscription', self.subscribe)
+        app.router.add_get('/consumers/{group}/instances/{name}/records', self.fetch_records)
+        app.router.add_delete('/consumers/{group}/instances/{name}', self.delete_consumer)
+        return app
+
+    def error_response(self, status, message):
+        self.errors += 1
+        body = json.dumps({"error_code": ERROR_CODES.get(status, status * 100), "message": message})
+        return web.Response(status=status, text=body, content_type=V2_CONTENT_TYPE)
+
+    def partition_for(self, record):
+        """Partição do registro: explícita, pelo hash da chave ou round-robin"""
+        partition = record.get("partition")
+        if partition is not None:
+            return partition % self.partitions
+        key = record.get("key")
+        if key is not None:
+            return zlib.crc32(json.dumps(key).encode('utf-8')) % self.partitions
+        self.next_partition = (self.next_partition + 1) % self.partitions
+        return self.next_partition
+
+    def assign_offsets(self, topic, records, record_size):
+        offsets = self.offsets.setdefault(topic, [0] * self.partitions)
+        subscribers = self.subscribers(topic)
+        result = []
+        for record in records:
+            if self.record_error_rate and self.random.random() < self.record_error_rate:
+                # Como o REST Proxy: erro retriável do Kafka, sem partição nem offset
+                result.append({"partition": None, "offset": None, "error_code": 2,
+                               "error": "Injected retriable Kafka exception"})
+                continue
+            partition = self.partition_for(record)
+            offset = offsets[partition]
+            result.append({"partition": partition, "offset": offset, "error_code": None, "error": None})
+            offsets[partition] += 1
+            if subscribers:
+                delivered = {"topic": topic, "key": record.get("key"), "value": record.get("value"),
+                             "partition": partition, "offset": offset}
+                for members in subscribers:
+                    members[partition % len(members)].deliver(delivered, record_size)
+        return result
+
+    def subscribers(self, topic):
+        """Instâncias inscritas no tópico, agrupadas por consumer group"""
+        subscribers = []
+        for consumers in self.groups.values():
+            members = [consumer for consumer in consumers.values() if topic in consumer.topics]
+            if members:
+                subscribers.append(members)
+        return subscribers
+
+    def consumer(self, request):
+        return self.groups.get(request.match_info['group'], {}).get(request.match_info['name'])
+
+    async def create_consumer(self, request):
+        body = json.loads(await request.read() or b'{}')
+        group = request.match_info['group']
+        consumers = self.groups.setdefault(group, {})
+        name = body.get("name") or f"consumer-{len(consumers)}"
+        if name in consumers:
+            return self.error_response(409, "Consumer instance with the specified name already exists")
+        consumers[name] = MockConsumer()
+        return web.json_response({
+            "instance_id": name,
+            "base_uri": f"{request.scheme}://{request.host}/consumers/{group}/instances/{name}"
+        }, content_type=V2_CONTENT_TYPE)
+
+    async def subscribe(self, request):
+        consumer = self.consumer(request)
+        if consumer is None:
+            return self.error_response(404, "Consumer instance not found")
+        consumer.topics = tuple(json.loads(await request.read()).get("topics", ()))
+        return web.Response(status=204)
+
+    async def fetch_records(self, request):
+        consumer = self.consumer(request)
+        if consumer is None:
+            return self.error_response(404, "Consumer instance not found")
+        if not consumer.backlog:
+            try:
+                await asyncio.wait_for(consumer.arrived.wait(), int(request.query.get("timeout", 1000)) / 1000)
+            except asyncio.TimeoutError:
+                pass
+        records = consumer.take(int(request.query.get("max_bytes", 64 * 1024 * 1024)))
+        return web.json_response(records, content_type=request.headers.get("Accept", V2_CONTENT_TYPE))
+
+    async def delete_consumer(self, request):
+        consumers = self.groups.get(request.match_info['group'], {})
+        if consumers.pop(request.match_info['name'], None) is None:
+            return self.error_response(404, "Consumer instance not found")
+        if not consumers:
+            del self.groups[request.match_info['group']]
+        return web.Response(status=204)
+
+    async def list_subjects(self, request):
+        return web.json_response(sorted(self.subjects), content_type=REGISTRY_CONTENT_TYPE)
+
+    async def register_schema(self, request):
+        """Mesmo schema, mesmo ID (como o Schema Registry)"""
+        try:
+            schema = json.loads(await request.read())["schema"]
+            json.loads(schema)
+        except (ValueError, KeyError, TypeError):
+            return web.json_response({"error_code": 42201, "message": "Invalid schema"},
+                                     status=422, content_type=REGISTRY_CONTENT_TYPE)
+        schema_id = self.schema_ids.setdefault(schema, len(self.schema_ids) + 1)
+        versions = self.subjects.setdefault(request.match_info['subject'], [])
+        if schema_id not in versions:
+            versions.append(schema_id)
+        return web.json_response({"id": schema_id}, content_type=REGISTRY_CONTENT_TYPE)
+
+    async def get_schema(self, request):
+        schema_id = int(request.match_info['schema_id'])
+        for schema, known_id in self.schema_ids.items():
+            if known_id == schema_id:
+                return web.json_response({"schema": schema}, content_type=REGISTRY_CONTENT_TYPE)
+        return web.json_response({"error_code": 40403, "message": "Schema not found"},
+                                 status=404, content_type=REGISTRY_CONTENT_TYPE)
+
+    def check_schemas(self, body):
+        """Erro do formato avro (schema ausente ou desconhecido) ou None"""
+        known_ids = self.schema_ids.values()
+        for field in ("key_schema_id", "value_schema_id"):
+            schema_id = body.get(field)
+            if schema_id is not None and schema_id not in known_ids:
+                return self.error_response(404, f"Schema {schema_id} not found")
+        if body.get("value_schema_id") is None and body.get("value_schema") is None:
+            return self.error_response(422, "Request includes values but does not include value schema")
+        return None
+
+    async def list_topics(self, request):
+        return web.json_response(sorted(self.offsets), content_type=V2_CONTENT_TYPE)
+
+    async def produce(self, request):
+        self.requests += 1
+        raw_body = await request.read()
+
+        delay = self.latency.sample(self.random)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        draw = self.random.random()
+        if draw < self.throttle_rate:
+            return self.error_response(429, "Too many requests")
+        if draw < self.throttle_rate + self.error_rate:
+            return self.error_response(self.error_status, "Injected failure")
+
+        if request.content_type not in CONTENT_TYPES.values():
+            return self.error_response(415, f"Unsupported media type: {request.content_type}")
+        try:
+            body = json.loads(raw_body)
+            records = body["records"]
+        except (ValueError, KeyError, TypeError):
+            return self.error_response(422, "Unprocessable entity")
+        if request.content_type == CONTENT_TYPES["avro"]:
+            error = self.check_schemas(body)
+            if error is not None:
+                return error
+
+        self.records += len(records)
+        record_size = len(raw_body) // max(len(records), 1)
+        return web.json_response({
+            "key_schema_id": body.get("key_schema_id"),
+            "value_schema_id": body.get("value_schema_id"),
+            "offsets": self.assign_offsets(request.match_info['topic'], records, record_size)
+        }, content_type=V2_CONTENT_TYPE, dumps=compact_dumps)
+
+    async def report(self, interval):
+        """Imprime requisições e registros por segundo enquanto houver tráfego"""
+        last_requests, last_records, last_time = 0, 0, time.perf_counter()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            if self.requests != last_requests:
+                elapsed = now - last_time
+                print(f"📥 {(self.records - last_records) / elapsed:,.0f} msg/s | "
+                      f"{(self.requests - last_requests) / elapsed:,.0f} req/s | "
+                      f"Total: {self.records:,} msgs | Erros injetados: {self.errors:,}")
+            last_requests, last_records, last_time = self.requests, self.records, now
+
+
+def serve(proxy, host, port, report_interval, reuse_port=False, worker_index=None):
+    if worker_index is not None:
+        # Sequência própria por processo: seed + índice, ou entropia do SO sem --seed
+        # (o estado do gerador copiado para os filhos seria o mesmo em todos)
+        proxy.random = random.Random(None if proxy.seed is None else proxy.seed + worker_index)
+    app = proxy.create_app()
+
+    async def start_reporter(app):
+        app['reporter'] = asyncio.create_task(proxy.report(report_interval))
+
+    async def stop_reporter(app):
+        app['reporter'].cancel()
+
+    if report_interval:
+        app.on_startup.append(start_reporter)
+        app.on_cleanup.append(stop_reporter)
+
+    try:
+        web.run_app(app, host=host, port=port, print=None, access_log=None, reuse_port=reuse_port)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_mock_proxy(proxy, host="0.0.0.0", port=8082, report_interval=5.0, workers=1):
+    """Sobe o servidor simulado até Ctrl+C
+
+    Com workers > 1 cada processo escuta a mesma porta (SO_REUSEPORT) com
+    seu próprio estado: os offsets passam a ser contados por processo, e
+    cada um sorteia latência e erros com a semente seed + índice do processo.
+    """
+    print(f"🧪 REST Proxy simulado em http://{host}:{port}")
+    print(f"Partições: {proxy.partitions} | Erros: {proxy.error_rate:.1%} (HTTP {proxy.error_status}) | "
+          f"429: {proxy.throttle_rate:.1%} | Processos: {workers}")
+    if workers <= 1:
+        serve(proxy, host, port, report_interval)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=serve, args=(proxy, host, port, report_interval, True, index))
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
@@ -0,0 +1,55 @@
+"""
+Geração de carga em múltiplos processos (--processes N)
+
+Cada processo recebe uma faixa disjunta de IDs de mensagem e uma fração da
+concorrência, roda seu próprio event loop com sua própria sessão aiohttp e
+devolve os contadores ao processo pai, que os consolida em um único relatório.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import LoadEngine
+from .reporters import SilentReporter
+from .stats import LoadStats
+
+
+def run_worker_process(profile_cls, config):
+    """Ponto de entrada do processo filho: retorna (stats, início, fim) ou None"""
+    engine = LoadEngine(profile_cls(), config, reporter=SilentReporter())
+    try:
+        stats = asyncio.run(engine.run())
+    except KeyboardInterrupt:
+        return None
+    if stats is None:
+        return None
+    return stats, engine.started_at, engine.finished_at
+
+
+def run_processes(profile, config):
+    """Distribui o teste entre config.processes processos e imprime o relatório consolidado"""
+    reporter = profile.create_reporter(config)
+    reporter.start(config)
+    print(f"Processos: {config.processes}")
+
+    parts = [part for part in config.split(config.processes) if part.messages > 0]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(parts), mp_context=context) as executor:
+        futures = [executor.submit(run_worker_process, type(profile), part) for part in parts]
+        results = [future.result() for future in futures]
+
+    finished = [result for result in results if result is not None]
+    if len(finished) < len(parts):
+        print(f"ERRO: {len(parts) - len(finished)} de {len(parts)} processos não concluíram o teste")
+        if not finished:
+            return None
+
+    stats = LoadStats()
+    for part_stats, _, _ in finished:
+        stats.merge(part_stats)
+
+    # Janela de envio: do primeiro processo a iniciar até o último a terminar
+    duration = stats.duration = max(end for _, _, end in finished) - min(start for _, start, _ in finished)
+    reporter.report(stats, duration, config.messages)
+    return stats
@@ -0,0 +1,44 @@
+"""
+Leitura barata das respostas de produção do REST Proxy
+
+A resposta de um lote traz um objeto por registro:
+    {"partition": 3, "offset": 1200, "error_code": null, "error": null}
+Em vez de json.loads + dicts, duas buscas de regex em bytes extraem os pares
+(partição, offset) e os error_code não nulos. Registros com falha vêm com
+partição e offset nulos, então não entram nos pares. Se o corpo não tiver o
+formato esperado, cai no json.loads. Registros que nem assim aparecem (corpo
+vazio, truncado ou com menos objetos que o lote) ficam sem confirmação e são
+contados à parte, nunca como entregues.
+"""
+
+import json
+import re
+
+OFFSET_PATTERN = re.compile(rb'"partition":\s*(\d+),\s*"offset":\s*(\d+)')
+ERROR_CODE_PATTERN = re.compile(rb'"error_code":\s*(\d+)')
+
+
+def parse_offsets(body, expected):
+    """(pares (partição, offset), error_codes, registros sem confirmação) de uma resposta com `expected` registros"""
+    offsets = OFFSET_PATTERN.findall(body)
+    error_codes = ERROR_CODE_PATTERN.findall(body) if len(offsets) < expected else []
+    if len(offsets) + len(error_codes) != expected:
+        # Corpo que nem o json.loads aceita (vazio, truncado): valem os registros que a regex achou
+        offsets, error_codes = parse_offsets_json(body) or (offsets, ERROR_CODE_PATTERN.findall(body))
+    return offsets, error_codes, max(0, expected - len(offsets) - len(error_codes))
+
+
+def parse_offsets_json(body):
+    """(pares, error_codes) pelo json.loads; None se o corpo não for um JSON válido"""
+    offsets = []
+    error_codes = []
+    try:
+        records = json.loads(body).get("offsets") or []
+    except (ValueError, AttributeError):
+        return None
+    for record in records:
+        if record.get("error_code") is not None:
+            error_codes.append(record["error_code"])
+        elif record.get("partition") is not None:
+            offsets.append((record["partition"], record["offset"]))
+    return offsets, error_codes
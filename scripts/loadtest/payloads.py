@@ -0,0 +1,313 @@
+"""
+Geradores de payload para os perfis de teste
+Cada gerador produz o corpo JSON ({"records": [...]}) de um lote de mensagens
+no formato embutido escolhido (json, binary ou avro, ver formats.py)
+"""
+
+import base64
+import json
+import random
+import string
+import time
+from datetime import datetime
+
+import aiohttp
+
+from .formats import KEY_SCHEMA
+from .keys import SequentialKeys
+from .templates import BatchTemplate, slot, text_slot
+
+
+def utc_timestamp():
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def epoch_us():
+    """Horário de envio gravado em `sent_at_us` para a latência ponta a ponta do consumidor"""
+    return time.time_ns() // 1000
+
+
+def record_schema(name, fields):
+    """Schema Avro de um record com campos (nome, tipo)"""
+    return {
+        "type": "record",
+        "name": name,
+        "namespace": "loadtest",
+        "fields": [{"name": field, "type": field_type} for field, field_type in fields]
+    }
+
+
+def b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def binary_record(record):
+    """Registro binary.v2: chave (se houver) e valor (JSON) em base64"""
+    encoded = {"value": b64(json.dumps(record["value"], separators=(',', ':')).encode('utf-8'))}
+    if "key" in record:
+        encoded = {"key": b64(record["key"].encode('utf-8')), **encoded}
+    return encoded
+
+
+class PayloadGenerator:
+    """Base dos geradores: um registro por ID de mensagem"""
+
+    # Formatos embutidos suportados pelo gerador
+    formats = ("json", "binary", "avro")
+    # Schema Avro do valor (formato avro)
+    value_schema = None
+
+    def __init__(self, embedded_format="json", keys=None):
+        self.embedded_format = embedded_format
+        # Estratégia de chave (keys.py); padrão: uma chave por ID de mensagem
+        self.keys = keys or SequentialKeys()
+        self.key_schema_id = None
+        self.value_schema_id = None
+
+    def prepare(self):
+        """Preparação opcional executada antes do início do teste"""
+
+    async def register_schemas(self, session, registry, topic):
+        """Registra (ou obtém do cache) os schemas de chave e valor do tópico"""
+        self.key_schema_id = await registry.register(session, f"{topic}-key", KEY_SCHEMA)
+        self.value_schema_id = await registry.register(session, f"{topic}-value", self.value_schema)
+
+    def body(self, records):
+        """Envolve os registros no corpo do formato embutido"""
+        if not self.keys.has_key:
+            records = [{"value": record["value"]} for record in records]
+        if self.embedded_format == "avro":
+            return {"key_schema_id": self.key_schema_id, "value_schema_id": self.value_schema_id,
+                    "records": records}
+        if self.embedded_format == "binary":
+            records = [binary_record(record) for record in records]
+        return {"records": records}
+
+    def encode(self, start_id, count, thread_id):
+        """Corpo da requisição já codificado em bytes"""
+        return json.dumps(self.build(start_id, count, thread_id)).encode('utf-8')
+
+    def record(self, msg_id, thread_id):
+        raise NotImplementedError
+
+    def build(self, start_id, count, thread_id):
+        """Gera o corpo de um lote com `count` mensagens a partir de `start_id`"""
+        return self.body([self.record(msg_id, thread_id) for msg_id in range(start_id, start_id + count)])
+
+
+class BasicPayload(PayloadGenerator):
+    """Mensagem de tamanho médio com dados aleatórios (teste básico)"""
+
+    value_schema = record_schema("BasicMessage", [
+        ("id", "long"), ("thread", "int"), ("message", "string"), ("timestamp", "string"),
+        ("random_data", "string"), ("payload_size", "string"), ("test_run", "long"), ("sent_at_us", "long")
+    ])
+
+    def record(self, msg_id, thread_id):
+        return {
+            "key": f"key-{self.keys.key_for(msg_id, thread_id)}",
+            "value": {
+                "id": msg_id,
+                "thread": thread_id,
+                "message": f"Mensagem de teste {msg_id} do thread {thread_id}",
+                "timestamp": utc_timestamp(),
+                "random_data": ''.join(random.choices(string.ascii_letters + string.digits, k=100)),
+                "payload_size": "medium",
+                "test_run": int(time.time()),
+                "sent_at_us": epoch_us()
+            }
+        }
+
+
+class TemplatePayload(PayloadGenerator):
+    """Base dos geradores com template pré-codificado por tamanho de lote
+
+    Sem binary: o base64 de cada valor mudaria com o ID e quebraria o template.
+    """
+
+    formats = ("json", "avro")
+
+    def __init__(self, embedded_format="json", keys=None):
+        super().__init__(embedded_format, keys)
+        self.templates = {}
+
+    def template_record(self, index):
+        """Registro N do template usando marcadores de templates.slot()/text_slot()"""
+        raise NotImplementedError
+
+    def batch_values(self, start_id, count, thread_id):
+        """Valores dos campos por lote (texto em bytes)"""
+        return {"thread": thread_id, "sent_at": epoch_us()}
+
+    def template(self, count):
+        template = self.templates.get(count)
+        if template is None:
+            body = self.body([self.template_record(index) for index in range(count)])
+            template = self.templates[count] = BatchTemplate(body)
+        return template
+
+    def encode(self, start_id, count, thread_id):
+        return self.template(count).render(start_id, self.batch_values(start_id, count, thread_id),
+                                           self.keys.keys(start_id, count, thread_id))
+
+    def build(self, start_id, count, thread_id):
+        return json.loads(self.encode(start_id, count, thread_id))
+
+
+class OptimizedPayload(TemplatePayload):
+    """Batch enxuto do teste otimizado"""
+
+    value_schema = record_schema("OptimizedMessage", [
+        ("id", "long"), ("thread", "int"), ("message", "string"), ("timestamp", "string"),
+        ("batch_id", "long"), ("test_type", "string"), ("sent_at_us", "long")
+    ])
+
+    def template_record(self, index):
+        return {
+            "key": f"optimized-key-{text_slot('key', index)}",
+            "value": {
+                "id": slot("id", index),
+                "thread": slot("thread", index),
+                "message": f"Mensagem otimizada {index}",
+                "timestamp": text_slot("ts", index),
+                "batch_id": slot("batch", index),
+                "test_type": "optimized_load_test",
+                "sent_at_us": slot("sent_at", index)
+            }
+        }
+
+    def batch_values(self, start_id, count, thread_id):
+        return {"thread": thread_id, "batch": start_id // count, "ts": utc_timestamp().encode('ascii'),
+                "sent_at": epoch_us()}
+
+
+class ExtremePayload(TemplatePayload):
+    """Batch de máxima velocidade: template pré-codificado, só IDs reescritos"""
+
+    value_schema = record_schema("ExtremeMessage", [
+        ("id", "long"), ("message", "string"), ("timestamp", "string"), ("data", "string"),
+        ("sequence", "int"), ("thread_marker", "string"), ("thread", "int"), ("sent_at_us", "long")
+    ])
+
+    def __init__(self, batch_size, embedded_format="json", keys=None):
+        super().__init__(embedded_format, keys)
+        self.batch_size = batch_size
+        self.base_data = ''.join(random.choices(string.ascii_letters + string.digits, k=100))
+        self.timestamp = utc_timestamp()
+
+    def prepare(self):
+        """Pré-codifica o template do lote para máxima performance"""
+        print(f"🔥 Pré-codificando template de {self.batch_size} mensagens...")
+        body = self.encode(1, self.batch_size, 0)
+        print(f"✅ Template de {len(body) / 1024:.1f}KB criado")
+
+    def template_record(self, index):
+        return {
+            "key": f"extreme-{text_slot('key', index)}",
+            "value": {
+                "id": slot("id", index),
+                "message": f"Extreme performance test message {index}",
+                "timestamp": self.timestamp,
+                "data": self.base_data,
+                "sequence": index,
+                "thread_marker": "extreme-test",
+                "thread": slot("thread", index),
+                "sent_at_us": slot("sent_at", index)
+            }
+        }
+
+
+class ChunkedBody(aiohttp.payload.Payload):
+    """Corpo de requisição formado por pedaços enviados em sequência, sem concatenação
+
+    Os pedaços podem ser memoryviews de um mesmo blob compartilhado entre
+    registros e requisições: o blob nunca é copiado para montar o corpo.
+    """
+
+    _autoclose = True
+
+    def __init__(self, chunks):
+        super().__init__(chunks)
+        self._size = sum(len(chunk) for chunk in chunks)
+
+    def __len__(self):
+        return self._size
+
+    def decode(self, encoding="utf-8", errors="strict"):
+        return b"".join(self._value).decode(encoding, errors)
+
+    async def write(self, writer):
+        for chunk in self._value:
+            await writer.write(chunk)
+
+
+class LargePayload(PayloadGenerator):
+    """Mensagens com payload grande (64KB por padrão), várias por requisição
+
+    O payload é gerado uma única vez; cada registro referencia o mesmo blob via
+    memoryview e só o cabeçalho do registro (chave, ID, timestamp) é formatado.
+    No formato json o payload vai em base64 dentro do valor; em binary o valor
+    é o base64 dos dados originais; em avro o campo `bytes` leva os dados
+    originais (texto ASCII), sem os 33% do base64.
+    """
+
+    KEY_HEAD = b'{"key":"large-msg-%d",'
+    HEAD = b'"value":{"id":%d,"timestamp":"%s","sent_at_us":%d,"system":"load-test-%d","payload":"'
+    BINARY_KEY_HEAD = b'{"key":"%s",'
+    BINARY_HEAD = b'"value":"'
+
+    value_schema = record_schema("LargeMessage", [
+        ("id", "long"), ("timestamp", "string"), ("sent_at_us", "long"), ("system", "string"),
+        ("payload", "bytes")
+    ])
+
+    def __init__(self, concurrency, record_size=64 * 1024, embedded_format="json", keys=None):
+        super().__init__(embedded_format, keys)
+        self.concurrency = concurrency
+        # 4 caracteres base64 para cada 3 bytes originais
+        data = self.generate_data(record_size * 3 // 4)
+        self.base64_payload = base64.b64encode(data).decode('ascii')
+        self.blob = memoryview(data if embedded_format == "avro" else self.base64_payload.encode('ascii'))
+        self.tail = b'"}' if embedded_format == "binary" else b'"}}'
+        print(f"✅ Payload de {format_size(len(self.blob))} criado com sucesso")
+
+    @staticmethod
+    def generate_data(original_size):
+        """Gera os dados originais (64KB de base64 = aproximadamente 48KB de dados originais)"""
+        pattern = "Hello World! This is a test payload for Kafka load testing with 64KB messages. " * 100
+        repeats = original_size // len(pattern) + 1
+        return (pattern * repeats)[:original_size].encode('utf-8')
+
+    def record_head(self, msg_id, key, timestamp, sent_at):
+        if self.embedded_format == "binary":
+            if key is None:
+                return b'{' + self.BINARY_HEAD
+            return self.BINARY_KEY_HEAD % base64.b64encode(b"large-msg-%d" % key) + self.BINARY_HEAD
+        head = self.HEAD % (msg_id, timestamp, sent_at, msg_id % self.concurrency)
+        return b'{' + head if key is None else self.KEY_HEAD % key + head
+
+    def encode(self, start_id, count, thread_id):
+        timestamp = utc_timestamp().encode('ascii')
+        sent_at = epoch_us()
+        if self.embedded_format == "avro":
+            prefix = b'{"key_schema_id":%d,"value_schema_id":%d,"records":[' % (
+                self.key_schema_id, self.value_schema_id)
+        else:
+            prefix = b'{"records":['
+        chunks = [prefix]
+        keys = self.keys.keys(start_id, count, thread_id) or (None,) * count
+        for msg_id, key in zip(range(start_id, start_id + count), keys):
+            head = self.record_head(msg_id, key, timestamp, sent_at)
+            chunks.append(head if msg_id == start_id else self.tail + b',' + head)
+            chunks.append(self.blob)
+        chunks.append(self.tail + b']}')
+        return ChunkedBody(chunks)
+
+    def build(self, start_id, count, thread_id):
+        return json.loads(self.encode(start_id, count, thread_id).decode())
+
+
+def format_size(size):
+    """Tamanho legível (KB/MB) para os relatórios"""
+    value, unit = (size / 1024 / 1024, "MB") if size >= 1024 * 1024 else (size / 1024, "KB")
+    return f"{value:.2f}".rstrip("0").rstrip(".") + unit
@@ -0,0 +1,157 @@
+"""
+Perfis de teste: combinam gerador de payload, estratégia de envio e relatório
+Os scripts em scripts/*.py são apenas CLIs finas sobre estes perfis
+"""
+
+import aiohttp
+
+from .config import parse_size
+from .keys import create_keys
+from .payloads import BasicPayload, ExtremePayload, LargePayload, OptimizedPayload
+from .reporters import BasicReporter, ExtremeReporter, LargeMessageReporter, OptimizedReporter
+from .senders import BatchSender, RetryingSender, SingleSender
+
+
+class Profile:
+    name = None
+    description = ""
+    defaults = {}
+    # Formatos embutidos aceitos em --format (os do gerador de payload)
+    formats = ("json",)
+
+    def add_arguments(self, parser):
+        """Opções de linha de comando específicas do perfil"""
+
+    def create_payload(self, config):
+        raise NotImplementedError
+
+    def create_sender(self, config, payload, stats):
+        raise NotImplementedError
+
+    def create_reporter(self, config):
+        raise NotImplementedError
+
+    def unit_size(self, config):
+        """Número de mensagens por unidade de trabalho"""
+        return config.batch_size
+
+    def connector_options(self, config):
+        return {}
+
+    def session_options(self, config):
+        return {}
+
+
+class BasicProfile(Profile):
+    name = "basic"
+    description = "Teste de carga para Kafka REST Proxy"
+    defaults = {"messages": 1000, "concurrency": 10, "topic": "test", "batch_size": 10}
+    formats = BasicPayload.formats
+
+    def create_payload(self, config):
+        return BasicPayload(config.embedded_format, create_keys(config))
+
+    def create_sender(self, config, payload, stats):
+        return SingleSender(config.topic, payload, stats, timeout=30)
+
+    def create_reporter(self, config):
+        return BasicReporter()
+
+
+class OptimizedProfile(Profile):
+    name = "optimized"
+    description = "Teste de carga otimizado para Kafka REST Proxy"
+    defaults = {"messages": 1000, "concurrency": 10, "topic": "test", "batch_size": 10}
+    formats = OptimizedPayload.formats
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-budget', type=float, default=10.0,
+                            help='Retries limitados a esta porcentagem das respostas bem-sucedidas (padrão: 10)')
+
+    def create_payload(self, config):
+        return OptimizedPayload(config.embedded_format, create_keys(config))
+
+    def create_sender(self, config, payload, stats):
+        return RetryingSender(config.topic, payload, stats, retry_count=3,
+                              retry_budget=config.retry_budget / 100)
+
+    def create_reporter(self, config):
+        return OptimizedReporter()
+
+    def connector_options(self, config):
+        # Pool de conexões otimizado
+        return {
+            "limit": config.concurrency * 2,
+            "limit_per_host": config.concurrency * 2,
+            "keepalive_timeout": 30,
+            "enable_cleanup_closed": True
+        }
+
+
+class ExtremeProfile(Profile):
+    name = "extreme"
+    description = "Teste EXTREMO para 50K+ msg/s"
+    defaults = {"messages": 50000, "concurrency": 200, "topic": "extreme-performance", "batch_size": 500}
+    formats = ExtremePayload.formats
+
+    def create_payload(self, config):
+        return ExtremePayload(config.batch_size, config.embedded_format, create_keys(config))
+
+    def create_sender(self, config, payload, stats):
+        # Timeout agressivo, sem retry
+        return BatchSender(config.topic, payload, stats, timeout=5)
+
+    def create_reporter(self, config):
+        return ExtremeReporter()
+
+    def connector_options(self, config):
+        # Conector para máxima performance
+        return {
+            "limit": config.concurrency * 4,
+            "limit_per_host": config.concurrency * 4,
+            "keepalive_timeout": 300,
+            "enable_cleanup_closed": True,
+            "use_dns_cache": True,
+            "ttl_dns_cache": 600,
+            "family": 0,
+            "ssl": False,
+            "force_close": False
+        }
+
+    def session_options(self, config):
+        return {
+            "timeout": aiohttp.ClientTimeout(total=10, connect=1),
+            "headers": {
+                'Connection': 'keep-alive',
+                'Keep-Alive': 'timeout=300, max=1000'
+            }
+        }
+
+
+class LargeMessageProfile(Profile):
+    name = "64kb"
+    description = "Teste de carga com mensagens grandes (64KB, 1MB, 10MB)"
+    defaults = {"messages": 50, "concurrency": 5, "topic": "large-messages", "batch_size": 10}
+    default_record_size = 64 * 1024
+    formats = LargePayload.formats
+
+    def add_arguments(self, parser):
+        # KAFKA_MESSAGE_MAX_BYTES / KAFKA_REST_MAX_REQUEST_SIZE aceitam até 100MB por requisição
+        parser.add_argument('--record-size', type=parse_size, default=self.default_record_size,
+                            help='Tamanho do payload de cada mensagem: 64KB, 1MB, 10MB... (padrão: 64KB)')
+
+    def create_payload(self, config):
+        return LargePayload(config.concurrency, config.record_size or self.default_record_size,
+                            config.embedded_format, create_keys(config))
+
+    def create_sender(self, config, payload, stats):
+        return BatchSender(config.topic, payload, stats, timeout=60)
+
+    def create_reporter(self, config):
+        return LargeMessageReporter(config.record_size or self.default_record_size)
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in (BasicProfile, OptimizedProfile, ExtremeProfile, LargeMessageProfile)
+}
@@ -0,0 +1,168 @@
+"""
+Perfil do próprio cliente durante o teste (--profile-client)
+
+Quando o teste estaciona em uma vazão, separa o limite do REST Proxy do limite
+do nosso Python. Dois medidores rodam só durante o envio:
+
+StackSampler  timer de CPU (setitimer ITIMER_PROF) que a cada INTERVAL de CPU
+              consumida interrompe o thread principal e registra a pilha em
+              execução, sem instrumentar o caminho quente. Só conta quando o
+              processo usa CPU: o tempo parado no select() não gera amostras,
+              e uma thread amostradora seria enviesada pelo GIL (só pegaria a
+              pilha quando o loop o solta, quase sempre no select)
+LoopLag       corrotina que dorme LAG_INTERVAL e mede o atraso ao acordar: o
+              tempo em que o loop ficou ocupado sem atender callbacks
+
+Cada amostra vai para uma categoria, a de maior precedência entre os frames
+da pilha (CATEGORIES, em ordem), e para a pilha no formato folded
+("raiz;...;folha N"), lido por flamegraph.pl, speedscope e inferno. Sem
+setitimer (Windows) só o atraso do loop é medido.
+"""
+
+import asyncio
+import os
+import signal
+import time
+
+from .histogram import LatencyHistogram
+from .stats import ProfileStats
+
+# CPU consumida entre amostras da pilha (s)
+INTERVAL = 0.005
+LAG_INTERVAL = 0.01
+
+OTHER = "outros"
+
+# (categoria, [(trecho do caminho, funções ou None para todas)]) em ordem de precedência
+CATEGORIES = (
+    ("tratamento da resposta", [
+        ("loadtest/offsets.py", None),
+        ("loadtest/senders.py", {"record_delivery"}),
+        ("aiohttp/client_proto.py", None),
+        ("aiohttp/http_parser.py", None),
+        ("aiohttp/streams.py", None),
+        ("aiohttp/client_reqrep.py", {"read", "json", "text", "start", "release"}),
+    ]),
+    ("serialização", [
+        ("json/", None),
+        ("loadtest/formats.py", None),
+    ]),
+    ("geração de payload", [
+        ("loadtest/payloads.py", None),
+        ("loadtest/templates.py", None),
+        ("loadtest/keys.py", None),
+    ]),
+    ("contadores", [
+        ("loadtest/stats.py", None),
+        ("loadtest/histogram.py", None),
+    ]),
+    ("envio HTTP", [
+        ("aiohttp/", None),
+        ("asyncio/selector_events.py", None),
+        ("loadtest/senders.py", None),
+        ("loadtest/balancer.py", None),
+    ]),
+    ("event loop", [
+        ("asyncio/", None),
+    ]),
+)
+
+
+def frame_info(code):
+    """(rótulo do frame, índice da categoria em CATEGORIES ou None)"""
+    path = code.co_filename.replace(os.sep, "/")
+    label = f"{code.co_name} ({os.path.basename(path)}:{code.co_firstlineno})"
+    for index, (_, rules) in enumerate(CATEGORIES):
+        for fragment, functions in rules:
+            if fragment in path and (functions is None or code.co_name in functions):
+                return label, index
+    return label, None
+
+
+class StackSampler:
+    available = hasattr(signal, "setitimer")
+
+    def __init__(self, interval=INTERVAL):
+        self.interval = interval
+        # Pilha (tupla de code objects, raiz primeiro) -> amostras; rótulos só no fim
+        self.counts = {}
+        self.info = {}
+        self.handler_seconds = 0.0
+        self.previous_handler = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.cpu_started = time.process_time()
+        if self.available:
+            self.previous_handler = signal.signal(signal.SIGPROF, self.sample)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def sample(self, signum, frame):
+        started = time.perf_counter()
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        stack = tuple(reversed(stack))
+        self.counts[stack] = self.counts.get(stack, 0) + 1
+        self.handler_seconds += time.perf_counter() - started
+
+    def category(self, stack):
+        best = None
+        for code in stack:
+            index = self.info[code][1]
+            if index is not None and (best is None or index < best):
+                best = index
+        return CATEGORIES[best][0] if best is not None else OTHER
+
+    def stop(self, loop_lag):
+        """Desliga o timer e consolida as amostras em um ProfileStats"""
+        if self.available:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self.previous_handler or signal.SIG_DFL)
+        profile = ProfileStats(self.interval)
+        profile.wall_seconds = time.perf_counter() - self.started_at
+        profile.cpu_seconds = time.process_time() - self.cpu_started
+        profile.sampler_seconds = self.handler_seconds
+        profile.loop_lag = loop_lag
+        for stack, count in self.counts.items():
+            if not stack:
+                continue
+            for code in stack:
+                if code not in self.info:
+                    self.info[code] = frame_info(code)
+            labels = [self.info[code][0] for code in stack]
+            profile.samples += count
+            profile.stacks[";".join(labels)] += count
+            profile.functions[labels[-1]] += count
+            profile.categories[self.category(stack)] += count
+        return profile
+
+
+class LoopLag:
+    """Atraso do event loop: quanto cada sleep(LAG_INTERVAL) acorda depois do previsto (ms)"""
+
+    def __init__(self, interval=LAG_INTERVAL):
+        self.histogram = LatencyHistogram()
+        self.interval = interval
+
+    async def run(self, tick=None):
+        """Mede até ser cancelada; `tick()` é chamada a cada despertar (amostras de quem monitora)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.histogram.record(max(0.0, (loop.time() - expected) * 1000))
+            if tick:
+                tick()
+
+
+def write_folded(path, profile):
+    """Grava as pilhas no formato folded (entrada de flamegraph.pl / speedscope)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as output:
+        for stack, count in profile.stacks.most_common():
+            output.write(f"{stack} {count}\n")
+    return path
@@ -0,0 +1,674 @@
+"""
+Relatórios de console dos perfis de teste
+"""
+
+import os
+
+from .adaptive import OVERLOAD_TOLERANCE
+from .keys import describe_keys
+from .payloads import format_size
+from .saturation import MIN_WINDOWS, suggested_processes
+
+# Partições por tópico no docker-compose (KAFKA_NUM_PARTITIONS)
+DEFAULT_PARTITIONS = 48
+# Acima disso (mensagens da partição mais carregada / média) a partição quente limita o throughput
+SKEW_WARNING = 1.5
+
+
+class Reporter:
+    """Base dos relatórios: cabeçalho, progresso e resultado final"""
+
+    separator_width = 40
+    # Intervalo (s) do progresso periódico; None desativa tick()
+    progress_interval = None
+    # Saturação do cliente da execução sendo relatada (definida em report)
+    saturation = None
+
+    def start(self, config):
+        print(f"Tópico: {config.topic}")
+        print(f"Total de mensagens: {config.messages:,}")
+        print(f"Concorrência: {config.concurrency}")
+        print(f"Tamanho do batch: {config.batch_size}")
+        if len(config.urls) > 1:
+            print(f"REST Proxies ({config.balance}): {', '.join(config.urls)}")
+        else:
+            print(f"REST Proxy: {config.url}")
+        if config.key_strategy != "sequential":
+            print(f"Chaves: {describe_keys(config)}")
+        print("=" * self.separator_width)
+
+    def connectivity_ok(self):
+        print("✓ Conectividade com REST Proxy verificada")
+
+    def connectivity_failed(self, reason):
+        print(f"ERRO: Não foi possível conectar ao REST Proxy: {reason}")
+
+    def executing(self, total_units):
+        print(f"Executando {total_units:,} batches...")
+
+    def progress(self, stats, completed, total_units, elapsed):
+        """Chamado a cada unidade de trabalho concluída"""
+
+    def tick(self, stats, completed, total_units, elapsed, in_flight):
+        """Chamado a cada progress_interval segundos durante o envio"""
+
+    def finish(self, stats, duration, total_messages):
+        raise NotImplementedError
+
+    def report(self, stats, duration, total_messages):
+        """Resultado final do perfil seguido das seções opcionais
+
+        Com regime estável detectado o resultado principal é só dele; a
+        execução completa e o aquecimento aparecem logo abaixo.
+        """
+        steady = stats.steady
+        self.saturation = stats.saturation
+        if steady is not None and steady.detected:
+            self.finish(steady, steady.seconds, steady.success_count + steady.error_count)
+        else:
+            self.finish(stats, duration, total_messages)
+        if steady is not None:
+            self.print_steady_state(steady, stats, duration, total_messages)
+        if stats.saturation is not None:
+            self.print_saturation(stats.saturation)
+        if stats.target_rate:
+            self.print_open_loop(stats)
+        if stats.connections is not None:
+            self.print_connections(stats.connections)
+        if stats.profiling is not None:
+            self.print_profiling(stats.profiling)
+        if len(stats.endpoints) > 1:
+            self.print_endpoints(stats.endpoints, duration)
+        if stats.adaptive:
+            self.print_adaptive(stats.adaptive)
+        if stats.retry_budget is not None:
+            self.print_retries(stats)
+        partitions = stats.partitions
+        if partitions:
+            self.print_partitions(partitions)
+
+    def print_steady_state(self, steady, stats, duration, total_messages):
+        """Aquecimento x regime estável e a vazão de cada janela"""
+        windows = ", ".join(f"{value:,.0f}" for value in steady.throughputs[:20])
+        if len(steady.throughputs) > 20:
+            windows += ", ..."
+        print(f"\nAQUECIMENTO E REGIME ESTÁVEL (janelas de {steady.window:g}s):")
+        if steady.detected:
+            suffix = f", {steady.processes} processos" if steady.processes > 1 else ""
+            print(f"  Resultados acima: só o regime estável (janelas {steady.first_window}–{steady.last_window}, "
+                  f"{steady.seconds:.2f}s, variação {steady.cv * 100:.1f}%{suffix})")
+            warmup = steady.warmup_latency.summary()
+            line = (f"  Aquecimento: {steady.warmup_seconds:.2f}s | {steady.warmup_messages:,} msg | "
+                    f"{steady.warmup_messages / steady.warmup_seconds if steady.warmup_seconds > 0 else 0:,.0f} msg/s")
+            if warmup:
+                line += f" | P50 {warmup['p50']:.2f} ms | P99 {warmup['p99']:.2f} ms"
+            print(line)
+            print(f"  Execução completa: {duration:.2f}s | {total_messages:,} msg | "
+                  f"{stats.success_count / duration if duration > 0 else 0:,.0f} msg/s (com aquecimento e esvaziamento)")
+            print("  Percentis do regime estável: mesma latência da execução completa, só nas janelas do regime")
+        else:
+            detail = f"menor variação {steady.cv * 100:.1f}%" if steady.cv is not None else "janelas insuficientes"
+            print(f"  ⚠️  Regime estável não detectado em {len(steady.throughputs)} janela(s) ({detail}): "
+                  f"os resultados acima incluem o aquecimento")
+            print("     Aumente --messages, reduza --steady-window ou aceite mais variação com --steady-cv")
+        if windows:
+            print(f"  Vazão por janela (msg/s): {windows}")
+
+    def print_saturation(self, saturation):
+        """CPU, atraso do event loop e requisições em voo do próprio cliente"""
+        lag = saturation.loop_lag.summary()
+        suffix = f", {saturation.processes} processos" if saturation.processes > 1 else ""
+        print(f"\nSATURAÇÃO DO CLIENTE ({saturation.windows} janelas de {saturation.window:g}s{suffix}):")
+        peak = f" (pico {saturation.peak_cpu * 100:.0f}%)" if saturation.windows else ""
+        print(f"  CPU: {saturation.cpu * 100:.0f}% de um núcleo por processo{peak} | "
+              f"Em voo: {saturation.in_flight:,.1f} de {saturation.concurrency}")
+        if lag:
+            print(f"  Atraso do event loop (ms): P50 {lag['p50']:.2f} | P99 {lag['p99']:.2f} | Máx {lag['max']:.2f} "
+                  f"(limite do P99 por janela: {saturation.max_loop_lag:g})")
+        if saturation.saturated is None:
+            print(f"  Execução curta demais para um veredito: {saturation.windows} janela(s) completa(s), "
+                  f"mínimo {MIN_WINDOWS} por processo")
+            return
+        if not saturation.saturated:
+            print(f"  ✓ Cliente com folga: {saturation.saturated_windows} de {saturation.windows} janelas saturadas")
+            return
+        print(f"  ⚠️  Cliente saturado em {saturation.saturated_windows} de {saturation.windows} janelas "
+              f"({'; '.join(saturation.reasons())})")
+        print("     A latência e a vazão acima incluem a espera no próprio cliente, não só no REST Proxy")
+        for line in self.client_advice(saturation):
+            print(f"     {line}")
+
+    def client_advice(self, saturation):
+        """Como tirar o gargalo do cliente saturado"""
+        processes = suggested_processes(saturation.processes)
+        if processes:
+            return [f"Aumentar --processes para {processes} (um event loop por núcleo; "
+                    f"{os.cpu_count()} núcleos nesta máquina)"]
+        return [f"Todos os núcleos da máquina ({os.cpu_count()}) já estão ocupados "
+                f"({saturation.processes} processo(s)): distribuir a carga em mais máquinas geradoras"]
+
+    def print_open_loop(self, stats):
+        """Quanto a taxa real de disparo ficou atrás da taxa alvo (--rate)"""
+        achieved = stats.dispatched_messages / stats.dispatch_seconds if stats.dispatch_seconds > 0 else 0
+        shortfall = max(0.0, 1 - achieved / stats.target_rate) * 100
+        lag = stats.schedule_lag.summary()
+
+        print(f"\nMODO TAXA CONSTANTE (open-loop):")
+        print(f"  Taxa alvo: {stats.target_rate:,.0f} msg/s")
+        print(f"  Taxa de disparo atingida: {achieved:,.0f} msg/s ({shortfall:.1f}% abaixo do alvo)")
+        if lag:
+            print(f"  Atraso de disparo (ms): P50 {lag['p50']:.2f} | P99 {lag['p99']:.2f} | Máx {lag['max']:.2f}")
+        print("  Latências medidas a partir do horário previsto de envio")
+
+    def print_connections(self, connections):
+        """Fases das requisições: separa o tempo no pool do cliente do tempo no proxy"""
+        opened = connections.created + connections.reused
+        reuse = connections.reused / opened * 100 if opened else 0
+        print(f"\nCAMADA DE CONEXÃO ({connections.requests:,} requisições):")
+        print(f"  Conexões criadas: {connections.created:,} | Reutilizadas: {connections.reused:,} ({reuse:.1f}% de reuso)")
+        print(f"  {'Fase (ms)':<22}{'P50':>10}{'P99':>10}{'Máx':>10}{'Amostras':>11}")
+        for label, histogram in (("Fila do pool", connections.queue_wait), ("DNS", connections.dns),
+                                 ("Conexão TCP", connections.connect), ("Envio do corpo", connections.upload),
+                                 ("Primeiro byte (TTFB)", connections.ttfb)):
+            summary = histogram.summary()
+            if summary:
+                print(f"  {label:<22}{summary['p50']:>10.2f}{summary['p99']:>10.2f}{summary['max']:>10.2f}"
+                      f"{summary['count']:>11,}")
+            else:
+                print(f"  {label:<22}{'-':>10}{'-':>10}{'-':>10}{0:>11}")
+
+        queue = connections.queue_wait.summary()
+        ttfb = connections.ttfb.summary()
+        if queue and ttfb and queue["p99"] > ttfb["p99"] / 2:
+            print("  ⚠️  A espera no pool é comparável ao TTFB: a latência vem do cliente; "
+                  "aumente o limit do conector ou reduza --concurrency")
+        if opened and reuse < 90:
+            print("  ⚠️  Pouco reuso de conexões: verifique keep-alive (force_close, keepalive_timeout)")
+
+    def print_profiling(self, profile):
+        """Onde o processo gasta CPU e quanto o event loop atrasa (--profile-client)"""
+        samples = profile.samples or 1
+        suffix = f", {profile.processes} processos" if profile.processes > 1 else ""
+        busy = profile.cpu_seconds / profile.wall_seconds / profile.processes if profile.wall_seconds > 0 else 0
+        print(f"\nPERFIL DO CLIENTE ({profile.samples:,} amostras a cada {profile.interval * 1000:g} ms de CPU{suffix}):")
+        print(f"  CPU: {profile.cpu_seconds:.2f}s em {profile.wall_seconds:.2f}s de envio "
+              f"({busy * 100:.0f}% de um núcleo por processo) | custo do amostrador: {profile.sampler_seconds:.3f}s")
+        lag = profile.loop_lag.summary()
+        if lag:
+            print(f"  Atraso do event loop (ms): P50 {lag['p50']:.2f} | P99 {lag['p99']:.2f} | Máx {lag['max']:.2f}")
+        if not profile.samples:
+            print("  Sem amostras de pilha (setitimer indisponível nesta plataforma ou execução curta demais)")
+            return
+        print("  CPU por etapa:")
+        for name, count in profile.categories.most_common():
+            print(f"    {name:<26}{count / samples * 100:>6.1f}%")
+        print("  Funções mais quentes (em execução na amostra):")
+        for name, count in profile.functions.most_common(8):
+            print(f"    {count / samples * 100:>5.1f}%  {name}")
+        if busy > 0.9:
+            print("  ⚠️  O processo usa um núcleo inteiro: o limite é o cliente, não o REST Proxy; "
+                  "use --processes ou reduza o custo das etapas acima")
+
+    def print_endpoints(self, endpoints, duration):
+        """Vazão, latência e erros de cada instância do REST Proxy"""
+        total_requests = sum(endpoint.requests for endpoint in endpoints.values()) or 1
+        print(f"\nPOR ENDPOINT ({len(endpoints)} instâncias do REST Proxy):")
+        for url, endpoint in endpoints.items():
+            throughput = endpoint.messages / duration if duration > 0 else 0
+            latency = endpoint.latency.summary()
+            line = (f"  {url}: {endpoint.requests:,} req ({endpoint.requests / total_requests * 100:.1f}%) | "
+                    f"{throughput:,.0f} msg/s")
+            if latency:
+                line += f" | P50 {latency['p50']:.2f} ms | P99 {latency['p99']:.2f} ms"
+            print(line)
+            if endpoint.errors_by_type:
+                errors = ", ".join(f"{key}: {count:,}" for key, count in sorted(endpoint.errors_by_type.items()))
+                print(f"      Falhas: {endpoint.failed_requests:,} req ({errors})")
+
+    def print_adaptive(self, summaries):
+        """Resultado do controle adaptativo (--target-p99), somando os processos"""
+        target = summaries[0]["target_p99"]
+        found = [summary["best"] for summary in summaries if summary["best"]]
+        suffix = f" (soma de {len(summaries)} processos)" if len(summaries) > 1 else ""
+
+        print(f"\nCONTROLE ADAPTATIVO (P99 alvo: {target:.1f} ms):")
+        if found:
+            throughput = sum(best[0] for best in found)
+            limit = sum(best[1] for best in found)
+            p99 = max(best[2] for best in found)
+            print(f"  Maior vazão sustentável: {throughput:,.0f} msg/s com {limit} requisições em voo "
+                  f"(P99 {p99:.2f} ms){suffix}")
+        else:
+            print("  ⚠️  Nenhuma janela saudável, nem com a concorrência mínima")
+        overloaded = sum(summary["overloaded_windows"] for summary in summaries)
+        slow = sum(summary["slow_windows"] for summary in summaries)
+        baseline = max(summary["baseline_overload_rate"] for summary in summaries)
+        if overloaded or slow:
+            print(f"  Janelas rejeitadas: {overloaded} por sobrecarga (429/5xx/timeout mais de "
+                  f"{OVERLOAD_TOLERANCE * 100:g}% acima da taxa de base), "
+                  f"{slow} por P99 acima do alvo")
+        if baseline > OVERLOAD_TOLERANCE:
+            print(f"  ⚠️  Taxa de erros de base {baseline * 100:.1f}% já na concorrência mínima: erros que não "
+                  "dependem da carga, descontados da detecção de sobrecarga")
+        floor = sum(summary["floor_windows"] for summary in summaries)
+        if floor:
+            print(f"  ⚠️  {floor} janela(s) com sobrecarga já na concorrência mínima: os erros não "
+                  "vêm da carga gerada; o limite não foi reduzido")
+        if not found and overloaded > slow:
+            print("  ⚠️  A concorrência caiu por sobrecarga, não por latência: o REST Proxy está rejeitando "
+                  "requisições; veja os erros acima")
+        final_limit = sum(summary["final_limit"] for summary in summaries)
+        max_limit = sum(summary["max_limit"] for summary in summaries)
+        print(f"  Limite final: {final_limit} de {max_limit} | Ajustes: "
+              f"{sum(summary['increases'] for summary in summaries)} aumentos, "
+              f"{sum(summary['decreases'] for summary in summaries)} reduções em "
+              f"{sum(summary['windows'] for summary in summaries)} janelas")
+        if final_limit >= max_limit:
+            print("  ⚠️  O limite chegou ao teto de --concurrency: aumente-o para explorar mais carga")
+
+    def print_retries(self, stats):
+        """Retries, espera e circuit breaker, separados da latência da primeira tentativa"""
+        print(f"\nRETRIES (orçamento: {stats.retry_budget * 100:.0f}% das respostas bem-sucedidas):")
+        print(f"  Tentativas extras: {stats.retry_attempts:,} | Lotes recuperados: {stats.retries_performed:,} | "
+              f"Negados pelo orçamento: {stats.retries_denied:,}")
+        print(f"  Tempo em backoff/circuito aberto: {stats.backoff_seconds:.2f}s (soma dos workers)")
+        print(f"  Circuit breaker: {stats.circuit_opens} abertura(s), {stats.circuit_open_seconds:.2f}s aberto")
+        retry_latency = stats.retry_latency.summary()
+        if retry_latency:
+            print(f"  Latência das tentativas extras (ms): P50 {retry_latency['p50']:.2f} | "
+                  f"P99 {retry_latency['p99']:.2f} | Máx {retry_latency['max']:.2f}")
+        print("  Os tempos de resposta acima são só das primeiras tentativas")
+
+    def print_partitions(self, partitions):
+        """Distribuição das mensagens entregues por partição (skew) e faixas de offset"""
+        counts = sorted(((entry[0], partition) for partition, entry in partitions.items()), reverse=True)
+        total = sum(count for count, _ in counts)
+        mean = total / len(counts)
+        stdev = (sum((count - mean) ** 2 for count, _ in counts) / len(counts)) ** 0.5
+        # Offsets não contíguos: outros produtores no tópico ou registros perdidos no meio
+        gaps = sum(1 for count, low, high in partitions.values() if high - low + 1 > count)
+
+        print(f"\nDISTRIBUIÇÃO POR PARTIÇÃO ({len(counts)} partições com mensagens):")
+        print(f"  Mensagens/partição: mín {counts[-1][0]:,} | média {mean:,.1f} | máx {counts[0][0]:,} "
+              f"(partição {counts[0][1]})")
+        print(f"  Skew (máx/média): {counts[0][0] / mean:.2f}x | Coeficiente de variação: {stdev / mean * 100:.1f}%")
+        print("  Mais carregadas: " + ", ".join(f"p{partition} ({count:,})" for count, partition in counts[:5]))
+        print(f"  Faixas de offset: {len(counts) - gaps} contíguas, {gaps} com lacunas")
+        if len(counts) < DEFAULT_PARTITIONS:
+            print(f"  ⚠️  Só {len(counts)} de {DEFAULT_PARTITIONS} partições (padrão do docker-compose) receberam mensagens")
+        if counts[0][0] / mean > SKEW_WARNING:
+            print(f"  ⚠️  Partição {counts[0][1]} recebe {counts[0][0] / mean:.1f}x a média: ela limita o throughput")
+
+    def print_latency(self, stats):
+        latency = stats.latency_summary()
+        if not latency:
+            return
+        print(f"\nTEMPOS DE RESPOSTA (ms):")
+        print(f"Mínimo: {latency['min']:.2f}")
+        print(f"Máximo: {latency['max']:.2f}")
+        print(f"Média: {latency['mean']:.2f}")
+        print(f"Mediana: {latency['median']:.2f}")
+        if "stdev" in latency:
+            print(f"Desvio padrão: {latency['stdev']:.2f}")
+        print(f"P90: {latency['p90']:.2f}")
+        print(f"P95: {latency['p95']:.2f}")
+        print(f"P99: {latency['p99']:.2f}")
+        print(f"P99.9: {latency['p999']:.2f}")
+
+
+class BasicReporter(Reporter):
+    def start(self, config):
+        print(f"=== Iniciando Teste de Carga ===")
+        super().start(config)
+
+    def finish(self, stats, duration, total_messages):
+        throughput = total_messages / duration if duration > 0 else 0
+
+        print("\n" + "=" * 50)
+        print("RESULTADOS DO TESTE DE CARGA")
+        print("=" * 50)
+        print(f"Tempo total: {duration:.2f}s")
+        print(f"Mensagens enviadas: {total_messages}")
+        print(f"Sucessos: {stats.success_count}")
+        print(f"Erros: {stats.error_count}")
+        print(f"Taxa de sucesso: {(stats.success_count/total_messages)*100:.2f}%")
+        print(f"Throughput: {throughput:.2f} msg/s")
+        self.print_latency(stats)
+        print("=" * 50)
+
+
+class OptimizedReporter(Reporter):
+    def start(self, config):
+        print("=== TESTE DE CARGA OTIMIZADO ===")
+        super().start(config)
+
+    def executing(self, total_units):
+        print(f"Executando {total_units:,} batches com retry automático...")
+
+    def progress(self, stats, completed, total_units, elapsed):
+        if completed % 10 == 0:
+            progress = (completed / total_units) * 100
+            print(f"Progresso: {progress:.1f}% ({completed}/{total_units} batches)")
+
+    def finish(self, stats, duration, total_messages):
+        """Imprime resultados otimizados com análise detalhada"""
+        throughput = stats.success_count / duration if duration > 0 else 0
+        success_rate = 0
+
+        print("\n" + "=" * 60)
+        print("RESULTADOS DO TESTE OTIMIZADO")
+        print("=" * 60)
+        print(f"Tempo total: {duration:.2f}s")
+        print(f"Mensagens processadas: {total_messages}")
+        print(f"Sucessos: {stats.success_count}")
+        print(f"Erros: {stats.error_count}")
+        print(f"Retries realizados: {stats.retries_performed}")
+
+        if total_messages > 0:
+            success_rate = (stats.success_count / total_messages) * 100
+            print(f"Taxa de sucesso: {success_rate:.2f}%")
+
+        print(f"Throughput: {throughput:.2f} msg/s")
+
+        # Análise de erros
+        if stats.errors_by_type:
+            print(f"\nERROS POR TIPO:")
+            for error_type, count in stats.errors_by_type.items():
+                print(f"  {error_type}: {count}")
+
+        self.print_latency(stats)
+
+        # Recomendações baseadas nos resultados
+        print(f"\nRECOMENDAÇÕES:")
+        if success_rate < 95:
+            print("- Taxa de sucesso baixa: considere reduzir concorrência (ou usar --target-p99) ou aumentar timeouts")
+        if throughput < 100:
+            print("- Throughput baixo: considere aumentar batch size ou verificar recursos")
+        if stats.retries_performed > 0:
+            print(f"- {stats.retries_performed} retries foram necessários: considere otimizar configurações")
+
+        print("=" * 60)
+
+
+class ExtremeReporter(Reporter):
+    separator_width = 50
+    progress_interval = 1.0
+
+    def start(self, config):
+        print("🔥 === TESTE EXTREMO PARA 50K+ MSG/S ===")
+        super().start(config)
+
+    def connectivity_ok(self):
+        print("✅ Conectividade extrema verificada")
+
+    def connectivity_failed(self, reason):
+        print(f"❌ ERRO: {reason}")
+
+    def executing(self, total_units):
+        print(f"🚀 Gerando {total_units:,} batches para modo EXTREMO...")
+
+    def tick(self, stats, completed, total_units, elapsed, in_flight):
+        """Estatísticas em tempo real"""
+        if elapsed <= 0:
+            return
+        progress = (completed / total_units) * 100
+        current_throughput = stats.success_count / elapsed
+        current_rps = stats.requests_sent / elapsed
+
+        print(f"⚡ Progresso: {progress:.1f}% | "
+              f"Throughput: {current_throughput:,.0f} msg/s | "
+              f"RPS: {current_rps:,.0f} | "
+              f"Batches: {completed:,}/{total_units:,} | "
+              f"Em voo: {in_flight}")
+
+    def print_capacity_advice(self):
+        """Sugestões quando a vazão está longe da meta: cliente saturado ou limite no servidor"""
+        saturation = self.saturation
+        if saturation is None or saturation.saturated is None:
+            print("   • Verificar recursos do sistema")
+        elif saturation.saturated:
+            for line in self.client_advice(saturation):
+                print(f"   • Cliente saturado: {line[0].lower()}{line[1:]}")
+            return
+        else:
+            print(f"   • Cliente com folga (CPU {saturation.cpu * 100:.0f}% de um núcleo): o limite está no "
+                  "REST Proxy/Kafka")
+        print("   • Aumentar partições para 100+")
+        print("   • Considerar hardware mais potente")
+
+    def finish(self, stats, duration, total_messages):
+        """Relatório de resultados extremos"""
+        throughput = stats.success_count / duration if duration > 0 else 0
+
+        print("\n" + "🔥" + "=" * 70)
+        print("RESULTADOS EXTREMOS - TESTE DE LIMITE MÁXIMO")
+        print("=" * 72)
+        print(f"⏱️  Tempo total: {duration:.3f}s")
+        print(f"📤 Mensagens enviadas: {total_messages:,}")
+        print(f"✅ Sucessos: {stats.success_count:,}")
+        print(f"❌ Erros: {stats.error_count:,}")
+        print(f"📊 Taxa de sucesso: {(stats.success_count/total_messages)*100:.3f}%")
+        print(f"🚀 THROUGHPUT: {throughput:,.2f} msg/s")
+
+        # Análise de dados
+        total_mb = stats.bytes_sent / 1024 / 1024
+        print(f"💾 Dados enviados: {total_mb:.2f} MB")
+
+        if duration > 0:
+            mb_per_sec = total_mb / duration
+            rps = stats.requests_sent / duration
+            print(f"📈 Throughput de dados: {mb_per_sec:.2f} MB/s")
+            print(f"🌐 Requests por segundo: {rps:,.0f} RPS")
+
+        # Meta 50K
+        target_50k = 50000
+        performance_ratio = (throughput / target_50k) * 100
+
+        if throughput >= target_50k:
+            print(f"🎯 META 50K ATINGIDA! {performance_ratio:.1f}% da meta")
+            print("🏆 SISTEMA NO LIMITE MÁXIMO!")
+        else:
+            print(f"📈 Progresso: {performance_ratio:.1f}% da meta de 50K msg/s")
+            remaining = target_50k - throughput
+            print(f"🎯 Faltam {remaining:,.0f} msg/s para atingir 50K")
+
+            # Sugestões para atingir 50K
+            print(f"\n💡 SUGESTÕES PARA 50K MSG/S:")
+            if self.saturation is not None and self.saturation.saturated:
+                # Mais concorrência ou batches maiores não ajudam um cliente sem CPU sobrando
+                self.print_capacity_advice()
+            elif throughput > 30000:
+                print("   • MUITO PRÓXIMO! Ajustar batch size e concorrência")
+                print("   • Considerar múltiplas instâncias REST Proxy (--url A,B --balance least-outstanding)")
+            elif throughput > 20000:
+                print("   • Aumentar concorrência para 300-500")
+                print("   • Batch size para 1000+")
+                print("   • Verificar limitações de CPU/rede")
+            else:
+                self.print_capacity_advice()
+
+        # Latência em modo extremo
+        latency = stats.latency_summary()
+        if latency:
+            print(f"\n⚡ LATÊNCIA ({latency['count']:,} requests):")
+            print(f"   Média: {latency['mean']:.2f}ms")
+            print(f"   P50: {latency['p50']:.2f}ms")
+            print(f"   P90: {latency['p90']:.2f}ms")
+            print(f"   P99: {latency['p99']:.2f}ms")
+            print(f"   P99.9: {latency['p999']:.2f}ms")
+            print(f"   Máxima: {latency['max']:.2f}ms")
+
+        # Análise de erros
+        if stats.errors_by_type:
+            print(f"\n❌ ERROS DETECTADOS:")
+            for error_type, count in stats.errors_by_type.items():
+                print(f"   {error_type}: {count:,}")
+
+        print("=" * 72)
+
+
+class LargeMessageReporter(Reporter):
+    separator_width = 60
+
+    def __init__(self, record_size=64 * 1024):
+        self.record_size = record_size
+        self.size_label = format_size(record_size)
+
+    def start(self, config):
+        print(f"📦 === TESTE DE MENSAGENS {self.size_label} (MÉTODO FUNCIONAL) ===")
+        print(f"Tópico: {config.topic}")
+        print(f"Total de mensagens: {config.messages:,}")
+        print(f"Concorrência: {config.concurrency}")
+        print(f"Mensagens por requisição: {config.batch_size}")
+        print(f"Tamanho da mensagem: ~{self.size_label}")
+        print(f"Volume total estimado: {format_size(config.messages * self.record_size)}")
+        if config.key_strategy != "sequential":
+            print(f"Chaves: {describe_keys(config)}")
+        print("=" * self.separator_width)
+
+    def connectivity_ok(self):
+        print("✅ Conectividade verificada")
+
+    def connectivity_failed(self, reason):
+        print(f"❌ ERRO de conectividade: {reason}")
+
+    def executing(self, total_units):
+        print(f"🚀 Enviando {total_units:,} requisições...")
+
+    def progress(self, stats, completed, total_units, elapsed):
+        if completed % 10 == 0 or completed == total_units:
+            progress = (completed / total_units) * 100
+            current_throughput = stats.success_count / elapsed if elapsed > 0 else 0
+
+            print(f"📊 Progresso: {progress:.1f}% | "
+                  f"Sucessos: {stats.success_count} | "
+                  f"Erros: {stats.error_count} | "
+                  f"Throughput: {current_throughput:.1f} msg/s")
+
+    def finish(self, stats, duration, total_messages):
+        """Imprime resultados do teste funcional"""
+        throughput = stats.success_count / duration if duration > 0 else 0
+
+        print("\n" + "🎯" + "=" * 60)
+        print(f"RESULTADOS - TESTE FUNCIONAL COM MENSAGENS {self.size_label}")
+        print("=" * 62)
+        print(f"⏱️  Tempo total: {duration:.3f}s")
+        print(f"📤 Mensagens enviadas: {total_messages:,}")
+        print(f"✅ Sucessos: {stats.success_count:,}")
+        print(f"❌ Erros: {stats.error_count:,}")
+
+        if total_messages > 0:
+            success_rate = (stats.success_count / total_messages) * 100
+            print(f"📊 Taxa de sucesso: {success_rate:.2f}%")
+
+        print(f"🚀 Throughput: {throughput:.2f} msg/s")
+
+        # Análise de dados
+        total_mb = stats.bytes_sent / 1024 / 1024
+        print(f"💾 Volume enviado: {total_mb:.2f} MB")
+
+        if duration > 0:
+            mb_per_sec = total_mb / duration
+            print(f"📈 Throughput de dados: {mb_per_sec:.2f} MB/s")
+
+        # Latência
+        latency = stats.latency_summary()
+        if latency:
+            print(f"\n📊 LATÊNCIA:")
+            print(f"   Média: {latency['mean']:.2f}ms")
+            print(f"   Mínima: {latency['min']:.2f}ms")
+            print(f"   Máxima: {latency['max']:.2f}ms")
+            print(f"   P50: {latency['p50']:.2f}ms")
+            print(f"   P95: {latency['p95']:.2f}ms")
+            print(f"   P99: {latency['p99']:.2f}ms")
+
+        print("=" * 62)
+
+
+class SilentReporter(Reporter):
+    """Não imprime nada; usado pelos processos filhos no modo --processes"""
+
+    def report(self, stats, duration, total_messages):
+        pass
+
+    def start(self, config):
+        pass
+
+    def connectivity_ok(self):
+        pass
+
+    def connectivity_failed(self, reason):
+        print(f"ERRO: Não foi possível conectar ao REST Proxy: {reason}")
+
+    def executing(self, total_units):
+        pass
+
+    def finish(self, stats, duration, total_messages):
+        pass
+
+
+class ConsumerReporter:
+    """Relatório do benchmark de consumo (consumer-test.py)"""
+
+    separator_width = 60
+    progress_interval = 1.0
+
+    def start(self, config):
+        print("📥 === BENCHMARK DE CONSUMO - KAFKA REST PROXY ===")
+        print(f"Tópico: {config.topic}")
+        print(f"Consumer group: {config.group}")
+        print(f"Instâncias: {config.consumers}")
+        print(f"Formato: {config.embedded_format} | auto.offset.reset: {config.offset_reset}")
+        print(f"REST Proxy: {config.url}")
+        print("=" * self.separator_width)
+
+    def connectivity_ok(self):
+        print("✅ Consumidores criados e inscritos no tópico")
+
+    def connectivity_failed(self, reason):
+        print(f"❌ ERRO ao preparar os consumidores: {reason}")
+
+    def tick(self, stats, elapsed):
+        end_to_end = stats.end_to_end
+        line = f"📊 {elapsed:6.1f}s | Registros: {stats.records:,} | Polls: {stats.polls:,} (vazios: {stats.empty_polls:,})"
+        if end_to_end.count:
+            line += f" | E2E P50 {end_to_end.percentile(50):.1f}ms P99 {end_to_end.percentile(99):.1f}ms"
+        print(line)
+
+    def report(self, stats, duration):
+        throughput = stats.records / duration if duration > 0 else 0
+
+        print("\n" + "📥" + "=" * self.separator_width)
+        print("RESULTADOS - BENCHMARK DE CONSUMO")
+        print("=" * (self.separator_width + 2))
+        print(f"⏱️  Janela de consumo: {duration:.3f}s")
+        print(f"📦 Registros consumidos: {stats.records:,}")
+        print(f"🚀 Throughput sustentado: {throughput:,.2f} msg/s")
+        print(f"💾 Dados recebidos: {format_size(stats.bytes_received)}"
+              f" ({stats.bytes_received / 1024 / 1024 / duration if duration > 0 else 0:.2f} MB/s)")
+        print(f"🔁 Polls: {stats.polls:,} | Vazios: {stats.empty_polls:,}")
+
+        self.print_histogram("⚡ LATÊNCIA DO GET /records", stats.fetch_latency.summary())
+        end_to_end = stats.end_to_end.summary()
+        if end_to_end:
+            self.print_histogram("🎯 LATÊNCIA PONTA A PONTA (produção → consumo)", end_to_end)
+        else:
+            print("\n🎯 Nenhum registro com sent_at_us: latência ponta a ponta indisponível")
+
+        if stats.errors_by_type:
+            print(f"\n❌ ERROS:")
+            for error_type, count in stats.errors_by_type.items():
+                print(f"   {error_type}: {count}")
+        print("=" * (self.separator_width + 2))
+
+    @staticmethod
+    def print_histogram(title, summary):
+        if not summary:
+            return
+        print(f"\n{title} ({summary['count']:,} amostras):")
+        print(f"   Média: {summary['mean']:.2f}ms")
+        print(f"   P50: {summary['p50']:.2f}ms")
+        print(f"   P90: {summary['p90']:.2f}ms")
+        print(f"   P99: {summary['p99']:.2f}ms")
+        print(f"   P99.9: {summary['p999']:.2f}ms")
+        print(f"   Máxima: {summary['max']:.2f}ms")
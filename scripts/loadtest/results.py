@@ -0,0 +1,265 @@
+"""
+Resultados estruturados das execuções e comparação com uma linha de base
+
+Cada execução grava um JSON (por padrão em results/<perfil>-<data>.json) com
+a configuração, a impressão digital do ambiente, os totais, o histograma de
+latência completo e os erros por tipo. `compare` confronta execuções:
+
+- dois ou mais arquivos: o primeiro é a base e cada um dos demais é comparado a ela
+- grupos de repetições (--baseline A1 A2 ... --candidate B1 B2 ...): médias
+  dos grupos e teste t de Welch; a variação só é regressão se for
+  estatisticamente significativa (p < alpha)
+
+Regressão = vazão caiu mais que --max-throughput-drop % ou P99 subiu mais
+que --max-p99-rise %; nesse caso o código de saída é 1. Execuções com
+perfil ou carga diferentes (LOAD_FIELDS da configuração) não são
+comparadas: código de saída 2, a menos que --force seja usado.
+"""
+
+import json
+import math
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import time
+
+import aiohttp
+
+from .histogram import LatencyHistogram
+
+RESULT_SCHEMA = 1
+# Campos de `config` que moldam a carga (perfis e cenários); com diferenças a comparação exige --force
+LOAD_FIELDS = (
+    "topic", "messages", "concurrency", "batch_size", "processes", "rate", "record_size", "embedded_format",
+    "key_strategy", "key_space", "zipf_skew", "target_p99", "retry_budget", "workloads", "phases", "mix",
+)
+RESULTS_DIR = "results"
+
+
+def git_commit():
+    """Commit do repositório dos scripts (None fora de um checkout git)"""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def environment_fingerprint():
+    return {
+        "hostname": socket.gethostname(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "aiohttp": aiohttp.__version__,
+        "git_commit": git_commit(),
+    }
+
+
+def build_result(profile_name, config, stats, duration):
+    """Dicionário do resultado de uma execução (`config`: LoadConfig ou o dicionário do cenário)"""
+    total = stats.success_count + stats.error_count
+    latency = stats.latency
+    summary = latency.summary()
+    return {
+        "schema": RESULT_SCHEMA,
+        "profile": profile_name,
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        # Perfis: LoadConfig; cenários: o próprio arquivo do cenário
+        "config": config if isinstance(config, dict) else dict(vars(config)),
+        "environment": environment_fingerprint(),
+        "summary": {
+            "messages": getattr(config, "messages", total),
+            "success": stats.success_count,
+            "errors": stats.error_count,
+            "success_rate": stats.success_count / total if total else 0.0,
+            "duration_s": duration,
+            "throughput": stats.success_count / duration if duration > 0 else 0.0,
+            "requests": stats.requests_sent,
+            "bytes_sent": stats.bytes_sent,
+            "retries": stats.retries_performed,
+        },
+        "latency_ms": {key: summary[key] for key in ("min", "max", "mean", "p50", "p90", "p95", "p99", "p999")
+                       if key in summary},
+        "latency_histogram": latency.to_dict(),
+        "errors_by_type": stats.errors_by_type,
+        "steady_state": stats.steady.to_dict() if getattr(stats, "steady", None) is not None else None,
+        "client_profile": stats.profiling.to_dict() if getattr(stats, "profiling", None) is not None else None,
+        "client_saturation": stats.saturation.to_dict() if getattr(stats, "saturation", None) is not None else None,
+    }
+
+
+def default_result_path(profile_name):
+    return os.path.join(RESULTS_DIR, f"{profile_name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+
+
+def write_result(path, result):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(result, output, indent=2, ensure_ascii=False)
+    return path
+
+
+def load_result(path):
+    with open(path, encoding="utf-8") as source:
+        result = json.load(source)
+    if result.get("schema") != RESULT_SCHEMA:
+        raise ValueError(f"{path}: formato de resultado desconhecido (schema {result.get('schema')})")
+    return result
+
+
+def run_metrics(result):
+    """(vazão, P99) de uma execução: do regime estável quando detectado, senão da execução completa"""
+    steady = result.get("steady_state")
+    if steady and steady["detected"]:
+        return steady["throughput"], LatencyHistogram.from_dict(steady["latency_histogram"]).percentile(99)
+    histogram = LatencyHistogram.from_dict(result["latency_histogram"])
+    return result["summary"]["throughput"], histogram.percentile(99)
+
+
+def measured_steady(result):
+    steady = result.get("steady_state")
+    return bool(steady and steady["detected"])
+
+
+# Teste t de Welch sem dependências: distribuição t pela função beta incompleta
+
+def incomplete_beta(a, b, x):
+    """Função beta incompleta regularizada I_x(a, b) (frações contínuas de Lentz)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1 - incomplete_beta(b, a, 1 - x)
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)) / a
+    tiny = 1e-300
+    c, d = 1.0, 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    value = d
+    for m in range(1, 200):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            value *= c * d
+        if abs(c * d - 1) < 1e-12:
+            break
+    return front * value
+
+
+def welch_p_value(first, second):
+    """p-valor bilateral do teste t de Welch (None com menos de 2 amostras por grupo)"""
+    if len(first) < 2 or len(second) < 2:
+        return None
+    variance = statistics.variance(first) / len(first) + statistics.variance(second) / len(second)
+    if variance == 0:
+        return 0.0 if statistics.mean(first) != statistics.mean(second) else 1.0
+    t = (statistics.mean(first) - statistics.mean(second)) / math.sqrt(variance)
+    freedom = variance ** 2 / (
+        (statistics.variance(first) / len(first)) ** 2 / (len(first) - 1)
+        + (statistics.variance(second) / len(second)) ** 2 / (len(second) - 1)
+    )
+    return incomplete_beta(freedom / 2, 0.5, freedom / (freedom + t * t))
+
+
+def relative_change(baseline, candidate):
+    return (candidate - baseline) / baseline * 100 if baseline else 0.0
+
+
+def compare_groups(baseline, candidate, max_throughput_drop, max_p99_rise, alpha):
+    """Compara grupos de resultados; retorna (linhas do relatório, houve regressão)"""
+    base_throughput, base_p99 = zip(*(run_metrics(result) for result in baseline))
+    cand_throughput, cand_p99 = zip(*(run_metrics(result) for result in candidate))
+    checks = (
+        ("Vazão (msg/s)", base_throughput, cand_throughput, -max_throughput_drop, True),
+        ("P99 (ms)", base_p99, cand_p99, max_p99_rise, False),
+    )
+    lines = []
+    regression = False
+    for label, base_values, cand_values, limit, higher_is_better in checks:
+        change = relative_change(statistics.mean(base_values), statistics.mean(cand_values))
+        p_value = welch_p_value(base_values, cand_values)
+        exceeded = change < limit if higher_is_better else change > limit
+        significant = p_value is None or p_value < alpha
+        failed = exceeded and significant
+        regression = regression or failed
+        line = (f"  {label:<14}{statistics.mean(base_values):>14,.2f} → {statistics.mean(cand_values):>14,.2f}"
+                f"  {change:+7.2f}%")
+        if p_value is not None:
+            line += f"  p={p_value:.4f}"
+        if failed:
+            line += "  ❌ REGRESSÃO"
+        elif exceeded:
+            line += "  ⚠️  acima do limite, mas não significativo"
+        else:
+            line += "  ✅"
+        lines.append(line)
+    return lines, regression
+
+
+def environment_differences(baseline, candidate):
+    keys = ("hostname", "cpu_count", "python", "aiohttp", "platform")
+    first = baseline[0]["environment"]
+    return sorted({key for result in candidate for key in keys if result["environment"].get(key) != first.get(key)})
+
+
+def config_differences(baseline, candidate):
+    """Campos que moldam a carga e diferem da primeira execução da base (perfil incluso)"""
+    first = baseline[0]
+    differences = set()
+    for result in baseline[1:] + candidate:
+        if result["profile"] != first["profile"]:
+            differences.add("profile")
+        differences.update(key for key in LOAD_FIELDS
+                           if result["config"].get(key) != first["config"].get(key))
+    return sorted(differences)
+
+
+def compare(baseline_paths, candidate_groups, max_throughput_drop=5.0, max_p99_rise=10.0, alpha=0.05,
+            force=False):
+    """Imprime a comparação e retorna o código de saída (1 = regressão, 2 = cargas diferentes sem `force`)"""
+    baseline = [load_result(path) for path in baseline_paths]
+    for paths in candidate_groups:
+        differences = config_differences(baseline, [load_result(path) for path in paths])
+        if differences and not force:
+            print(f"ERRO: {', '.join(paths)} não usa a mesma carga da base ({', '.join(differences)} "
+                  "diferentes); use --force para comparar mesmo assim")
+            return 2
+    regression = False
+    print(f"📊 Base: {', '.join(baseline_paths)} (perfil {baseline[0]['profile']}, {len(baseline)} execução(ões))")
+    print(f"Limites: vazão -{max_throughput_drop:g}% | P99 +{max_p99_rise:g}% | alpha {alpha:g}")
+    for paths in candidate_groups:
+        candidate = [load_result(path) for path in paths]
+        print(f"\n{', '.join(paths)} ({len(candidate)} execução(ões)):")
+        differences = config_differences(baseline, candidate)
+        if differences:
+            print(f"  ⚠️  Carga diferente da base ({', '.join(differences)}): a variação não é só do sistema")
+        if len({measured_steady(result) for result in baseline + candidate}) > 1:
+            print("  ⚠️  Só parte das execuções tem regime estável detectado: comparando regime estável "
+                  "com execução completa")
+        saturated = [path for path, result in zip(baseline_paths + paths, baseline + candidate)
+                     if (result.get("client_saturation") or {}).get("saturated")]
+        if saturated:
+            print(f"  ⚠️  Cliente saturado em {', '.join(saturated)}: a vazão medida é a do gerador de carga")
+        differences = environment_differences(baseline, candidate)
+        if differences:
+            print(f"  ⚠️  Ambiente diferente da base: {', '.join(differences)}")
+        lines, failed = compare_groups(baseline, candidate, max_throughput_drop, max_p99_rise, alpha)
+        for line in lines:
+            print(line)
+        regression = regression or failed
+    print("\n❌ Regressão detectada" if regression else "\n✅ Sem regressões")
+    return 1 if regression else 0
+
@@ -0,0 +1,130 @@
+"""
+Política de retry compartilhada pelos workers de um processo
+
+Retries em sincronia de centenas de corrotinas agravam a sobrecarga que os
+causou. Três mecanismos limitam isso:
+
+RetryBudget     balde de fichas: cada resposta bem-sucedida deposita `ratio`
+                fichas e cada retry consome uma; sem fichas o retry é negado.
+                Assim os retries ficam limitados a ~ratio das requisições bem-
+                sucedidas, com uma reserva inicial para falhas isoladas.
+full_jitter     backoff exponencial com jitter total: espera sorteada em
+                [0, min(teto, base * 2^tentativa)], desfazendo as ondas
+CircuitBreaker  fechado → aberto após `threshold` falhas de sobrecarga
+                seguidas; aberto, todos esperam `cooldown` segundos; depois
+                (meio-aberto) uma única requisição de prova decide entre
+                fechar ou abrir de novo
+"""
+
+import asyncio
+import random
+import time
+
+CLOSED = "fechado"
+OPEN = "aberto"
+HALF_OPEN = "meio-aberto"
+
+
+def full_jitter(attempt, base=0.1, cap=2.0):
+    """Espera (s) antes da tentativa `attempt` (1 = primeiro retry)"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class RetryBudget:
+    def __init__(self, ratio=0.1, reserve=10):
+        self.ratio = ratio
+        self.reserve = reserve
+        # Teto do balde: evita acumular crédito para uma rajada de retries
+        self.capacity = max(reserve, 100 * ratio)
+        self.tokens = float(reserve)
+
+    def deposit(self):
+        """Uma requisição bem-sucedida"""
+        tokens = self.tokens + self.ratio
+        self.tokens = tokens if tokens < self.capacity else self.capacity
+
+    def withdraw(self):
+        """Consome uma ficha para um retry; False = orçamento esgotado"""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class CircuitBreaker:
+    def __init__(self, stats, threshold=10, cooldown=1.0):
+        # Aberturas e tempo aberto vão para o LoadStats do processo
+        self.stats = stats
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        # Ficha da requisição de prova do meio-aberto em andamento (None = nenhuma)
+        self.probe = None
+        self.changed = asyncio.Event()
+
+    def transition(self, state):
+        self.state = state
+        self.probe = None
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def acquire(self):
+        """Espera até poder enviar; retorna (tempo esperado em s, ficha de prova ou None)
+
+        A ficha deve voltar em success/failure e sempre em release (em um
+        finally): só o resultado da prova decide o meio-aberto.
+        """
+        if self.state == CLOSED:
+            return 0.0, None
+        started = time.perf_counter()
+        probe = None
+        while True:
+            if self.state == CLOSED:
+                break
+            if self.state == OPEN:
+                remaining = self.opened_at + self.cooldown - time.perf_counter()
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+                    continue
+                self.transition(HALF_OPEN)
+            if self.state == HALF_OPEN and self.probe is None:
+                # Esta requisição é a prova
+                probe = self.probe = object()
+                break
+            await self.changed.wait()
+        return time.perf_counter() - started, probe
+
+    def success(self, probe=None):
+        if self.state == CLOSED:
+            self.failures = 0
+        # Respostas de requisições anteriores à abertura não fecham o circuito; só a prova
+        elif self.state == HALF_OPEN and probe is not None and probe is self.probe:
+            self.failures = 0
+            self.stats.circuit_open_seconds += time.perf_counter() - self.opened_at
+            self.transition(CLOSED)
+
+    def failure(self, probe=None):
+        if self.state == CLOSED:
+            self.failures += 1
+            if self.failures < self.threshold:
+                return
+        elif not (self.state == HALF_OPEN and probe is not None and probe is self.probe):
+            # Aberto, ou falha atrasada de requisição que não é a prova: não muda o estado
+            return
+        else:
+            self.stats.circuit_open_seconds += time.perf_counter() - self.opened_at
+        self.stats.circuit_opens += 1
+        self.opened_at = time.perf_counter()
+        self.transition(OPEN)
+
+    def release(self, probe):
+        """Prova sem veredito (erro do cliente, tarefa cancelada): outra requisição pode provar
+
+        Não faz nada se a prova já decidiu o estado em success/failure.
+        """
+        if probe is not None and probe is self.probe:
+            self.probe = None
+            self.changed.set()
+            self.changed = asyncio.Event()
@@ -0,0 +1,174 @@
+"""
+Saturação do próprio cliente (--max-loop-lag / --fail-on-saturation)
+
+Com o event loop bloqueado as respostas esperam para ser lidas e a latência
+medida cresce sem que o REST Proxy tenha piorado. Durante o envio, a cada
+janela de WINDOW segundos, o monitor mede:
+
+- atraso do event loop (LoopLag): P99 do quanto cada sleep acorda atrasado
+- CPU do processo: tempo de CPU / tempo de relógio (1.0 = um núcleo inteiro)
+- requisições em voo, amostradas a cada despertar do LoopLag e comparadas
+  a --concurrency
+
+Uma janela está saturada se a CPU passa de CPU_LIMIT ou o P99 do atraso do
+loop passa de --max-loop-lag. Só janelas completas contam, e com menos de
+MIN_WINDOWS delas não há veredito (execução curta demais). Com veredito, a
+execução é marcada como saturada quando pelo menos SATURATED_SHARE das
+janelas estão saturadas; os números dela descrevem o gerador de carga, não o
+REST Proxy. Com --processes cada processo mede o seu e as janelas se somam.
+Os cenários (scenario.py) usam o mesmo monitor durante todas as fases.
+"""
+
+import asyncio
+import os
+import time
+
+from .profiling import LoopLag
+
+WINDOW = 1.0
+# Fração de um núcleo a partir da qual o processo não tem mais CPU sobrando
+CPU_LIMIT = 0.9
+# Fração das janelas saturadas que marca a execução como saturada
+SATURATED_SHARE = 0.25
+# Janelas completas exigidas (por processo) para haver veredito
+MIN_WINDOWS = 3
+# Código de saída de uma execução com o cliente saturado e --fail-on-saturation
+EXIT_SATURATED = 3
+
+
+def suggested_processes(processes):
+    """Processos sugeridos para um cliente saturado; None se a CPU da máquina já está toda em uso"""
+    cpus = os.cpu_count() or 1
+    if processes >= cpus:
+        return None
+    return min(cpus, processes * 2)
+
+
+class Saturation:
+    """Resultado do monitor em uma execução (ou na soma dos processos)"""
+
+    def __init__(self, window, max_loop_lag, concurrency):
+        self.window = window
+        self.max_loop_lag = max_loop_lag
+        self.concurrency = concurrency
+        self.windows = 0
+        self.saturated_windows = 0
+        self.cpu_windows = 0
+        self.lag_windows = 0
+        # Maior CPU (fração de um núcleo) e maior P99 do atraso do loop (ms) entre as janelas
+        self.peak_cpu = 0.0
+        self.peak_lag = 0.0
+        self.cpu_seconds = 0.0
+        self.wall_seconds = 0.0
+        # Média das requisições em voo durante o envio (somada entre os processos)
+        self.in_flight = 0.0
+        self.loop_lag = None
+        self.processes = 1
+
+    @property
+    def conclusive(self):
+        return self.windows >= MIN_WINDOWS * self.processes
+
+    @property
+    def saturated(self):
+        """True/False; None sem janelas completas suficientes para um veredito"""
+        if not self.conclusive:
+            return None
+        return self.saturated_windows >= self.windows * SATURATED_SHARE
+
+    @property
+    def cpu(self):
+        """CPU média por processo, em fração de um núcleo"""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.cpu_seconds / self.wall_seconds / self.processes
+
+    def reasons(self):
+        reasons = []
+        if self.cpu_windows:
+            reasons.append(f"CPU acima de {CPU_LIMIT * 100:.0f}% de um núcleo em {self.cpu_windows} janela(s)")
+        if self.lag_windows:
+            reasons.append(f"atraso do loop acima de {self.max_loop_lag:g} ms em {self.lag_windows} janela(s)")
+        return reasons
+
+    def merge(self, other):
+        for field in ("windows", "saturated_windows", "cpu_windows", "lag_windows", "cpu_seconds",
+                      "in_flight", "processes", "concurrency"):
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        self.peak_cpu = max(self.peak_cpu, other.peak_cpu)
+        self.peak_lag = max(self.peak_lag, other.peak_lag)
+        self.wall_seconds = max(self.wall_seconds, other.wall_seconds)
+        self.loop_lag.merge(other.loop_lag)
+        return self
+
+    def to_dict(self):
+        return {
+            "saturated": self.saturated,
+            "reasons": self.reasons(),
+            "window_s": self.window,
+            "max_loop_lag_ms": self.max_loop_lag,
+            "cpu_limit": CPU_LIMIT,
+            "windows": self.windows,
+            "saturated_windows": self.saturated_windows,
+            "min_windows": MIN_WINDOWS * self.processes,
+            "processes": self.processes,
+            "cpu": self.cpu,
+            "peak_cpu": self.peak_cpu,
+            "peak_loop_lag_p99_ms": self.peak_lag,
+            "loop_lag_ms": self.loop_lag.summary(),
+            "in_flight": self.in_flight,
+            "concurrency": self.concurrency,
+            "suggested_processes": suggested_processes(self.processes) if self.saturated else None,
+        }
+
+
+class SaturationMonitor:
+    def __init__(self, concurrency, in_flight, max_loop_lag, window=WINDOW):
+        # in_flight: função que retorna as requisições em voo no momento
+        self.in_flight = in_flight
+        self.window = window
+        self.loop_lag = LoopLag()
+        self.result = Saturation(window, max_loop_lag, concurrency)
+        self.in_flight_total = 0
+        self.in_flight_samples = 0
+
+    def begin(self):
+        self.previous = (time.perf_counter(), time.process_time(), self.loop_lag.histogram.copy())
+        self.started = self.previous[:2]
+
+    def sample_in_flight(self):
+        self.in_flight_total += self.in_flight()
+        self.in_flight_samples += 1
+
+    async def run(self):
+        lag_task = asyncio.create_task(self.loop_lag.run(self.sample_in_flight))
+        try:
+            while True:
+                await asyncio.sleep(self.window)
+                self.sample()
+        finally:
+            lag_task.cancel()
+
+    def sample(self):
+        """Fecha uma janela: CPU e P99 do atraso do loop"""
+        now, cpu_now, lag_now = time.perf_counter(), time.process_time(), self.loop_lag.histogram.copy()
+        started, cpu_started, lag_started = self.previous
+        self.previous = (now, cpu_now, lag_now)
+        result = self.result
+        cpu = (cpu_now - cpu_started) / (now - started) if now > started else 0.0
+        lag = lag_now.since(lag_started).percentile(99)
+        result.windows += 1
+        result.peak_cpu = max(result.peak_cpu, cpu)
+        result.peak_lag = max(result.peak_lag, lag)
+        result.cpu_windows += cpu >= CPU_LIMIT
+        result.lag_windows += lag >= result.max_loop_lag
+        result.saturated_windows += cpu >= CPU_LIMIT or lag >= result.max_loop_lag
+
+    def finish(self):
+        """Resultado ao fim do envio; a janela parcial em andamento não conta"""
+        result = self.result
+        result.wall_seconds = time.perf_counter() - self.started[0]
+        result.cpu_seconds = time.process_time() - self.started[1]
+        result.in_flight = self.in_flight_total / self.in_flight_samples if self.in_flight_samples else 0.0
+        result.loop_lag = self.loop_lag.histogram
+        return result
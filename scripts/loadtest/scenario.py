@@ -0,0 +1,471 @@
+"""
+Cenários declarativos (YAML/JSON) com fases e cargas mistas
+
+Um cenário descreve as cargas (perfil, tópico, batch, formato, chaves) e uma
+sequência de fases. Cada fase dura `duration` segundos e/ou até enviar
+`messages` mensagens, e mistura as cargas pelos pesos de `mix`, todas
+disparadas pelo mesmo escalonador:
+
+    name: producao
+    url: http://localhost:8082
+    concurrency: 200
+    workloads:
+      pequenas: {profile: extreme, topic: extreme-performance, batch_size: 500}
+      grandes: {profile: 64kb, topic: large-messages, batch_size: 1, record_size: 64KB}
+    mix: {pequenas: 90, grandes: 10}
+    phases:
+      - {name: warm-up, duration: 10, rate: 2000}
+      - {name: ramp, duration: 30, rate: [2000, 20000]}
+      - {name: steady, duration: 60, rate: 20000}
+      - {name: spike, duration: 5, rate: 60000}
+      - {name: cool-down, duration: 20, rate: [20000, 1000]}
+
+Com `rate` (msg/s, constante ou rampa [início, fim]) a fase é open-loop e a
+latência conta a partir do horário previsto de envio; sem `rate` é
+closed-loop com `concurrency` requisições em voo. Os pesos do mix são
+frações das requisições, intercaladas de forma determinística (round-robin
+ponderado suave). `concurrency` e `mix` do cenário valem para as fases que
+não os definem. Cada fase termina quando as suas requisições são respondidas,
+então os contadores de uma fase não se misturam com os da seguinte.
+
+O monitor de saturação (saturation.py) acompanha o cenário inteiro, com o
+limite de atraso do loop em `max_loop_lag` (ms; padrão 20, 0 desliga).
+"""
+
+import asyncio
+import contextlib
+import json
+import sys
+import time
+
+from .config import LoadConfig, parse_size
+from .engine import LoadEngine
+from .keys import KEY_STRATEGIES
+from .profiles import PROFILES
+from .reporters import Reporter, SilentReporter
+from .results import build_result, default_result_path, write_result
+from .saturation import EXIT_SATURATED, SaturationMonitor
+from .stats import LoadStats
+
+# Opção da carga no arquivo -> (argumento do LoadConfig, conversão)
+WORKLOAD_OPTIONS = {
+    "topic": ("topic", str),
+    "batch_size": ("batch_size", int),
+    "record_size": ("record_size", lambda value: parse_size(str(value))),
+    "format": ("embedded_format", str),
+    "keys": ("key_strategy", str),
+    "key_space": ("key_space", int),
+    "zipf_skew": ("zipf_skew", float),
+    "retry_budget": ("retry_budget", float),
+    "schema_registry": ("schema_registry", str),
+}
+
+PHASE_OPTIONS = ("name", "duration", "messages", "rate", "concurrency", "mix")
+
+
+def load_scenario(path):
+    """Lê o cenário de um arquivo .yaml/.yml (requer PyYAML) ou .json"""
+    with open(path, encoding="utf-8") as source:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("cenários YAML precisam do PyYAML (pip install pyyaml); ou use um arquivo .json")
+            return yaml.safe_load(source)
+        return json.load(source)
+
+
+def number(value, what, cast=float):
+    """`value` convertido por `cast`; ValueError com `what` no texto se não for um número"""
+    if isinstance(value, bool):
+        raise ValueError(f"{what} deve ser um número, não {value!r}")
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{what} deve ser um número, não {value!r}")
+
+
+class Workload:
+    """Uma carga do cenário: perfil e configuração próprios, com motor e sessões próprios"""
+
+    def __init__(self, name, spec, url, balance, concurrency):
+        if spec is not None and not isinstance(spec, dict):
+            raise ValueError(f"carga {name}: esperado um mapeamento de opções, não {spec!r}")
+        spec = dict(spec or {})
+        profile_name = spec.pop("profile", "extreme")
+        if profile_name not in PROFILES:
+            raise ValueError(f"carga {name}: perfil desconhecido {profile_name!r} ({', '.join(sorted(PROFILES))})")
+        self.name = name
+        self.profile = PROFILES[profile_name]()
+        options = {"topic": self.profile.defaults["topic"], "batch_size": self.profile.defaults["batch_size"]}
+        for key, value in spec.items():
+            if key not in WORKLOAD_OPTIONS:
+                raise ValueError(f"carga {name}: opção desconhecida {key!r}")
+            argument, cast = WORKLOAD_OPTIONS[key]
+            try:
+                options[argument] = cast(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"carga {name}: valor inválido para {key}: {value!r}")
+        self.config = LoadConfig(url=url, balance=balance, concurrency=concurrency, messages=0, **options)
+        if self.config.embedded_format not in self.profile.formats:
+            raise ValueError(f"carga {name}: o perfil {profile_name} não aceita o formato {self.config.embedded_format}")
+        if self.config.key_strategy not in KEY_STRATEGIES:
+            raise ValueError(f"carga {name}: estratégia de chave desconhecida {self.config.key_strategy!r}")
+        self.engine = LoadEngine(self.profile, self.config, reporter=SilentReporter())
+        self.unit_size = self.profile.unit_size(self.config)
+        # Os IDs continuam de uma fase para a outra
+        self.next_id = 1
+
+    def next_unit(self, remaining=None):
+        count = self.unit_size if remaining is None else min(self.unit_size, remaining)
+        unit = (self.next_id, count)
+        self.next_id += count
+        return unit
+
+    def describe(self):
+        return f"{self.profile.name} → {self.config.topic} (batch {self.config.batch_size})"
+
+
+class Phase:
+    def __init__(self, spec, index, workloads, concurrency, mix):
+        if not isinstance(spec, dict):
+            raise ValueError(f"fase {index}: esperado um mapeamento (name, duration, rate...), não {spec!r}")
+        unknown = set(spec) - set(PHASE_OPTIONS)
+        self.name = str(spec.get("name", f"fase-{index}"))
+        label = f"fase {index} ({self.name!r})"
+        if unknown:
+            raise ValueError(f"{label}: opções desconhecidas {', '.join(sorted(unknown))}")
+        self.duration = spec.get("duration")
+        self.messages = spec.get("messages")
+        if self.duration is not None:
+            self.duration = number(self.duration, f"{label}: duration")
+        if self.messages is not None:
+            self.messages = number(self.messages, f"{label}: messages", int)
+        if not self.duration and not self.messages:
+            raise ValueError(f"{label}: informe duration (s) e/ou messages")
+        if min(self.duration or 0, self.messages or 0) < 0:
+            raise ValueError(f"{label}: duration e messages não podem ser negativos")
+        rate = spec.get("rate")
+        if rate is None:
+            self.start_rate = self.end_rate = None
+        elif isinstance(rate, (list, tuple)):
+            if len(rate) != 2 or not self.duration:
+                raise ValueError(f"{label}: a rampa é rate: [início, fim] e precisa de duration")
+            self.start_rate, self.end_rate = (number(value, f"{label}: rate") for value in rate)
+        else:
+            self.start_rate = self.end_rate = number(rate, f"{label}: rate")
+        if self.start_rate is not None and min(self.start_rate, self.end_rate) <= 0:
+            raise ValueError(f"{label}: rate deve ser positiva")
+        self.concurrency = number(spec.get("concurrency", concurrency), f"{label}: concurrency", int)
+        if self.concurrency <= 0:
+            raise ValueError(f"{label}: concurrency deve ser positiva")
+        mix = spec.get("mix", mix)
+        if mix is None:
+            if len(workloads) > 1:
+                raise ValueError(f"{label}: defina mix com os pesos das cargas")
+            mix = {name: 1 for name in workloads}
+        if not isinstance(mix, dict):
+            raise ValueError(f"{label}: mix deve mapear carga -> peso, não {mix!r}")
+        self.mix = {}
+        for name, weight in mix.items():
+            if name not in workloads:
+                raise ValueError(f"{label}: carga desconhecida {name!r} no mix")
+            weight = number(weight, f"{label}: peso de {name}")
+            if weight <= 0:
+                raise ValueError(f"{label}: peso de {name} deve ser positivo")
+            self.mix[name] = weight
+
+    def rate_at(self, offset):
+        """Taxa alvo (msg/s) `offset` segundos após o início da fase"""
+        if self.start_rate == self.end_rate:
+            return self.start_rate
+        return self.start_rate + (self.end_rate - self.start_rate) * min(offset / self.duration, 1.0)
+
+    def remaining(self, scheduled):
+        return None if self.messages is None else self.messages - scheduled
+
+    def describe(self):
+        parts = []
+        if self.duration:
+            parts.append(f"{self.duration:g}s")
+        if self.messages:
+            parts.append(f"{self.messages:,} msg")
+        if self.start_rate is None:
+            parts.append(f"closed-loop, concorrência {self.concurrency}")
+        elif self.start_rate == self.end_rate:
+            parts.append(f"{self.start_rate:,.0f} msg/s (até {self.concurrency} em voo)")
+        else:
+            parts.append(f"{self.start_rate:,.0f} → {self.end_rate:,.0f} msg/s (até {self.concurrency} em voo)")
+        total = sum(self.mix.values())
+        if len(self.mix) > 1:
+            parts.append("mix " + " / ".join(f"{name} {weight / total * 100:.0f}%" for name, weight in self.mix.items()))
+        return ", ".join(parts)
+
+
+class WeightedMix:
+    """Round-robin ponderado suave: intercala as cargas respeitando os pesos em qualquer janela"""
+
+    def __init__(self, weighted):
+        self.entries = [[item, weight, 0.0] for item, weight in weighted]
+        self.total = sum(weight for _, weight in weighted)
+
+    def next(self):
+        best = None
+        for entry in self.entries:
+            entry[2] += entry[1]
+            if best is None or entry[2] > best[2]:
+                best = entry
+        best[2] -= self.total
+        return best[0]
+
+
+class ScenarioRunner:
+    def __init__(self, scenario, url=None, max_loop_lag=None):
+        if not isinstance(scenario, dict) or not isinstance(scenario.get("phases"), list) or not scenario["phases"]:
+            raise ValueError("o cenário precisa de uma lista phases")
+        self.name = str(scenario.get("name", "cenario"))
+        url = url or scenario.get("url", "http://localhost:8082")
+        balance = scenario.get("balance", "round-robin")
+        concurrency = number(scenario.get("concurrency", 100), "concurrency", int)
+        self.progress_interval = number(scenario.get("progress_interval", 5), "progress_interval")
+        self.max_loop_lag = number(scenario.get("max_loop_lag", 20.0) if max_loop_lag is None else max_loop_lag,
+                                   "max_loop_lag")
+        specs = scenario.get("workloads") or {"carga": {}}
+        if not isinstance(specs, dict):
+            raise ValueError("workloads deve mapear nome da carga -> opções")
+        # As fases são validadas antes das cargas: o pool de cada carga comporta a maior concorrência entre elas
+        names = dict.fromkeys(specs)
+        self.phases = [Phase(spec, index, names, concurrency, scenario.get("mix"))
+                       for index, spec in enumerate(scenario["phases"], 1)]
+        self.max_concurrency = max([concurrency] + [phase.concurrency for phase in self.phases])
+        self.workloads = {name: Workload(name, spec, url, balance, self.max_concurrency)
+                          for name, spec in specs.items()}
+        self.urls = next(iter(self.workloads.values())).config.urls
+        self.in_flight = 0
+        # (fase, {carga: LoadStats}) na ordem de execução
+        self.results = []
+
+    async def run(self):
+        """Executa as fases em sequência; retorna os contadores consolidados (None sem conectividade)"""
+        print(f"🎬 === CENÁRIO: {self.name} ===")
+        print(f"REST Proxy: {', '.join(self.urls)}")
+        for workload in self.workloads.values():
+            print(f"  Carga {workload.name}: {workload.describe()}")
+        print("=" * 60)
+
+        async with contextlib.AsyncExitStack() as stack:
+            for workload in self.workloads.values():
+                if not await workload.engine.setup(stack):
+                    return None
+            print("✓ Conectividade com REST Proxy verificada")
+            started = time.perf_counter()
+            monitor = monitor_task = None
+            if self.max_loop_lag:
+                monitor = SaturationMonitor(self.max_concurrency, lambda: self.in_flight, self.max_loop_lag)
+                monitor.begin()
+                monitor_task = asyncio.create_task(monitor.run())
+            try:
+                for index, phase in enumerate(self.phases, 1):
+                    print(f"\n▶️  Fase {index}/{len(self.phases)}: {phase.name} — {phase.describe()}")
+                    self.results.append((phase, await self.run_phase(phase)))
+            finally:
+                if monitor:
+                    monitor_task.cancel()
+            duration = time.perf_counter() - started
+
+        total = LoadStats()
+        for _, phase_stats in self.results:
+            for stats in phase_stats.values():
+                total.merge(stats)
+        total.duration = duration
+        total.saturation = monitor.finish() if monitor else None
+        self.report(total)
+        return total
+
+    async def run_phase(self, phase):
+        stats = {name: LoadStats() for name in phase.mix}
+        for name, workload_stats in stats.items():
+            self.workloads[name].engine.use_stats(workload_stats)
+        mix = WeightedMix([(self.workloads[name], weight) for name, weight in phase.mix.items()])
+
+        started = time.perf_counter()
+        progress_task = None
+        if self.progress_interval:
+            progress_task = asyncio.create_task(self.report_progress(phase, stats, started))
+        try:
+            if phase.start_rate is None:
+                await self.run_closed_loop(phase, mix, started)
+            else:
+                await self.run_open_loop(phase, mix, started)
+        finally:
+            if progress_task:
+                progress_task.cancel()
+        duration = time.perf_counter() - started
+        for workload_stats in stats.values():
+            workload_stats.duration = duration
+        self.print_phase(stats, duration)
+        return stats
+
+    async def run_open_loop(self, phase, mix, started):
+        """Disparo na linha do tempo da fase (taxa constante ou rampa), até phase.concurrency em voo"""
+        slots = asyncio.Semaphore(phase.concurrency)
+        free_workers = list(range(phase.concurrency))
+        pending = set()
+        intended_time = started
+        scheduled = 0
+
+        async def dispatch(workload, unit, worker_id, intended_time):
+            self.in_flight += 1
+            try:
+                await workload.engine.sender.send(workload.engine.balancer, *unit, worker_id,
+                                                  intended_time=intended_time)
+            finally:
+                self.in_flight -= 1
+                free_workers.append(worker_id)
+                slots.release()
+
+        while phase.remaining(scheduled) != 0:
+            offset = intended_time - started
+            if phase.duration and offset >= phase.duration:
+                break
+            workload = mix.next()
+            unit = workload.next_unit(phase.remaining(scheduled))
+            scheduled += unit[1]
+            delay = intended_time - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await slots.acquire()
+            worker_id = free_workers.pop()
+            workload.engine.stats.worker(worker_id).record_dispatch(
+                unit[1], (time.perf_counter() - intended_time) * 1000
+            )
+            task = asyncio.create_task(dispatch(workload, unit, worker_id, intended_time))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            intended_time += unit[1] / phase.rate_at(offset)
+
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def run_closed_loop(self, phase, mix, started):
+        """phase.concurrency workers enviando em sequência até o fim da duração ou das mensagens"""
+        deadline = started + phase.duration if phase.duration else None
+        scheduled = 0
+
+        async def work(worker_id):
+            nonlocal scheduled
+            while phase.remaining(scheduled) != 0:
+                if deadline and time.perf_counter() >= deadline:
+                    return
+                workload = mix.next()
+                unit = workload.next_unit(phase.remaining(scheduled))
+                scheduled += unit[1]
+                self.in_flight += 1
+                try:
+                    await workload.engine.sender.send(workload.engine.balancer, *unit, worker_id)
+                finally:
+                    self.in_flight -= 1
+
+        await asyncio.gather(*(work(worker_id) for worker_id in range(phase.concurrency)))
+
+    async def report_progress(self, phase, stats, started):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            elapsed = time.perf_counter() - started
+            delivered = sum(workload_stats.success_count for workload_stats in stats.values())
+            errors = sum(workload_stats.error_count for workload_stats in stats.values())
+            print(f"  [{phase.name}] {elapsed:.0f}s | {delivered:,} msg | {delivered / elapsed:,.0f} msg/s | "
+                  f"erros: {errors:,} | em voo: {self.in_flight}")
+
+    @staticmethod
+    def stats_line(label, stats, duration):
+        latency = stats.latency_summary()
+        line = (f"  {label:<14}{stats.success_count:>12,} msg {stats.success_count / duration if duration > 0 else 0:>12,.0f}"
+                f" msg/s  erros {stats.error_count:>8,}")
+        if latency:
+            line += f"  P50 {latency['p50']:>8.2f} ms  P99 {latency['p99']:>8.2f} ms"
+        return line
+
+    def print_phase(self, stats, duration):
+        for name, workload_stats in stats.items():
+            print(self.stats_line(name, workload_stats, duration))
+            if workload_stats.errors_by_type:
+                errors = ", ".join(f"{key}: {count:,}" for key, count in sorted(workload_stats.errors_by_type.items()))
+                print(f"      Erros: {errors}")
+        if len(stats) > 1:
+            total = LoadStats()
+            for workload_stats in stats.values():
+                total.merge(workload_stats)
+            print(self.stats_line("total", total, duration))
+        print(f"  Duração da fase: {duration:.2f}s")
+
+    def report(self, total):
+        print(f"\n🏁 RESUMO DO CENÁRIO ({total.duration:.2f}s):")
+        for phase, stats in self.results:
+            merged = LoadStats()
+            for workload_stats in stats.values():
+                merged.merge(workload_stats)
+            print(self.stats_line(phase.name, merged, next(iter(stats.values())).duration))
+        if len(self.workloads) > 1:
+            print("\nPOR CARGA (todas as fases):")
+            for name in self.workloads:
+                merged = LoadStats()
+                duration = 0.0
+                for _, stats in self.results:
+                    if name in stats:
+                        merged.merge(stats[name])
+                        duration += stats[name].duration
+                print(self.stats_line(name, merged, duration))
+        print(self.stats_line("total", total, total.duration))
+        if total.saturation is not None:
+            Reporter().print_saturation(total.saturation)
+
+    def phase_rows(self):
+        """Resumo por fase e carga para o arquivo de resultado"""
+        rows = []
+        for phase, stats in self.results:
+            for name, workload_stats in stats.items():
+                latency = workload_stats.latency_summary()
+                duration = workload_stats.duration
+                rows.append({
+                    "phase": phase.name,
+                    "workload": name,
+                    "duration_s": duration,
+                    "success": workload_stats.success_count,
+                    "errors": workload_stats.error_count,
+                    "throughput": workload_stats.success_count / duration if duration > 0 else 0.0,
+                    "p50_ms": latency.get("p50"),
+                    "p99_ms": latency.get("p99"),
+                    "errors_by_type": workload_stats.errors_by_type,
+                })
+        return rows
+
+
+def run_scenario(path, url=None, result_file=None, write_results=True, max_loop_lag=None,
+                 fail_on_saturation=False):
+    """Carrega e executa o cenário de `path`; grava o resultado como os perfis"""
+    try:
+        scenario = load_scenario(path)
+        runner = ScenarioRunner(scenario, url, max_loop_lag)
+    except (OSError, ValueError) as e:
+        print(f"ERRO: cenário {path}: {e}")
+        return None
+    try:
+        stats = asyncio.run(runner.run())
+    except KeyboardInterrupt:
+        print("\n\n⏹️ Teste interrompido pelo usuário")
+        return None
+    if stats is not None and write_results:
+        name = f"scenario-{runner.name}"
+        result_path = result_file or default_result_path(name)
+        result = build_result(name, scenario, stats, stats.duration)
+        result["phases"] = runner.phase_rows()
+        try:
+            write_result(result_path, result)
+            print(f"💾 Resultado gravado em {result_path}")
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar o resultado em {result_path}: {e}")
+    if fail_on_saturation and stats is not None and stats.saturation is not None and stats.saturation.saturated:
+        print("❌ Cliente saturado: os números medem o gerador de carga, não o REST Proxy")
+        sys.exit(EXIT_SATURATED)
+    return stats
@@ -0,0 +1,221 @@
+"""
+Estratégias de envio para o REST Proxy
+Todas codificam o corpo uma única vez (via payload.encode), escolhem o endpoint
+de cada requisição no Balancer e registram o resultado nos contadores
+exclusivos do worker (LoadStats.worker) e nos do endpoint
+"""
+
+import asyncio
+import time
+
+import aiohttp
+
+from .formats import request_headers
+from .offsets import parse_offsets
+from .retry import CircuitBreaker, RetryBudget, full_jitter
+
+
+def elapsed_ms(start_time):
+    return (time.perf_counter() - start_time) * 1000
+
+
+def error_key(exception):
+    """Chave do erro de uma exceção, a mesma nos contadores do worker e do endpoint"""
+    if isinstance(exception, asyncio.TimeoutError):
+        return "Timeout"
+    return f"Exception_{type(exception).__name__}"
+
+
+def is_overload(status):
+    """Respostas que indicam proxy ou broker sobrecarregado"""
+    return status == 429 or status >= 500
+
+
+class Sender:
+    """Base das estratégias: envia uma unidade de trabalho (start_id, count) pelo worker thread_id
+
+    `intended_time` (time.perf_counter) é o instante em que o envio deveria ter
+    começado no modo --rate; a latência é medida a partir dele, e não do envio
+    real, para não esconder atrasos do cliente (coordinated omission).
+    """
+
+    def __init__(self, topic, payload, stats, timeout=30):
+        self.path = f"/topics/{topic}"
+        self.payload = payload
+        self.headers = request_headers(payload.embedded_format)
+        self.stats = stats
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def post(self, endpoint, data, stats, messages, timeout=None):
+        """Faz um POST de `messages` mensagens no endpoint e retorna (status, corpo em bytes)"""
+        stats.record_request(len(data))
+        endpoint.in_flight += 1
+        start_time = time.perf_counter()
+        try:
+            async with endpoint.session.post(
+                endpoint.url + self.path,
+                data=data,
+                headers=self.headers,
+                timeout=timeout or self.timeout,
+                compress=False
+            ) as response:
+                status, body = response.status, await response.read()
+        except Exception as e:
+            endpoint.stats.record_exception(error_key(e), elapsed_ms(start_time))
+            if isinstance(e, (asyncio.TimeoutError, aiohttp.ClientConnectionError)):
+                stats.overloads += 1
+            raise
+        finally:
+            endpoint.in_flight -= 1
+        endpoint.stats.record_response(status, messages, elapsed_ms(start_time))
+        if is_overload(status):
+            stats.overloads += 1
+        return status, body
+
+    @staticmethod
+    def record_delivery(stats, body, count, response_time):
+        """Contabiliza uma resposta 200 registro a registro; retorna True se nenhum falhou"""
+        offsets, error_codes, missing = parse_offsets(body, count)
+        stats.record_delivery(count, response_time, offsets, error_codes, missing)
+        return not error_codes and not missing
+
+    async def send(self, balancer, start_id, count, thread_id, intended_time=None):
+        raise NotImplementedError
+
+
+class SingleSender(Sender):
+    """Uma requisição por mensagem, todas as mensagens da unidade em paralelo"""
+
+    def __init__(self, topic, payload, stats, timeout=30, error_text_limit=None):
+        super().__init__(topic, payload, stats, timeout)
+        self.error_text_limit = error_text_limit
+
+    async def send_one(self, balancer, msg_id, thread_id, intended_time, stats):
+        data = self.payload.encode(msg_id, 1, thread_id)
+        start_time = intended_time or time.perf_counter()
+        try:
+            status, body = await self.post(balancer.choose(msg_id, thread_id), data, stats, 1)
+            response_time = elapsed_ms(start_time)
+        except Exception as e:
+            response_time = elapsed_ms(start_time)
+            stats.record_error(error_key(e), 1, response_time)
+            print(f"✗ Exceção na mensagem {msg_id}: {str(e)[:self.error_text_limit]}")
+            return False
+
+        if status == 200:
+            return self.record_delivery(stats, body, 1, response_time)
+
+        stats.record_error(f"HTTP_{status}", 1, response_time)
+        error_text = body.decode('utf-8', 'replace')
+        print(f"✗ Erro {status} na mensagem {msg_id}: {error_text[:self.error_text_limit]}")
+        return False
+
+    async def send(self, balancer, start_id, count, thread_id, intended_time=None):
+        stats = self.stats.worker(thread_id)
+        results = await asyncio.gather(
+            *(self.send_one(balancer, msg_id, thread_id, intended_time, stats)
+              for msg_id in range(start_id, start_id + count)),
+            return_exceptions=True
+        )
+        return all(result is True for result in results)
+
+
+class BatchSender(Sender):
+    """Uma requisição por lote, sem retry, para máxima velocidade"""
+
+    async def send(self, balancer, start_id, count, thread_id, intended_time=None):
+        data = self.payload.encode(start_id, count, thread_id)
+        stats = self.stats.worker(thread_id)
+        start_time = intended_time or time.perf_counter()
+        try:
+            status, body = await self.post(balancer.choose(start_id, thread_id), data, stats, count)
+            response_time = elapsed_ms(start_time)
+        except Exception as e:
+            response_time = elapsed_ms(start_time)
+            stats.record_error(error_key(e), count, response_time)
+            return False
+
+        if status == 200:
+            return self.record_delivery(stats, body, count, response_time)
+
+        stats.record_error(f"HTTP_{status}", count, response_time)
+        return False
+
+
+class RetryingSender(Sender):
+    """Uma requisição por lote com retry limitado pela política compartilhada (retry.py)
+
+    Todos os workers do processo dividem o mesmo orçamento de retries e o
+    mesmo circuit breaker; a espera entre tentativas usa backoff com jitter
+    total. A latência da primeira tentativa vai para `latency` e a das
+    tentativas extras para `retry_latency`, com o tempo de espera à parte.
+    """
+
+    def __init__(self, topic, payload, stats, retry_count=3, retry_budget=0.1,
+                 breaker_threshold=10, breaker_cooldown=1.0):
+        super().__init__(topic, payload, stats)
+        self.retry_count = retry_count
+        self.budget = RetryBudget(retry_budget)
+        self.breaker = CircuitBreaker(stats, breaker_threshold, breaker_cooldown)
+        stats.retry_budget = retry_budget
+
+    def record_attempt(self, stats, attempt, response_time):
+        """Latência de uma tentativa: a primeira em `latency`, as extras em `retry_latency`"""
+        if attempt:
+            stats.record_retry(response_time)
+        else:
+            stats.record_latency(response_time)
+
+    async def send(self, balancer, start_id, count, thread_id, intended_time=None):
+        data = self.payload.encode(start_id, count, thread_id)
+        stats = self.stats.worker(thread_id)
+        attempts = 0
+        last_error = None
+
+        for attempt in range(self.retry_count):
+            if attempt:
+                if not self.budget.withdraw():
+                    stats.retries_denied += 1
+                    break
+                print(f"! Tentativa {attempt} falhou ({last_error}), tentando novamente...")
+                delay = full_jitter(attempt)
+                await asyncio.sleep(delay)
+                stats.backoff_seconds += delay
+            waited, probe = await self.breaker.acquire()
+            stats.backoff_seconds += waited
+            attempts += 1
+
+            start_time = (intended_time if attempt == 0 else None) or time.perf_counter()
+            # Timeout progressivo baseado na tentativa
+            timeout = aiohttp.ClientTimeout(total=5 + (attempt * 2))
+            try:
+                # Cada tentativa escolhe o endpoint de novo: um retry pode ir a outra instância
+                status, body = await self.post(balancer.choose(start_id, thread_id), data, stats, count, timeout)
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                self.breaker.failure(probe)
+                last_error = error_key(e)
+            except Exception as e:
+                # Erro do cliente, não do proxy: não conta a favor nem contra o circuito
+                last_error = error_key(e)
+            else:
+                if is_overload(status):
+                    self.breaker.failure(probe)
+                else:
+                    self.breaker.success(probe)
+                if status == 200:
+                    self.budget.deposit()
+                    self.record_attempt(stats, attempt, elapsed_ms(start_time))
+                    if attempt > 0:
+                        stats.retries_performed += 1
+                    # Falhas parciais (error_code por registro) não são reenviadas para não duplicar os demais
+                    return self.record_delivery(stats, body, count, None)
+                last_error = f"HTTP_{status}"
+            finally:
+                # Devolve a prova sem veredito (erro do cliente, cancelamento); após success/failure não faz nada
+                self.breaker.release(probe)
+            self.record_attempt(stats, attempt, elapsed_ms(start_time))
+
+        # Tentativas esgotadas ou retry negado pelo orçamento
+        stats.record_error(last_error, count)
+        print(f"X Erro final {last_error} após {attempts} tentativa(s)")
+        return False
@@ -0,0 +1,444 @@
+"""
+Contadores de resultado compartilhados por todos os perfis de teste
+
+Cada worker (task, thread ou processo) escreve apenas no seu próprio
+WorkerStats, um objeto com __slots__ sem lock nem dicts no caminho quente.
+LoadStats só guarda a lista de workers e consolida os contadores quando um
+reporter lê os totais, seja no progresso periódico ou no relatório final.
+"""
+
+from collections import Counter
+from operator import itemgetter
+
+from .histogram import LatencyHistogram
+
+# Registros de uma resposta 200 sem offset nem error_code (corpo vazio ou truncado)
+MISSING_OFFSET = "Record_missing_offset"
+
+
+class WorkerStats:
+    __slots__ = (
+        "success_count", "error_count", "latency", "errors_by_type", "bytes_sent",
+        "requests_sent", "retries_performed", "schedule_lag", "dispatched_messages", "partitions",
+        "overloads", "retry_attempts", "retries_denied", "backoff_seconds", "retry_latency", "live_latency"
+    )
+
+    def __init__(self):
+        self.success_count = 0
+        self.error_count = 0
+        self.latency = LatencyHistogram()
+        self.errors_by_type = {}
+        self.bytes_sent = 0
+        self.requests_sent = 0
+        self.retries_performed = 0
+        self.schedule_lag = None
+        self.dispatched_messages = 0
+        # Partição -> [mensagens, menor offset, maior offset]
+        self.partitions = {}
+        # Respostas 429/5xx e timeouts/falhas de conexão, inclusive as recuperadas por retry
+        self.overloads = 0
+        # Retries: tentativas extras, negadas pelo orçamento, espera (s) e latência só das extras
+        self.retry_attempts = 0
+        self.retries_denied = 0
+        self.backoff_seconds = 0.0
+        self.retry_latency = None
+        # Histograma do processo que também recebe `latency` (LoadStats.track_latency), ou None
+        self.live_latency = None
+
+    def record_request(self, payload_size):
+        """Contabiliza uma requisição enviada"""
+        self.requests_sent += 1
+        self.bytes_sent += payload_size
+
+    def record_latency(self, response_time):
+        """Registra o tempo de resposta (ms) de uma requisição"""
+        self.latency.record(response_time)
+        if self.live_latency is not None:
+            self.live_latency.record(response_time)
+
+    def record_dispatch(self, messages, lag):
+        """Registra um disparo do modo --rate e seu atraso (ms) em relação ao horário previsto"""
+        if self.schedule_lag is None:
+            # Só existe no modo --rate, para não alocar um histograma extra por worker
+            self.schedule_lag = LatencyHistogram()
+        self.dispatched_messages += messages
+        self.schedule_lag.record(lag)
+
+    def record_retry(self, response_time):
+        """Tempo de resposta (ms) de uma tentativa extra, fora da latência da primeira tentativa"""
+        if self.retry_latency is None:
+            self.retry_latency = LatencyHistogram()
+        self.retry_attempts += 1
+        self.retry_latency.record(response_time)
+
+    def record_error(self, error_key, messages, response_time=None):
+        """Contabiliza mensagens perdidas agrupando pelo tipo de erro"""
+        if response_time is not None:
+            self.record_latency(response_time)
+        self.error_count += messages
+        self.errors_by_type[error_key] = self.errors_by_type.get(error_key, 0) + 1
+
+    def record_delivery(self, messages, response_time, offsets, error_codes, missing=0):
+        """Resposta 200: falhas por error_code de cada registro e entregas por partição
+
+        `missing` registros não aparecem na resposta (corpo vazio ou truncado):
+        sem confirmação, contam como erro MISSING_OFFSET e não como entregues.
+        """
+        if response_time is not None:
+            self.record_latency(response_time)
+        failed = len(error_codes)
+        self.success_count += messages - failed - missing
+        if failed or missing:
+            self.error_count += failed + missing
+            errors_by_type = self.errors_by_type
+            for error_code, count in Counter(error_codes).items():
+                error_key = f"Record_{int(error_code)}"
+                errors_by_type[error_key] = errors_by_type.get(error_key, 0) + count
+            if missing:
+                errors_by_type[MISSING_OFFSET] = errors_by_type.get(MISSING_OFFSET, 0) + missing
+        if offsets:
+            self.record_partitions(offsets)
+
+    def record_partitions(self, offsets):
+        """Soma os pares (partição, offset) de uma resposta, com conversão só por partição"""
+        partitions = self.partitions
+        # Dentro de uma resposta os offsets de cada partição são crescentes
+        last = dict(offsets)
+        first = dict(reversed(offsets))
+        for partition, count in Counter(map(itemgetter(0), offsets)).items():
+            low = int(first[partition])
+            high = int(last[partition])
+            entry = partitions.get(int(partition))
+            if entry is None:
+                partitions[int(partition)] = [count, low, high]
+            else:
+                entry[0] += count
+                if low < entry[1]:
+                    entry[1] = low
+                if high > entry[2]:
+                    entry[2] = high
+
+
+class EndpointStats:
+    """Contadores de uma instância do REST Proxy (balanceamento entre várias --url)"""
+
+    __slots__ = ("requests", "messages", "failed_requests", "latency", "errors_by_type")
+
+    def __init__(self):
+        self.requests = 0
+        # Mensagens em respostas 200 (erros por registro não são separados aqui)
+        self.messages = 0
+        self.failed_requests = 0
+        self.latency = LatencyHistogram()
+        self.errors_by_type = {}
+
+    def record_response(self, status, messages, response_time):
+        self.requests += 1
+        self.latency.record(response_time)
+        if status == 200:
+            self.messages += messages
+        else:
+            self.record_failure(f"HTTP_{status}")
+
+    def record_exception(self, error_key, response_time):
+        self.requests += 1
+        self.latency.record(response_time)
+        self.record_failure(error_key)
+
+    def record_failure(self, error_key):
+        self.failed_requests += 1
+        self.errors_by_type[error_key] = self.errors_by_type.get(error_key, 0) + 1
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.messages += other.messages
+        self.failed_requests += other.failed_requests
+        self.latency.merge(other.latency)
+        for error_key, count in other.errors_by_type.items():
+            self.errors_by_type[error_key] = self.errors_by_type.get(error_key, 0) + count
+
+
+class ConnectionStats:
+    """Fases das requisições HTTP (ms) e reuso de conexões (--trace-connections, um por processo)"""
+
+    PHASES = ("queue_wait", "dns", "connect", "upload", "ttfb")
+
+    def __init__(self):
+        self.requests = 0
+        self.created = 0
+        self.reused = 0
+        self.queue_wait = LatencyHistogram()
+        self.dns = LatencyHistogram()
+        self.connect = LatencyHistogram()
+        self.upload = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.created += other.created
+        self.reused += other.reused
+        for phase in self.PHASES:
+            getattr(self, phase).merge(getattr(other, phase))
+        return self
+
+
+class ProfileStats:
+    """Amostras do perfil do cliente (--profile-client, um por processo): pilhas, categorias, CPU e atraso do loop"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.samples = 0
+        # Pilha no formato folded ("raiz;...;folha") -> amostras
+        self.stacks = Counter()
+        self.categories = Counter()
+        # Função em execução (folha) -> amostras
+        self.functions = Counter()
+        self.cpu_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.sampler_seconds = 0.0
+        self.loop_lag = LatencyHistogram()
+        self.processes = 1
+
+    def merge(self, other):
+        self.samples += other.samples
+        self.stacks.update(other.stacks)
+        self.categories.update(other.categories)
+        self.functions.update(other.functions)
+        self.cpu_seconds += other.cpu_seconds
+        self.wall_seconds = max(self.wall_seconds, other.wall_seconds)
+        self.sampler_seconds += other.sampler_seconds
+        self.loop_lag.merge(other.loop_lag)
+        self.processes += other.processes
+        return self
+
+    def to_dict(self):
+        samples = self.samples or 1
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "processes": self.processes,
+            "cpu_seconds": self.cpu_seconds,
+            "wall_seconds": self.wall_seconds,
+            "sampler_cpu_seconds": self.sampler_seconds,
+            "categories": {name: count / samples for name, count in self.categories.most_common()},
+            "hot_functions": {name: count / samples for name, count in self.functions.most_common(20)},
+            "loop_lag_ms": self.loop_lag.summary(),
+        }
+
+
+class LoadStats:
+    def __init__(self):
+        self.workers = []
+        # URL -> EndpointStats de cada instância do REST Proxy
+        self.endpoints = {}
+        # Modo --rate: taxa alvo e janela de disparo (valores da execução, não do worker)
+        self.target_rate = None
+        self.dispatch_seconds = 0.0
+        # Resumos do controle adaptativo de concorrência (um por processo)
+        self.adaptive = []
+        # Política de retry do processo: orçamento (fração) e circuit breaker
+        self.retry_budget = None
+        self.circuit_opens = 0
+        self.circuit_open_seconds = 0.0
+        # Camada de conexão (só com --trace-connections)
+        self.connections = None
+        # Janela de envio da execução (s), preenchida ao final
+        self.duration = None
+        # Aquecimento e regime estável (steady.py), None se a detecção estiver desligada
+        self.steady = None
+        # Perfil do cliente (só com --profile-client)
+        self.profiling = None
+        # Saturação do próprio cliente (saturation.py), None se o monitor estiver desligado
+        self.saturation = None
+        # Soma viva de `latency` de todos os workers (track_latency), None fora do acompanhamento
+        self.live_latency = None
+
+    def worker(self, worker_id):
+        """Contadores exclusivos do worker `worker_id`, criados na primeira vez"""
+        workers = self.workers
+        while len(workers) <= worker_id:
+            worker = WorkerStats()
+            worker.live_latency = self.live_latency
+            workers.append(worker)
+        return workers[worker_id]
+
+    def track_latency(self, enabled=True):
+        """Liga/desliga a soma viva das latências dos workers
+
+        `latency` mescla os histogramas de todos os workers, caro demais para
+        ler a cada janela com centenas deles. Ligada, cada registro também vai
+        para `live_latency`: mesma latência (primeira tentativa, a partir do
+        horário previsto no --rate), lida com uma cópia só.
+        """
+        self.live_latency = self.merged("latency") if enabled else None
+        for worker in self.workers:
+            worker.live_latency = self.live_latency
+
+    def endpoint(self, url):
+        """Contadores do endpoint `url`, criados na primeira vez"""
+        stats = self.endpoints.get(url)
+        if stats is None:
+            stats = self.endpoints[url] = EndpointStats()
+        return stats
+
+    def total(self, field):
+        return sum(getattr(worker, field) for worker in self.workers)
+
+    def merged(self, field):
+        histogram = LatencyHistogram()
+        for worker in self.workers:
+            if getattr(worker, field) is not None:
+                histogram.merge(getattr(worker, field))
+        return histogram
+
+    @property
+    def success_count(self):
+        return self.total("success_count")
+
+    @property
+    def error_count(self):
+        return self.total("error_count")
+
+    @property
+    def bytes_sent(self):
+        return self.total("bytes_sent")
+
+    @property
+    def requests_sent(self):
+        return self.total("requests_sent")
+
+    @property
+    def retries_performed(self):
+        return self.total("retries_performed")
+
+    @property
+    def overloads(self):
+        return self.total("overloads")
+
+    @property
+    def retry_attempts(self):
+        return self.total("retry_attempts")
+
+    @property
+    def retries_denied(self):
+        return self.total("retries_denied")
+
+    @property
+    def backoff_seconds(self):
+        return self.total("backoff_seconds")
+
+    @property
+    def retry_latency(self):
+        return self.merged("retry_latency")
+
+    @property
+    def dispatched_messages(self):
+        return self.total("dispatched_messages")
+
+    @property
+    def latency(self):
+        return self.merged("latency")
+
+    @property
+    def schedule_lag(self):
+        return self.merged("schedule_lag")
+
+    @property
+    def partitions(self):
+        """Partição -> [mensagens, menor offset, maior offset] de todos os workers"""
+        partitions = {}
+        for worker in self.workers:
+            for partition, (count, low, high) in worker.partitions.items():
+                entry = partitions.get(partition)
+                if entry is None:
+                    partitions[partition] = [count, low, high]
+                else:
+                    entry[0] += count
+                    entry[1] = min(entry[1], low)
+                    entry[2] = max(entry[2], high)
+        return partitions
+
+    @property
+    def errors_by_type(self):
+        errors = {}
+        for worker in self.workers:
+            for error_key, count in worker.errors_by_type.items():
+                errors[error_key] = errors.get(error_key, 0) + count
+        return errors
+
+    def merge(self, other):
+        """Incorpora os workers de outro LoadStats (ex.: de outro processo)"""
+        self.workers.extend(other.workers)
+        if other.target_rate:
+            self.target_rate = (self.target_rate or 0) + other.target_rate
+        self.dispatch_seconds = max(self.dispatch_seconds, other.dispatch_seconds)
+        self.adaptive.extend(other.adaptive)
+        if other.connections is not None:
+            self.connections = (self.connections or ConnectionStats()).merge(other.connections)
+        for url, endpoint_stats in other.endpoints.items():
+            self.endpoint(url).merge(endpoint_stats)
+        self.retry_budget = self.retry_budget or other.retry_budget
+        self.circuit_opens += other.circuit_opens
+        self.circuit_open_seconds += other.circuit_open_seconds
+        if other.profiling is not None:
+            self.profiling = other.profiling if self.profiling is None else self.profiling.merge(other.profiling)
+        if other.saturation is not None:
+            self.saturation = other.saturation if self.saturation is None else self.saturation.merge(other.saturation)
+        if other.steady is not None:
+            self.steady = other.steady if self.steady is None else self.steady.merge(other.steady)
+        return self
+
+    def request_latency(self):
+        """Latência das requisições HTTP somando os endpoints (poucos histogramas: barato por janela)"""
+        histogram = LatencyHistogram()
+        for endpoint in self.endpoints.values():
+            histogram.merge(endpoint.latency)
+        return histogram
+
+    def latency_summary(self):
+        """Resume os tempos de resposta (ms) de toda a execução"""
+        return self.latency.summary()
+
+
+class ConsumerStats:
+    """Contadores de uma instância de consumidor (benchmark de consumo)"""
+
+    __slots__ = (
+        "records", "bytes_received", "polls", "empty_polls", "errors_by_type",
+        "fetch_latency", "end_to_end"
+    )
+
+    def __init__(self):
+        self.records = 0
+        self.bytes_received = 0
+        self.polls = 0
+        self.empty_polls = 0
+        self.errors_by_type = {}
+        self.fetch_latency = LatencyHistogram()
+        # Do envio pelo produtor (sent_at_us) até a leitura pelo consumidor
+        self.end_to_end = LatencyHistogram()
+
+    def record_poll(self, records, size, response_time):
+        """Contabiliza um GET /records e o tempo de resposta (ms)"""
+        self.polls += 1
+        self.bytes_received += size
+        self.fetch_latency.record(response_time)
+        if records:
+            self.records += records
+        else:
+            self.empty_polls += 1
+
+    def record_error(self, error_key):
+        self.errors_by_type[error_key] = self.errors_by_type.get(error_key, 0) + 1
+
+    def merge(self, other):
+        """Soma os contadores de outra instância"""
+        self.records += other.records
+        self.bytes_received += other.bytes_received
+        self.polls += other.polls
+        self.empty_polls += other.empty_polls
+        for error_key, count in other.errors_by_type.items():
+            self.errors_by_type[error_key] = self.errors_by_type.get(error_key, 0) + count
+        self.fetch_latency.merge(other.fetch_latency)
+        self.end_to_end.merge(other.end_to_end)
+        return self
@@ -0,0 +1,211 @@
+"""
+Aquecimento e regime estável (--steady-window / --steady-cv)
+
+A vazão é amostrada em janelas de --steady-window segundos. A primeira janela
+é sempre aquecimento: criação das conexões do pool, descoberta dos líderes das
+partições e criação do producer no REST Proxy. Um regime começa em uma
+sequência de SPAN janelas cuja vazão tem coeficiente de variação até
+--steady-cv e se estende enquanto o coeficiente de todas as suas janelas
+continuar dentro do limite; a janela que o quebraria encerra o regime e a
+busca recomeça. Vale o regime mais longo. A janela parcial final (esvaziamento
+da fila) e janelas finais bem abaixo da média ficam de fora.
+
+Só o regime estável entra na vazão e nos percentis do relatório; o aquecimento
+aparece separado. Os percentis usam a mesma latência da execução completa
+(primeira tentativa e, no --rate, a partir do horário previsto de envio), lida
+da soma viva dos workers (LoadStats.track_latency). Com --processes cada
+processo detecta o seu regime: as vazões somam e os histogramas se mesclam.
+"""
+
+import asyncio
+import statistics
+import time
+
+# Janelas consecutivas estáveis exigidas para o início do regime
+SPAN = 3
+
+
+def variation(values):
+    """Coeficiente de variação (desvio padrão / média); infinito sem vazão"""
+    mean = statistics.fmean(values)
+    if mean <= 0:
+        return float("inf")
+    return statistics.pstdev(values) / mean
+
+
+class Snapshot:
+    """Contadores acumulados em uma fronteira de janela"""
+
+    __slots__ = ("time", "success_count", "error_count", "requests_sent", "bytes_sent",
+                 "retries_performed", "errors_by_type", "latency")
+
+    def __init__(self, stats):
+        self.time = time.perf_counter()
+        self.success_count = stats.success_count
+        self.error_count = stats.error_count
+        self.requests_sent = stats.requests_sent
+        self.bytes_sent = stats.bytes_sent
+        self.retries_performed = stats.retries_performed
+        self.errors_by_type = stats.errors_by_type
+        self.latency = stats.live_latency.copy()
+
+
+class SteadyState:
+    """Aquecimento e regime estável de uma execução
+
+    Tem os mesmos campos de resultado que LoadStats (success_count,
+    latency_summary()...), então os reporters o imprimem no lugar dos totais.
+    """
+
+    def __init__(self, window, tolerance, throughputs):
+        self.window = window
+        self.tolerance = tolerance
+        # Vazão (msg/s) de cada janela completa
+        self.throughputs = throughputs
+        self.detected = False
+        self.first_window = None
+        self.last_window = None
+        self.cv = min((variation(throughputs[index:index + SPAN])
+                       for index in range(1, len(throughputs) - SPAN + 1)), default=None)
+        self.warmup_seconds = 0.0
+        self.warmup_messages = 0
+        self.warmup_latency = None
+        self.seconds = 0.0
+        self.success_count = 0
+        self.error_count = 0
+        self.requests_sent = 0
+        self.bytes_sent = 0
+        self.retries_performed = 0
+        self.errors_by_type = {}
+        self.latency = None
+        self.processes = 1
+
+    def measure(self, first, last, start, end, begin):
+        """Preenche o regime entre as fronteiras `start` e `end` (Snapshot) e o aquecimento desde `begin`"""
+        self.detected = True
+        self.first_window = first
+        self.last_window = last
+        self.warmup_seconds = start.time - begin.time
+        self.warmup_messages = start.success_count - begin.success_count
+        self.warmup_latency = start.latency.since(begin.latency)
+        self.seconds = end.time - start.time
+        for field in ("success_count", "error_count", "requests_sent", "bytes_sent", "retries_performed"):
+            setattr(self, field, getattr(end, field) - getattr(start, field))
+        self.errors_by_type = {key: count - start.errors_by_type.get(key, 0)
+                               for key, count in end.errors_by_type.items()
+                               if count > start.errors_by_type.get(key, 0)}
+        self.latency = end.latency.since(start.latency)
+
+    @property
+    def throughput(self):
+        return self.success_count / self.seconds if self.seconds > 0 else 0.0
+
+    def latency_summary(self):
+        return self.latency.summary() if self.latency is not None else {}
+
+    def merge(self, other):
+        """Soma o regime de outro processo; sem regime em um deles, não há regime consolidado"""
+        self.processes += other.processes
+        self.throughputs = [a + b for a, b in zip(self.throughputs, other.throughputs)]
+        if not (self.detected and other.detected):
+            self.detected = False
+            return self
+        throughput = self.throughput + other.throughput
+        for field in ("success_count", "error_count", "requests_sent", "bytes_sent", "retries_performed",
+                      "warmup_messages"):
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        for key, count in other.errors_by_type.items():
+            self.errors_by_type[key] = self.errors_by_type.get(key, 0) + count
+        # Duração equivalente: mantém vazão = soma das vazões dos processos
+        self.seconds = self.success_count / throughput if throughput > 0 else max(self.seconds, other.seconds)
+        self.warmup_seconds = max(self.warmup_seconds, other.warmup_seconds)
+        self.warmup_latency.merge(other.warmup_latency)
+        self.latency.merge(other.latency)
+        self.cv = max(self.cv, other.cv)
+        return self
+
+    def to_dict(self):
+        result = {
+            "detected": self.detected,
+            "window_s": self.window,
+            "tolerance_cv": self.tolerance,
+            "window_throughputs": [round(value, 1) for value in self.throughputs],
+        }
+        if self.detected:
+            result.update({
+                "first_window": self.first_window,
+                "last_window": self.last_window,
+                "cv": self.cv,
+                "warmup_s": self.warmup_seconds,
+                "warmup_messages": self.warmup_messages,
+                "duration_s": self.seconds,
+                "success": self.success_count,
+                "errors": self.error_count,
+                "throughput": self.throughput,
+                "latency_histogram": self.latency.to_dict(),
+            })
+        return result
+
+
+class SteadyStateDetector:
+    def __init__(self, stats, window=1.0, tolerance=0.1):
+        self.stats = stats
+        self.window = window
+        self.tolerance = tolerance
+        self.throughputs = []
+        # Fronteira de janela -> Snapshot; só as que ainda podem ser início ou fim do regime
+        self.snapshots = {}
+        # Início (fronteira) do regime em andamento e o mais longo já encerrado (início, fim)
+        self.start = None
+        self.best = None
+
+    def begin(self):
+        self.stats.track_latency()
+        self.snapshots[0] = Snapshot(self.stats)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.window)
+            self.sample()
+
+    def close(self, end):
+        """Encerra o regime em andamento na fronteira `end`; fica se for o mais longo"""
+        if self.best is None or end - self.start > self.best[1] - self.best[0]:
+            self.best = (self.start, end)
+        self.start = None
+
+    def sample(self):
+        """Fecha uma janela, estende ou encerra o regime em andamento e procura o próximo"""
+        current = Snapshot(self.stats)
+        previous = self.snapshots[len(self.throughputs)]
+        elapsed = current.time - previous.time
+        self.throughputs.append((current.success_count - previous.success_count) / elapsed if elapsed > 0 else 0.0)
+        index = len(self.throughputs)
+        self.snapshots[index] = current
+        if self.start is not None and variation(self.throughputs[self.start:index]) > self.tolerance:
+            self.close(index - 1)
+        # A primeira janela nunca entra no regime: o candidato começa na fronteira 1
+        if self.start is None and index > SPAN and variation(self.throughputs[-SPAN:]) <= self.tolerance:
+            self.start = index - SPAN
+        keep = {0, self.start, *(self.best or ()), *range(index - SPAN, index + 1)}
+        for boundary in [boundary for boundary in self.snapshots if boundary not in keep]:
+            del self.snapshots[boundary]
+
+    def finish(self):
+        """Resultado ao fim do envio; a janela parcial em andamento é descartada"""
+        result = SteadyState(self.window, self.tolerance, list(self.throughputs))
+        if self.start is not None:
+            last = len(self.throughputs)
+            end = last
+            # Janelas finais bem abaixo da média já são o esvaziamento (só as que ainda têm snapshot)
+            floor = statistics.fmean(self.throughputs[self.start:last]) * (1 - 2 * self.tolerance)
+            while end - self.start > SPAN and end - 1 >= last - SPAN and self.throughputs[end - 1] < floor:
+                end -= 1
+            self.close(end)
+        self.stats.track_latency(False)
+        if self.best is None:
+            return result
+        start, end = self.best
+        result.measure(start + 1, end, self.snapshots[start], self.snapshots[end], self.snapshots[0])
+        result.cv = variation(self.throughputs[start:end])
+        return result
@@ -0,0 +1,170 @@
+"""
+Varredura throughput x latência para encontrar o joelho de saturação
+
+Executa o mesmo perfil em uma grade de concorrência, batch size e taxa.
+Cada ponto tem um aquecimento descartado seguido de uma medição, e o
+resultado é uma tabela CSV/JSON usada para dimensionar o REST Proxy.
+"""
+
+import asyncio
+import contextlib
+import copy
+import csv
+import itertools
+import json
+import os
+
+from .engine import LoadEngine
+from .reporters import SilentReporter
+
+COLUMNS = [
+    "batch_size", "concurrency", "rate", "messages", "duration_s", "steady", "throughput",
+    "requests_per_s", "success_rate", "p50_ms", "p90_ms", "p99_ms", "p999_ms", "knee",
+    "knee_along", "client_saturated"
+]
+# Dimensões da grade; um joelho é procurado ao longo de cada uma que varia
+DIMENSIONS = ("batch_size", "concurrency", "rate")
+
+
+def parse_values(text, cast=int):
+    """Lista "10,50,100" ou rampa "10:200:10" (início:fim:passo, fim incluso)"""
+    if text is None:
+        return [None]
+    if ":" in text:
+        start, stop, step = (cast(part) for part in text.split(":"))
+        values = []
+        value = start
+        while value <= stop:
+            values.append(value)
+            value += step
+        return values
+    return [cast(part) for part in text.split(",") if part]
+
+
+async def run_point(profile, config, warmup_messages):
+    """Aquece com `warmup_messages` (descartadas) e mede com config.messages
+
+    Aquecimento e medição usam o mesmo motor, com as mesmas sessões e pool
+    de conexões (LoadEngine.warm_up). O aquecimento usa os IDs a partir de
+    config.first_id e a medição os seguintes, então nenhum ID é enviado duas
+    vezes.
+    """
+    engine = LoadEngine(profile, config, reporter=SilentReporter())
+    stats = await engine.run(warmup_messages)
+    if stats is None:
+        return None, 0
+    return stats, engine.finished_at - engine.started_at
+
+
+def point_row(config, stats, duration):
+    """Linha da tabela; com regime estável detectado (steady.py) só ele entra na vazão e nos percentis"""
+    saturation = stats.saturation
+    steady = stats.steady is not None and stats.steady.detected
+    if steady:
+        stats, duration = stats.steady, stats.steady.seconds
+    latency = stats.latency_summary()
+    total = stats.success_count + stats.error_count
+    return {
+        "batch_size": config.batch_size,
+        "concurrency": config.concurrency,
+        "rate": config.rate or "",
+        "messages": config.messages,
+        "duration_s": round(duration, 3),
+        "steady": steady,
+        "throughput": round(stats.success_count / duration, 1) if duration > 0 else 0,
+        "requests_per_s": round(stats.requests_sent / duration, 1) if duration > 0 else 0,
+        "success_rate": round(stats.success_count / total * 100, 3) if total else 0,
+        "p50_ms": round(latency.get("p50", 0), 2),
+        "p90_ms": round(latency.get("p90", 0), 2),
+        "p99_ms": round(latency.get("p99", 0), 2),
+        "p999_ms": round(latency.get("p999", 0), 2),
+        "knee": False,
+        "knee_along": "",
+        # Ponto limitado pelo próprio gerador de carga (saturation.py): não mede o REST Proxy
+        "client_saturated": bool(saturation and saturation.saturated),
+    }
+
+
+def mark_knees(rows, dimensions=DIMENSIONS):
+    """Marca o primeiro ponto de cada série em que o P99 cresce mais que o throughput
+
+    Para cada dimensão varrida (com mais de um valor), uma série reúne os
+    pontos com as demais dimensões iguais, ordenados pela dimensão varrida;
+    só pontos vizinhos nessa ordem são comparados. `knee_along` diz em qual
+    dimensão o joelho apareceu.
+    """
+    for dimension in dimensions:
+        if len({row[dimension] for row in rows}) < 2:
+            continue
+        others = [other for other in dimensions if other != dimension]
+        series = {}
+        for row in rows:
+            series.setdefault(tuple(row[other] for other in others), []).append(row)
+        for points in series.values():
+            previous = None
+            for row in sorted(points, key=lambda row: row[dimension]):
+                if previous and previous["throughput"] > 0 and previous["p99_ms"] > 0:
+                    throughput_growth = row["throughput"] / previous["throughput"] - 1
+                    latency_growth = row["p99_ms"] / previous["p99_ms"] - 1
+                    if latency_growth > max(throughput_growth, 0):
+                        row["knee"] = True
+                        row["knee_along"] = ",".join(filter(None, [row["knee_along"], dimension]))
+                        break
+                previous = row
+    return rows
+
+
+def write_results(rows, output):
+    with open(f"{output}.csv", "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(f"{output}.json", "w") as json_file:
+        json.dump(rows, json_file, indent=2)
+
+
+def run_sweep(profile, base_config, concurrencies, batch_sizes, rates, warmup_messages, output):
+    """Executa a grade e grava {output}.csv e {output}.json"""
+    print("📈 === VARREDURA THROUGHPUT x LATÊNCIA ===")
+    print(f"Perfil: {profile.name} | REST Proxy: {base_config.url} | Tópico: {base_config.topic}")
+    print(f"Concorrência: {concurrencies} | Batch size: {batch_sizes} | Taxa: {rates}")
+    print("=" * 60)
+
+    rows = []
+    first_id = base_config.first_id
+    for batch_size, concurrency, rate in itertools.product(batch_sizes, concurrencies, rates):
+        config = copy.copy(base_config)
+        config.batch_size = batch_size
+        config.concurrency = concurrency
+        config.rate = rate
+        config.first_id = first_id
+        first_id += config.messages + warmup_messages
+
+        # Os envios de cada ponto são silenciosos; só a linha-resumo é impressa
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            stats, duration = asyncio.run(run_point(profile, config, warmup_messages))
+        if stats is None:
+            print("❌ REST Proxy indisponível, varredura interrompida")
+            break
+
+        row = point_row(config, stats, duration)
+        rows.append(row)
+        print(f"batch={batch_size:<6} conc={concurrency:<5} rate={rate or '-':<8} | "
+              f"{row['throughput']:>10,.0f} msg/s | P50 {row['p50_ms']:>8.2f}ms | "
+              f"P99 {row['p99_ms']:>8.2f}ms | sucesso {row['success_rate']:.2f}%"
+              + ("" if row["steady"] else " | sem regime estável")
+              + (" | ⚠️  cliente saturado" if row["client_saturated"] else ""))
+
+    mark_knees(rows)
+    write_results(rows, output)
+
+    print("=" * 60)
+    for row in rows:
+        if row["knee"]:
+            print(f"⚠️  Joelho em batch={row['batch_size']} conc={row['concurrency']} "
+                  f"rate={row['rate'] or '-'} (variando {row['knee_along']}): P99 cresce mais rápido que o throughput"
+                  + (" (cliente saturado: o joelho pode ser do gerador de carga)" if row["client_saturated"] else ""))
+    if any(row["client_saturated"] for row in rows):
+        print("⚠️  Pontos com o cliente saturado medem o gerador de carga; use --processes nos perfis para confirmá-los")
+    print(f"💾 Resultados: {output}.csv / {output}.json")
+    return rows
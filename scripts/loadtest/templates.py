@@ -0,0 +1,89 @@
+"""
+Templates de lote pré-codificados
+
+O corpo JSON de um lote é serializado uma única vez e convertido em um
+formato bytes (%) onde só os campos variáveis (ID, chave, thread...) ficam
+em aberto. A cada requisição o corpo sai de uma única operação % em C, sem
+cópia de dicts nem json.dumps.
+
+Marcadores usados nos registros do template (N = índice do registro):
+    slot("id", N)         número com o ID do registro (start_id + N)
+    text_slot("key", N)   índice de chave dentro de uma string (ex.: "extreme-<N>"),
+                          por padrão o próprio ID (ver keys.py)
+    slot(nome, N)         número por lote (ex.: thread), igual em todos os registros
+    text_slot(nome, N)    texto por lote dentro de uma string (ex.: timestamp)
+
+Valores de text_slot são inseridos sem escape JSON: use apenas texto seguro
+(dígitos, datas ISO, identificadores).
+"""
+
+import json
+import re
+
+SLOT_PATTERN = re.compile(rb'"<<#(\w+):(\d+)>>"|<<\$(\w+):(\d+)>>')
+
+# Campos derivados do ID da mensagem
+RECORD_FIELDS = ("id", "key")
+
+
+def slot(name, index):
+    """Marcador de campo numérico (substitui o valor JSON inteiro)"""
+    return f"<<#{name}:{index}>>"
+
+
+def text_slot(name, index):
+    """Marcador de trecho dentro de uma string JSON"""
+    return f"<<${name}:{index}>>"
+
+
+class BatchTemplate:
+    def __init__(self, body):
+        """`body` é o dict do lote com marcadores; todos os registros devem ter os mesmos campos"""
+        encoded = json.dumps(body, separators=(',', ':')).encode('utf-8')
+        parts = []
+        slots = []
+        position = 0
+
+        for match in SLOT_PATTERN.finditer(encoded):
+            parts.append(encoded[position:match.start()].replace(b'%', b'%%'))
+            numeric = match.group(1) is not None
+            name = (match.group(1) or match.group(3)).decode('ascii')
+            index = int(match.group(2) or match.group(4))
+            parts.append(b'%d' if numeric or name in RECORD_FIELDS else b'%s')
+            slots.append((name, index))
+            position = match.end()
+        parts.append(encoded[position:].replace(b'%', b'%%'))
+
+        self.format = b''.join(parts)
+        self.count = len({index for _, index in slots})
+        self.layout = self.record_layout(slots)
+        self.args = [None] * len(slots)
+
+    def record_layout(self, slots):
+        """Sequência de campos de um registro, validando que todos os registros a repetem"""
+        if not slots:
+            return ()
+        width = len(slots) // self.count
+        layout = tuple(name for name, _ in slots[:width])
+        for position, (name, index) in enumerate(slots):
+            if index != position // width or name != layout[position % width]:
+                raise ValueError("Registros do template devem ter os mesmos marcadores na mesma ordem")
+        return layout
+
+    def render(self, start_id, batch_values, keys=None):
+        """Corpo do lote com IDs a partir de `start_id` e os campos por lote
+
+        `keys` traz os índices de chave dos registros; sem ele a chave é o ID.
+        """
+        args = self.args
+        if args:
+            width = len(self.layout)
+            ids = range(start_id, start_id + self.count)
+            for position, name in enumerate(self.layout):
+                if name == "key" and keys is not None:
+                    args[position::width] = keys
+                elif name in RECORD_FIELDS:
+                    args[position::width] = ids
+                else:
+                    args[position::width] = (batch_values[name],) * self.count
+        return self.format % tuple(args)
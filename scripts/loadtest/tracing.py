@@ -0,0 +1,77 @@
+"""
+Instrumentação da camada de conexão HTTP (--trace-connections)
+
+Hooks de aiohttp.TraceConfig medem cada requisição em fases, para separar o
+tempo gasto no pool do cliente do tempo gasto no REST Proxy:
+
+fila       espera por uma conexão livre no pool (limit do TCPConnector)
+DNS        resolução do host (só em conexões novas sem cache)
+conexão    abertura da conexão TCP (inclui o DNS)
+envio      da conexão pronta até o último pedaço do corpo escrito no socket
+TTFB       do fim do envio até o cabeçalho da resposta (processamento no proxy)
+
+Também conta conexões criadas e reutilizadas. Os hooks custam algumas
+corrotinas por requisição, por isso a instrumentação é opcional.
+"""
+
+import time
+
+import aiohttp
+
+
+def connection_trace(stats):
+    """TraceConfig que registra as fases de cada requisição em `stats` (ConnectionStats)"""
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context, params):
+        context.ready = None
+        context.sent = None
+
+    async def on_connection_queued_start(session, context, params):
+        context.queued = time.perf_counter()
+
+    async def on_connection_queued_end(session, context, params):
+        stats.queue_wait.record((time.perf_counter() - context.queued) * 1000)
+
+    async def on_connection_create_start(session, context, params):
+        context.connecting = time.perf_counter()
+
+    async def on_connection_create_end(session, context, params):
+        context.ready = time.perf_counter()
+        stats.created += 1
+        stats.connect.record((context.ready - context.connecting) * 1000)
+
+    async def on_connection_reuseconn(session, context, params):
+        context.ready = time.perf_counter()
+        stats.reused += 1
+
+    async def on_dns_resolvehost_start(session, context, params):
+        context.resolving = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, context, params):
+        stats.dns.record((time.perf_counter() - context.resolving) * 1000)
+
+    async def on_request_chunk_sent(session, context, params):
+        context.sent = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        # Cabeçalho da resposta recebido
+        now = time.perf_counter()
+        stats.requests += 1
+        sent = context.sent or context.ready
+        if context.ready is not None and sent is not None:
+            stats.upload.record((sent - context.ready) * 1000)
+        if sent is not None:
+            stats.ttfb.record((now - sent) * 1000)
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_queued_start.append(on_connection_queued_start)
+    trace.on_connection_queued_end.append(on_connection_queued_end)
+    trace.on_connection_create_start.append(on_connection_create_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace.on_request_chunk_sent.append(on_request_chunk_sent)
+    trace.on_request_end.append(on_request_end)
+    return trace
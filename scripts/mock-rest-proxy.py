@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+REST Proxy simulado para benchmark do cliente sem Kafka
+Uso: python mock-rest-proxy.py --port 8082 --latency lognormal:5:0.5 --error-rate 0.01 --throttle-rate 0.005
+"""
+
+import argparse
+
+from loadtest.mockproxy import ERROR_CODES, LatencyDistribution, MockRestProxy, run_mock_proxy
+
+
+def main():
+    parser = argparse.ArgumentParser(description='REST Proxy simulado (API v2) para testes offline')
+    parser.add_argument('--host', type=str, default='0.0.0.0', help='Endereço de escuta')
+    parser.add_argument('--port', type=int, default=8082, help='Porta HTTP (padrão: 8082)')
+    parser.add_argument('--partitions', type=int, default=48, help='Partições por tópico (padrão: 48)')
+    parser.add_argument('--latency', type=str, default='0',
+                        help='Latência por requisição em ms: 5, fixed:5, uniform:1:10, normal:5:2, '
+                             'exponential:5 ou lognormal:5:0.5')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fração de requisições com erro 5xx')
+    parser.add_argument('--error-status', type=int, default=500, choices=sorted(code for code in ERROR_CODES if code >= 500),
+                        help='Status HTTP dos erros injetados (padrão: 500)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fração de requisições com 429')
+    parser.add_argument('--record-error-rate', type=float, default=0.0,
+                        help='Fração de registros com error_code em respostas 200 (falha parcial)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processos servindo a mesma porta (offsets contados por processo)')
+    parser.add_argument('--seed', type=int, default=None, help='Semente para resultados reproduzíveis (com --workers, semente + índice do processo)')
+    parser.add_argument('--report-interval', type=float, default=5.0,
+                        help='Intervalo do log de throughput em segundos (0 desativa)')
+
+    args = parser.parse_args()
+
+    try:
+        LatencyDistribution(args.latency)
+    except ValueError as e:
+        parser.error(str(e))
+
+    proxy = MockRestProxy(
+        partitions=args.partitions,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        throttle_rate=args.throttle_rate,
+        record_error_rate=args.record_error_rate,
+        seed=args.seed
+    )
+    run_mock_proxy(proxy, args.host, args.port, args.report_interval, args.workers)
+
+if __name__ == "__main__":
+    main()
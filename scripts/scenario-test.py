@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Executa um cenário declarativo (YAML/JSON) com fases e cargas mistas
+Uso: python scenario-test.py scenarios/production-mix.yaml [--url http://localhost:8082]
+"""
+
+import argparse
+
+from loadtest.scenario import run_scenario
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cenário de carga com fases e cargas mistas para o Kafka REST Proxy')
+    parser.add_argument('scenario', help='Arquivo do cenário (.yaml, .yml ou .json)')
+    parser.add_argument('--url', type=str, default=None,
+                        help='URL do REST Proxy (várias separadas por vírgula); substitui a url do cenário')
+    parser.add_argument('--result-file', type=str, default=None,
+                        help='Arquivo JSON do resultado (padrão: results/scenario-<nome>-<data>.json)')
+    parser.add_argument('--no-result-file', action='store_true',
+                        help='Não grava o arquivo de resultado da execução')
+    parser.add_argument('--max-loop-lag', type=float, default=None,
+                        help='P99 do atraso do event loop (ms) que marca o cliente como saturado; '
+                             'substitui max_loop_lag do cenário (0 desliga o monitor)')
+    parser.add_argument('--fail-on-saturation', action='store_true',
+                        help='Termina com código 3 se o próprio cliente saturar durante o cenário')
+    args = parser.parse_args()
+    run_scenario(args.scenario, args.url, args.result_file, not args.no_result_file, args.max_loop_lag,
+                 args.fail_on_saturation)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Varredura de concorrência, batch size e taxa para encontrar o joelho de saturação
+Uso: python sweep-test.py --concurrency 50:500:50 --batch-size 500,1000 [--rate 10000,20000]
+"""
+
+import argparse
+
+from loadtest import PROFILES, LoadConfig
+from loadtest.balancer import BALANCE_POLICIES
+from loadtest.keys import KEY_STRATEGIES
+from loadtest.sweep import parse_values, run_sweep
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Varredura throughput x latência do Kafka REST Proxy')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='extreme', help='Perfil de carga (padrão: extreme)')
+    parser.add_argument('--concurrency', type=str, default='50:500:50',
+                        help='Lista "50,100" ou rampa "50:500:50" de concorrência')
+    parser.add_argument('--batch-size', type=str, default='1000', help='Lista ou rampa de batch sizes')
+    parser.add_argument('--rate', type=str, default=None, help='Lista ou rampa de taxas alvo em msg/s (open-loop)')
+    parser.add_argument('--messages', type=int, default=100000, help='Mensagens medidas por ponto (padrão: 100000)')
+    parser.add_argument('--warmup-messages', type=int, default=10000,
+                        help='Mensagens de aquecimento descartadas por ponto (padrão: 10000)')
+    parser.add_argument('--topic', type=str, default='extreme-performance', help='Nome do tópico')
+    parser.add_argument('--format', choices=('json', 'binary', 'avro'), default='json',
+                        help='Formato embutido da API v2 (padrão: json)')
+    parser.add_argument('--schema-registry', type=str, default='http://localhost:8081',
+                        help='URL do Schema Registry usado pelo formato avro')
+    parser.add_argument('--keys', choices=KEY_STRATEGIES, default='sequential',
+                        help='Estratégia de chave das mensagens (padrão: sequential)')
+    parser.add_argument('--url', type=str, default='http://localhost:8082',
+                        help='URL do REST Proxy; várias instâncias separadas por vírgula')
+    parser.add_argument('--balance', choices=BALANCE_POLICIES, default='round-robin',
+                        help='Política entre várias --url (padrão: round-robin)')
+    parser.add_argument('--output', type=str, default='sweep-results', help='Prefixo dos arquivos CSV/JSON')
+
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]()
+    if args.format not in profile.formats:
+        parser.error(f"O perfil {args.profile} não suporta o formato {args.format}")
+    config = LoadConfig(url=args.url, topic=args.topic, messages=args.messages,
+                        embedded_format=args.format, schema_registry=args.schema_registry,
+                        key_strategy=args.keys, balance=args.balance)
+
+    try:
+        run_sweep(
+            profile,
+            config,
+            parse_values(args.concurrency),
+            parse_values(args.batch_size),
+            parse_values(args.rate, float),
+            args.warmup_messages,
+            args.output
+        )
+    except KeyboardInterrupt:
+        print("\n⏹️ Varredura interrompida")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Testes da lógica pura do pacote loadtest e do envio contra o REST Proxy simulado
+Uso (a partir de scripts/): python -m pytest -q tests
+"""
+
+import os
+import sys
+
+# O pacote loadtest fica em scripts/, ao lado dos scripts de teste de carga
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,60 @@
+from loadtest.adaptive import AdaptiveLimit
+
+
+class Windows:
+    """Alimenta o controle com janelas sintéticas (totais acumulados, como o engine)"""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.delivered = self.requests = self.overloads = 0
+        self.now = 0.0
+
+    def close(self, requests, overloads, p99=10.0, busy=True):
+        controller = self.controller
+        for _ in range(50):
+            controller.record(p99)
+        self.requests += requests
+        self.overloads += overloads
+        self.delivered += requests - overloads
+        self.now += controller.window
+        in_flight = int(controller.limit) if busy else 0
+        controller.evaluate(self.delivered, self.requests, self.overloads, in_flight, now=self.now)
+
+
+def test_constant_error_rate_does_not_collapse_the_limit():
+    # 3% de erros em qualquer carga: não é sobrecarga
+    controller = AdaptiveLimit(target_p99=100, max_limit=64)
+    windows = Windows(controller)
+    for _ in range(20):
+        windows.close(1000, 30)
+    assert controller.overloaded_windows == 0
+    assert int(controller.limit) == 64
+    assert abs(controller.baseline - 0.03) < 1e-9
+
+
+def test_load_driven_overload_shrinks_the_limit():
+    controller = AdaptiveLimit(target_p99=100, max_limit=64)
+    windows = Windows(controller)
+    windows.close(1000, 0)
+    limit = controller.limit
+    windows.close(1000, 100)
+    assert controller.overloaded_windows == 1
+    assert controller.limit < limit
+
+
+def test_slow_window_shrinks_the_limit():
+    controller = AdaptiveLimit(target_p99=100, max_limit=64, initial=16)
+    Windows(controller).close(1000, 0, p99=500)
+    assert controller.slow_windows == 1
+    assert int(controller.limit) == 12
+
+
+def test_overload_at_the_floor_keeps_the_limit():
+    controller = AdaptiveLimit(target_p99=100, max_limit=64, initial=1)
+    windows = Windows(controller)
+    windows.close(1000, 0, busy=False)
+    windows.close(1000, 200, busy=False)
+    assert controller.floor_windows == 1
+    assert controller.decreases == 0
+    assert int(controller.limit) == 1
+    assert controller.summary()["floor_windows"] == 1
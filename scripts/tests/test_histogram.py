@@ -0,0 +1,56 @@
+from loadtest.histogram import LatencyHistogram
+
+
+def filled(values):
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def test_percentiles_within_precision():
+    histogram = filled(range(1, 1001))
+    for percent, expected in ((50, 500), (90, 900), (99, 990)):
+        assert abs(histogram.percentile(percent) - expected) <= expected * histogram.precision
+    assert histogram.percentile(100) == 1000
+    assert histogram.min == 1
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0.0
+    assert histogram.summary() == {}
+
+
+def test_merge_equals_recording_everything():
+    merged = filled(range(1, 501)).merge(filled(range(501, 1001)))
+    together = filled(range(1, 1001))
+    assert merged.counts == together.counts
+    assert merged.count == 1000
+    assert (merged.min, merged.max) == (1, 1000)
+    assert merged.percentile(99) == together.percentile(99)
+
+
+def test_merge_rejects_other_parameters():
+    try:
+        LatencyHistogram().merge(LatencyHistogram(precision=0.1))
+    except ValueError:
+        return
+    raise AssertionError("mesclou histogramas com parâmetros diferentes")
+
+
+def test_since_keeps_only_the_window():
+    histogram = filled([1.0] * 100)
+    previous = histogram.copy()
+    for _ in range(100):
+        histogram.record(50.0)
+    window = histogram.since(previous)
+    assert window.count == 100
+    assert abs(window.percentile(50) - 50) <= 50 * histogram.precision
+
+
+def test_dict_round_trip():
+    histogram = filled([0.5, 3, 3, 80, 2500])
+    restored = LatencyHistogram.from_dict(histogram.to_dict())
+    assert restored.counts == histogram.counts
+    assert restored.summary() == histogram.summary()
@@ -0,0 +1,29 @@
+from loadtest.offsets import parse_offsets
+
+
+def test_all_records_delivered():
+    body = (b'{"offsets":[{"partition":0,"offset":10,"error_code":null,"error":null},'
+            b'{"partition":3,"offset":7,"error_code":null,"error":null}]}')
+    assert parse_offsets(body, 2) == ([(b"0", b"10"), (b"3", b"7")], [], 0)
+
+
+def test_partial_failure():
+    body = (b'{"offsets":[{"partition":1,"offset":5,"error_code":null,"error":null},'
+            b'{"partition":null,"offset":null,"error_code":50001,"error":"broker"}]}')
+    offsets, error_codes, missing = parse_offsets(body, 2)
+    assert len(offsets) == 1
+    assert [int(code) for code in error_codes] == [50001]
+    assert missing == 0
+
+
+def test_json_fallback_with_other_spacing():
+    body = b'{"offsets": [{"error": null, "offset": 4, "partition": 2, "error_code": null}]}'
+    assert parse_offsets(body, 1) == ([(2, 4)], [], 0)
+
+
+def test_missing_records_are_not_delivered():
+    truncated = b'{"offsets":[{"partition":0,"offset":1,"error_code":null,"error":null},{"parti'
+    offsets, error_codes, missing = parse_offsets(truncated, 3)
+    assert len(offsets) == 1 and not error_codes
+    assert missing == 2
+    assert parse_offsets(b"", 5) == ([], [], 5)
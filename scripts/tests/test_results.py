@@ -0,0 +1,28 @@
+from loadtest.results import config_differences, incomplete_beta, welch_p_value
+
+
+def test_incomplete_beta_symmetry():
+    assert abs(incomplete_beta(2, 2, 0.5) - 0.5) < 1e-9
+    assert abs(incomplete_beta(3, 5, 0.3) + incomplete_beta(5, 3, 0.7) - 1) < 1e-9
+
+
+def test_welch_matches_t_distribution():
+    # t = -1 com 8 graus de liberdade: p bilateral 0.3466
+    assert abs(welch_p_value([1, 2, 3, 4, 5], [2, 3, 4, 5, 6]) - 0.3466) < 1e-3
+
+
+def test_welch_edge_cases():
+    assert welch_p_value([1], [2, 3]) is None
+    assert welch_p_value([5, 5], [5, 5]) == 1.0
+    assert welch_p_value([5, 5], [6, 6]) == 0.0
+    assert welch_p_value([100, 101, 99, 100], [150, 151, 149, 150]) < 0.001
+
+
+def result(profile="extreme", **config):
+    return {"profile": profile, "config": {"concurrency": 100, "batch_size": 500, **config}}
+
+
+def test_config_differences():
+    assert config_differences([result()], [result(first_id=900)]) == []
+    assert config_differences([result()], [result(concurrency=20)]) == ["concurrency"]
+    assert config_differences([result()], [result("basic", batch_size=10)]) == ["batch_size", "profile"]
@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import aiohttp
+from aiohttp.test_utils import TestServer
+
+from loadtest.balancer import Balancer, Endpoint
+from loadtest.config import LoadConfig
+from loadtest.mockproxy import MockRestProxy
+from loadtest.profiles import OptimizedProfile
+from loadtest.retry import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from loadtest.senders import RetryingSender
+from loadtest.stats import LoadStats
+
+
+def open_breaker(threshold=2, cooldown=0.05):
+    breaker = CircuitBreaker(LoadStats(), threshold, cooldown)
+    for _ in range(threshold):
+        breaker.failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_only_the_probe_closes_the_circuit():
+    async def scenario():
+        breaker = open_breaker()
+        _, probe = await breaker.acquire()
+        assert breaker.state == HALF_OPEN and probe is not None
+        # Resposta atrasada de uma requisição anterior à abertura: ignorada
+        breaker.success()
+        breaker.failure()
+        assert breaker.state == HALF_OPEN
+        breaker.success(probe)
+        assert breaker.state == CLOSED
+        assert breaker.stats.circuit_opens == 1
+    asyncio.run(scenario())
+
+
+def test_failed_probe_reopens_the_circuit():
+    async def scenario():
+        breaker = open_breaker()
+        _, probe = await breaker.acquire()
+        breaker.failure(probe)
+        assert breaker.state == OPEN
+        assert breaker.stats.circuit_opens == 2
+        # Devolver a prova depois do veredito não muda nada
+        breaker.release(probe)
+        assert breaker.state == OPEN
+    asyncio.run(scenario())
+
+
+def test_released_probe_lets_a_waiter_probe():
+    async def scenario():
+        breaker = open_breaker()
+        _, probe = await breaker.acquire()
+        waiter = asyncio.create_task(breaker.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        breaker.release(probe)
+        _, second = await asyncio.wait_for(waiter, 1)
+        assert second is not None and second is breaker.probe
+    asyncio.run(scenario())
+
+
+async def mock_sender(proxy, **options):
+    """RetryingSender do perfil optimized apontado para o REST Proxy simulado"""
+    server = TestServer(proxy.create_app())
+    await server.start_server()
+    url = str(server.make_url("")).rstrip("/")
+    config = LoadConfig(url=url, topic="test", batch_size=10)
+    profile = OptimizedProfile()
+    payload = profile.create_payload(config)
+    payload.prepare()
+    stats = LoadStats()
+    sender = RetryingSender(config.topic, payload, stats, **options)
+    session = aiohttp.ClientSession()
+    balancer = Balancer([Endpoint(url, stats.endpoint(url), session)])
+    return server, session, sender, balancer
+
+
+def test_overloaded_proxy_opens_the_circuit():
+    async def scenario():
+        proxy = MockRestProxy(error_rate=1.0, error_status=503, seed=1)
+        server, session, sender, balancer = await mock_sender(proxy, breaker_threshold=2, breaker_cooldown=0.05)
+        try:
+            results = [await sender.send(balancer, start_id, 10, 0) for start_id in (1, 11)]
+        finally:
+            await session.close()
+            await server.close()
+        assert results == [False, False]
+        assert sender.stats.circuit_opens >= 1
+        assert sender.stats.errors_by_type == {"HTTP_503": 2}
+        assert sender.stats.error_count == 20
+    asyncio.run(scenario())
+
+
+def test_cancelled_probe_is_returned():
+    async def scenario():
+        proxy = MockRestProxy(latency="fixed:2000", seed=1)
+        server, session, sender, balancer = await mock_sender(proxy, breaker_threshold=1, breaker_cooldown=0.01)
+        try:
+            breaker = sender.breaker
+            breaker.failure()
+            breaker.opened_at = time.perf_counter() - 1
+            task = asyncio.create_task(sender.send(balancer, 1, 10, 0))
+            await asyncio.sleep(0.2)
+            assert breaker.state == HALF_OPEN and breaker.probe is not None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            assert breaker.probe is None
+            _, probe = await asyncio.wait_for(breaker.acquire(), 1)
+            assert probe is not None
+        finally:
+            await session.close()
+            await server.close()
+    asyncio.run(scenario())
@@ -0,0 +1,28 @@
+import pytest
+
+from loadtest.scenario import ScenarioRunner
+
+
+@pytest.mark.parametrize("phases, message", [
+    (["warm-up"], "fase 1: esperado um mapeamento"),
+    ([{"duration": 5}, {"duration": "dez"}], "fase 2 ('fase-2'): duration deve ser um número"),
+    ([{"duration": 5, "rate": [100, "x"]}], "rate deve ser um número"),
+    ([{"messages": 100, "concurrency": 0}], "concurrency deve ser positiva"),
+    ([{"duration": 5, "mix": ["carga"]}], "mix deve mapear"),
+    ([{"rate": 100}], "informe duration"),
+])
+def test_invalid_phases_raise_value_error(phases, message):
+    with pytest.raises(ValueError, match=message.replace("(", r"\(").replace(")", r"\)")):
+        ScenarioRunner({"phases": phases})
+
+
+def test_invalid_workload_raises_value_error():
+    with pytest.raises(ValueError, match="carga grandes: valor inválido para batch_size"):
+        ScenarioRunner({"phases": [{"duration": 5}], "workloads": {"grandes": {"batch_size": "um"}}})
+
+
+def test_pool_fits_the_largest_phase():
+    runner = ScenarioRunner({"concurrency": 20, "phases": [{"duration": 5, "rate": [10, 100]},
+                                                           {"messages": 100, "concurrency": 300}]})
+    assert runner.max_concurrency == 300
+    assert runner.phases[0].rate_at(2.5) == 55
@@ -0,0 +1,42 @@
+import itertools
+
+from loadtest.sweep import mark_knees, parse_values
+
+
+def grid(points):
+    """Linhas na ordem de run_sweep: itertools.product(batch_sizes, concurrencies, rates)"""
+    rows = []
+    for batch_size, concurrency, rate in itertools.product([500], [5, 10], [5000, 10000]):
+        throughput, p99 = points[concurrency, rate]
+        rows.append({"batch_size": batch_size, "concurrency": concurrency, "rate": rate,
+                     "throughput": throughput, "p99_ms": p99, "knee": False, "knee_along": ""})
+    return rows
+
+
+def test_parse_values():
+    assert parse_values("10,50,100") == [10, 50, 100]
+    assert parse_values("10:40:10") == [10, 20, 30, 40]
+    assert parse_values("0.5:1.5:0.5", float) == [0.5, 1.0, 1.5]
+    assert parse_values(None) == [None]
+
+
+def test_no_knee_between_unrelated_points():
+    # conc=10/rate=5000 tem P99 maior que conc=5/rate=10000, mas são pontos de séries diferentes
+    rows = mark_knees(grid({(5, 5000): (5000, 30), (5, 10000): (10000, 10),
+                            (10, 5000): (5000, 30), (10, 10000): (10000, 10)}))
+    assert not any(row["knee"] for row in rows)
+
+
+def test_knee_along_concurrency():
+    rows = mark_knees(grid({(5, 5000): (5000, 10), (5, 10000): (10000, 11),
+                            (10, 5000): (5000, 10), (10, 10000): (10100, 40)}))
+    knees = [(row["concurrency"], row["rate"], row["knee_along"]) for row in rows if row["knee"]]
+    assert knees == [(10, 10000, "concurrency,rate")]
+
+
+def test_series_sorted_by_swept_dimension():
+    rows = [{"batch_size": 500, "concurrency": concurrency, "rate": "", "throughput": throughput,
+             "p99_ms": p99, "knee": False, "knee_along": ""}
+            for concurrency, throughput, p99 in ((50, 9000, 60), (10, 5000, 10), (20, 8000, 12))]
+    mark_knees(rows)
+    assert [row["concurrency"] for row in rows if row["knee"]] == [50]